@@ -1,5 +1,10 @@
-from django.contrib import admin
+from functools import partial
 
+from django.contrib import admin, messages
+from django.db import transaction
+from django.utils.translation import ngettext
+
+from airport import flight_search
 from airport.models import (
     Airplane,
     AirplaneType,
@@ -10,21 +15,127 @@ from airport.models import (
     Order,
     Ticket
 )
+from airport_api.pagination import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist of a table that grows without bound: counts only the
+    filtered rows and estimates the size of the whole table
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class TicketInLine(admin.TabularInline):
     model = Ticket
     extra = 1
+    autocomplete_fields = ("flight",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            "flight__route__source", "flight__route__destination"
+        )
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(LargeTableAdmin):
     inlines = (TicketInLine,)
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    date_hierarchy = "created_at"
+    search_fields = ("user__email",)
+    autocomplete_fields = ("user",)
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "__str__", "order")
+    raw_id_fields = ("flight", "order")
+
+    def get_queryset(self, request):
+        # Ticket.__str__ shows the route of the flight. The changelist
+        # ignores list_select_related once the queryset has joins.
+        return super().get_queryset(request).select_related(
+            "flight__route__source", "flight__route__destination", "order"
+        )
+
+
+@admin.register(Flight)
+class FlightAdmin(LargeTableAdmin):
+    list_display = (
+        "id", "route", "airplane", "departure_time", "arrival_time"
+    )
+    list_select_related = (
+        "route__source", "route__destination", "airplane"
+    )
+    list_filter = ("airplane__airplane_type",)
+    date_hierarchy = "departure_time"
+    search_fields = (
+        "=id", "route__source__name", "route__destination__name"
+    )
+    autocomplete_fields = ("route", "airplane", "crewmates")
+    actions = ("remove_crew",)
+
+    @admin.action(description="Remove the crew from selected flights")
+    def remove_crew(self, request, queryset):
+        with transaction.atomic():
+            scopes = list(
+                queryset.values_list("route_id", "departure_time")
+            )
+            deleted, _ = Flight.crewmates.through.objects.filter(
+                flight__in=queryset
+            ).delete()
+            # Deleting the rows in one statement sends no m2m_changed
+            transaction.on_commit(
+                partial(flight_search.flights_changed, scopes)
+            )
+        self.message_user(
+            request,
+            ngettext(
+                "%d crew assignment removed.",
+                "%d crew assignments removed.",
+                deleted,
+            ) % deleted,
+            messages.SUCCESS,
+        )
+
+
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "distance")
+    search_fields = ("source__name", "destination__name")
+    autocomplete_fields = ("source", "destination")
+
+    def get_queryset(self, request):
+        # Also used by the route autocomplete of flights
+        return super().get_queryset(request).select_related(
+            "source", "destination"
+        )
+
+
+@admin.register(Airplane)
+class AirplaneAdmin(admin.ModelAdmin):
+    list_display = ("name", "airplane_type", "rows", "seats_in_row")
+    list_select_related = ("airplane_type",)
+    list_filter = ("airplane_type",)
+    search_fields = ("name",)
+    autocomplete_fields = ("airplane_type",)
+
+
+@admin.register(AirplaneType)
+class AirplaneTypeAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Airport)
+class AirportAdmin(admin.ModelAdmin):
+    list_display = ("name", "closest_big_city", "latitude", "longitude")
+    search_fields = ("name", "closest_big_city")
 
 
-admin.site.register(Airplane)
-admin.site.register(AirplaneType)
-admin.site.register(Airport)
-admin.site.register(Route)
-admin.site.register(Flight)
-admin.site.register(Crew)
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("first_name", "last_name")
@@ -0,0 +1,112 @@
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.dispatch import Signal
+
+from airport.models import (
+    ArchivedFlight,
+    ArchivedOrder,
+    ArchivedTicket,
+    Flight,
+    FreeSeat,
+    Order,
+    Ticket,
+)
+
+# Sent with the ids of flights moved to the archive, before they are
+# deleted from the live table
+flights_archived = Signal()
+# Sent with the ids of live flights whose tickets were moved to the
+# archive with their orders, after they are deleted from the live table
+tickets_archived = Signal()
+
+
+def archivable_orders(before):
+    """Orders with tickets, whose flights all arrived before `before`"""
+    tickets = Ticket.objects.filter(order=OuterRef("pk"))
+    return Order.objects.filter(Exists(tickets)).exclude(
+        Exists(tickets.filter(flight__arrival_time__gte=before))
+    )
+
+
+def archivable_flights(before):
+    """Flights arrived before `before` without tickets in live orders"""
+    return Flight.objects.filter(arrival_time__lt=before).exclude(
+        Exists(Ticket.objects.filter(flight=OuterRef("pk")))
+    )
+
+
+def lock_batch(queryset, batch_size):
+    """Ids of the next batch, skipping rows another archiver has locked"""
+    return list(
+        queryset.order_by("id")
+        .select_for_update(skip_locked=True, of=("self",))
+        .values_list("id", flat=True)[:batch_size]
+    )
+
+
+def archive_orders(before, batch_size):
+    """Moves a batch of orders with their tickets, returns the number"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        ids = lock_batch(archivable_orders(before), batch_size)
+        if ids:
+            cursor.execute(
+                f"INSERT INTO {ArchivedOrder._meta.db_table} "
+                f"(id, created_at, user_id) "
+                f"SELECT id, created_at, user_id "
+                f"FROM {Order._meta.db_table} WHERE id = ANY(%s)",
+                [ids],
+            )
+            cursor.execute(
+                f"INSERT INTO {ArchivedTicket._meta.db_table} "
+                f"(id, row, seat, flight_id, order_id) "
+                f"SELECT id, row, seat, flight_id, order_id "
+                f"FROM {Ticket._meta.db_table} WHERE order_id = ANY(%s)",
+                [ids],
+            )
+            cursor.execute(
+                f"DELETE FROM {Ticket._meta.db_table} "
+                f"WHERE order_id = ANY(%s) RETURNING flight_id",
+                [ids],
+            )
+            flight_ids = sorted({row[0] for row in cursor.fetchall()})
+            cursor.execute(
+                f"DELETE FROM {Order._meta.db_table} WHERE id = ANY(%s)",
+                [ids],
+            )
+            tickets_archived.send(sender=Ticket, flight_ids=flight_ids)
+    return len(ids)
+
+
+def archive_flights(before, batch_size):
+    """Moves a batch of flights with their crew, returns the number"""
+    crew_table = Flight.crewmates.through._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        ids = lock_batch(archivable_flights(before), batch_size)
+        if ids:
+            cursor.execute(
+                f"INSERT INTO {ArchivedFlight._meta.db_table} "
+                f"(id, route_id, airplane_id, departure_time, arrival_time, "
+                f"crewmates) "
+                f"SELECT flight.id, flight.route_id, flight.airplane_id, "
+                f"flight.departure_time, flight.arrival_time, "
+                f"COALESCE(array_agg(crew.crew_id ORDER BY crew.crew_id) "
+                f"FILTER (WHERE crew.crew_id IS NOT NULL), '{{}}') "
+                f"FROM {Flight._meta.db_table} flight "
+                f"LEFT JOIN {crew_table} crew ON crew.flight_id = flight.id "
+                f"WHERE flight.id = ANY(%s) GROUP BY flight.id",
+                [ids],
+            )
+            flights_archived.send(sender=Flight, flight_ids=ids)
+            cursor.execute(
+                f"DELETE FROM {crew_table} WHERE flight_id = ANY(%s)", [ids]
+            )
+            cursor.execute(
+                f"DELETE FROM {FreeSeat._meta.db_table} "
+                f"WHERE flight_id = ANY(%s)",
+                [ids],
+            )
+            cursor.execute(
+                f"DELETE FROM {Flight._meta.db_table} WHERE id = ANY(%s)",
+                [ids],
+            )
+    return len(ids)
@@ -0,0 +1,116 @@
+import time
+import unicodedata
+from bisect import bisect_left
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import cache
+
+from airport.models import Airport
+
+VERSION_CACHE_KEY = "airport:autocomplete-version"
+
+# Matches on the start of the name rank above word and city matches
+NAME_PREFIX, NAME_WORD, CITY_WORD = range(3)
+
+
+def normalize(text):
+    """Lowercase text and strip accents, so 'Zürich' matches 'zur'"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+
+
+class AirportPrefixIndex:
+    """
+    In-memory prefix index over airport names and cities.
+
+    Keeps one sorted list of (key, airport id) per match rank, so a
+    lookup is a binary search followed by a scan of the matching keys.
+    """
+
+    def __init__(self, airports):
+        self.airports = {}
+        keys = [[] for _ in range(3)]
+
+        for airport_id, name, closest_big_city in airports:
+            self.airports[airport_id] = {
+                "id": airport_id,
+                "name": name,
+                "closest_big_city": closest_big_city,
+            }
+            name, city = normalize(name), normalize(closest_big_city)
+            keys[NAME_PREFIX].append((name, airport_id))
+            keys[NAME_WORD].extend(
+                (word, airport_id) for word in name.split()[1:]
+            )
+            keys[CITY_WORD].append((city, airport_id))
+            keys[CITY_WORD].extend(
+                (word, airport_id) for word in city.split()[1:]
+            )
+
+        self.keys = [sorted(rank_keys) for rank_keys in keys]
+
+    def search(self, query, limit):
+        query = normalize(query.strip())
+        if not query:
+            return []
+
+        found = {}
+        for rank_keys in self.keys:
+            position = bisect_left(rank_keys, (query,))
+            while (
+                len(found) < limit
+                and position < len(rank_keys)
+                and rank_keys[position][0].startswith(query)
+            ):
+                airport_id = rank_keys[position][1]
+                found.setdefault(airport_id, self.airports[airport_id])
+                position += 1
+
+        return list(found.values())
+
+
+_index = None
+_index_version = None
+_checked_at = 0.0
+_lock = Lock()
+
+
+def invalidate():
+    """Make every worker reload its index on the next lookup"""
+    global _checked_at
+
+    cache.set(VERSION_CACHE_KEY, time.time_ns(), None)
+    _checked_at = 0.0
+
+
+def get_index():
+    """
+    Return the index of this worker, reloading it when airports changed.
+    The shared version is checked at most every
+    AUTOCOMPLETE_VERSION_CHECK_INTERVAL seconds.
+    """
+    global _index, _index_version, _checked_at
+
+    now = time.monotonic()
+    if (
+        _index is not None
+        and now - _checked_at < settings.AUTOCOMPLETE_VERSION_CHECK_INTERVAL
+    ):
+        return _index
+
+    with _lock:
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            version = time.time_ns()
+            cache.add(VERSION_CACHE_KEY, version, None)
+        if _index is None or version != _index_version:
+            _index = AirportPrefixIndex(
+                Airport.objects.values_list("id", "name", "closest_big_city")
+            )
+            _index_version = version
+        _checked_at = now
+
+    return _index
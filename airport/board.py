@@ -0,0 +1,236 @@
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+
+from airport.models import Flight
+
+CHANGE_COUNTER_CACHE_KEY = "airport:board-changes"
+
+# Departures are listed at the source airport of the route by departure
+# time, arrivals at its destination by arrival time
+DEPARTURES, ARRIVALS = "departures", "arrivals"
+BOARD_FIELDS = {
+    DEPARTURES: ("source_id", "departure_time"),
+    ARRIVALS: ("destination_id", "arrival_time"),
+}
+
+
+def change_cache_key(number):
+    return f"airport:board-change:{number}"
+
+
+def board_rows(queryset):
+    return queryset.values(
+        "id",
+        "route_id",
+        "departure_time",
+        "arrival_time",
+        source_id=F("route__source_id"),
+        destination_id=F("route__destination_id"),
+        source=F("route__source__name"),
+        destination=F("route__destination__name"),
+    )
+
+
+def query_board(board, airport_id, after, limit, inclusive=True):
+    """Read a board from the database, ordered by the indexed time"""
+    airport_field, time_field = BOARD_FIELDS[board]
+    lookup = "gte" if inclusive else "gt"
+    return list(
+        board_rows(
+            Flight.objects.filter(
+                **{
+                    f"route__{airport_field}": airport_id,
+                    f"{time_field}__{lookup}": after,
+                }
+            )
+        ).order_by(time_field, "id")[:limit]
+    )
+
+
+class FlightBoardIndex:
+    """
+    In-memory departure and arrival boards of every airport.
+
+    Keeps the flights departing or arriving between `start` and `end` in
+    a sorted list of (time, flight id) per board and airport, so the next
+    flights are a binary search and a slice away.
+    """
+
+    def __init__(self, start, end, rows):
+        self.start = start
+        self.end = end
+        self.flights = {}
+        self.boards = {board: defaultdict(list) for board in BOARD_FIELDS}
+        for row in rows:
+            self.flights[row["id"]] = row
+            for board, entries, entry in self.entries(row):
+                entries.append(entry)
+        for airports in self.boards.values():
+            for entries in airports.values():
+                entries.sort()
+
+    def entries(self, row):
+        """The boards a flight is shown on within the indexed window"""
+        for board, (airport_field, time_field) in BOARD_FIELDS.items():
+            if self.start <= row[time_field] <= self.end:
+                yield (
+                    board,
+                    self.boards[board][row[airport_field]],
+                    (row[time_field], row["id"]),
+                )
+
+    def update(self, flight_ids, rows):
+        """Replace the given flights, deleted ones have no row"""
+        for flight_id in flight_ids:
+            row = self.flights.pop(flight_id, None)
+            if row is not None:
+                for board, entries, entry in self.entries(row):
+                    del entries[bisect_left(entries, entry)]
+        for row in rows:
+            self.flights[row["id"]] = row
+            for board, entries, entry in self.entries(row):
+                insort(entries, entry)
+
+    def upcoming(self, board, airport_id, since, limit):
+        """
+        The first `limit` flights of the board from `since` to the end of
+        the window, or None when the window starts too late to tell.
+        """
+        if since < self.start:
+            return None
+        entries = self.boards[board].get(airport_id, [])
+        position = bisect_left(entries, (since,))
+        return [
+            self.flights[flight_id]
+            for _, flight_id in entries[position:position + limit]
+        ]
+
+
+def flights_changed(flight_ids):
+    """
+    Announce changed or deleted flights to the boards of every worker,
+    or None to have them rebuilt, e.g. after an airport was renamed.
+    """
+    global _checked_at
+
+    try:
+        number = cache.incr(CHANGE_COUNTER_CACHE_KEY)
+    except ValueError:
+        cache.add(CHANGE_COUNTER_CACHE_KEY, 0, None)
+        number = cache.incr(CHANGE_COUNTER_CACHE_KEY)
+    cache.set(
+        change_cache_key(number),
+        None if flight_ids is None else list(flight_ids),
+        settings.FLIGHT_BOARD_CHANGE_TTL,
+    )
+    _checked_at = 0.0
+
+
+def invalidate():
+    flights_changed(None)
+
+
+def build_index():
+    now = timezone.now()
+    start = now - settings.FLIGHT_BOARD_RECENT
+    end = now + settings.FLIGHT_BOARD_WINDOW
+    return FlightBoardIndex(
+        start,
+        end,
+        board_rows(
+            Flight.objects.filter(
+                Q(departure_time__range=(start, end))
+                | Q(arrival_time__range=(start, end))
+            )
+        ).iterator(),
+    )
+
+
+def pending_changes(since_version, version):
+    """
+    Ids of the flights changed after `since_version`, or None when some
+    change is missing or asks for a rebuild.
+    """
+    count = version - since_version
+    if not 0 < count <= settings.FLIGHT_BOARD_MAX_CHANGES:
+        return None
+    changes = cache.get_many(
+        [change_cache_key(n) for n in range(since_version + 1, version + 1)]
+    )
+    if len(changes) < count or None in changes.values():
+        return None
+    return {flight_id for ids in changes.values() for flight_id in ids}
+
+
+_index = None
+_index_version = None
+_built_at = 0.0
+_checked_at = 0.0
+_lock = Lock()
+
+
+def get_index():
+    """
+    Return the boards of this worker, applying the changes announced by
+    every worker since the last check. The shared change counter is read
+    at most every FLIGHT_BOARD_CHECK_INTERVAL seconds, and the boards are
+    rebuilt every FLIGHT_BOARD_REBUILD_INTERVAL to move their window on.
+    """
+    global _index, _index_version, _built_at, _checked_at
+
+    now = time.monotonic()
+    if (
+        _index is not None
+        and now - _checked_at < settings.FLIGHT_BOARD_CHECK_INTERVAL
+    ):
+        return _index
+
+    with _lock:
+        version = cache.get(CHANGE_COUNTER_CACHE_KEY, 0)
+        if (
+            _index is None
+            or now - _built_at
+            >= settings.FLIGHT_BOARD_REBUILD_INTERVAL.total_seconds()
+        ):
+            changed = None
+        elif version == _index_version:
+            changed = set()
+        else:
+            changed = pending_changes(_index_version, version)
+
+        if changed is None:
+            _index = build_index()
+            _built_at = now
+        elif changed:
+            _index.update(
+                changed, board_rows(Flight.objects.filter(pk__in=changed))
+            )
+        _index_version = version
+        _checked_at = now
+
+    return _index
+
+
+def upcoming(board, airport_id, limit):
+    """Next flights of an airport's board, recent ones included"""
+    since = timezone.now() - settings.FLIGHT_BOARD_RECENT
+    if settings.FLIGHT_BOARD_IN_MEMORY:
+        index = get_index()
+        with _lock:
+            found = index.upcoming(board, airport_id, since, limit)
+        if found is not None:
+            if len(found) < limit:
+                # Quiet airports may need flights from beyond the window
+                found += query_board(
+                    board, airport_id, index.end, limit - len(found),
+                    inclusive=False,
+                )
+            return found
+    return query_board(board, airport_id, since, limit)
@@ -0,0 +1,146 @@
+import zlib
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from airport.models import Airplane, Airport, Change, Flight, Route, Ticket
+
+# Fields of each model recorded in the feed
+FEED_FIELDS = {
+    Airport: ("name", "closest_big_city", "latitude", "longitude"),
+    Airplane: ("name", "rows", "seats_in_row", "airplane_type_id"),
+    Route: ("source_id", "destination_id", "distance"),
+    Flight: ("route_id", "airplane_id", "departure_time", "arrival_time"),
+}
+# Seat counts are recorded under the id of their flight
+SEATS = "seats"
+
+SEQUENCE_LOCK_ID = zlib.crc32(b"airport_change_sequence")
+
+
+class ChangesPruned(APIException):
+    """
+    Raised with the latest sequence number, which clients resume from
+    after downloading everything again
+    """
+
+    status_code = status.HTTP_410_GONE
+    default_detail = _(
+        "Changes since this sequence number were pruned, download "
+        "everything again and continue from the latest sequence number."
+    )
+    default_code = "changes_pruned"
+
+    def __init__(self, latest):
+        super().__init__()
+        self.latest = latest
+
+
+def record(instance, action):
+    model = type(instance)
+    # Read back what was stored, saved attributes may still be raw input
+    data = None if action == Change.Action.DELETE else (
+        model.objects.filter(pk=instance.pk).values(*FEED_FIELDS[model]).get()
+    )
+    Change.objects.create(
+        model=instance._meta.model_name,
+        object_id=instance.pk,
+        action=action,
+        data=data,
+    )
+
+
+def record_flights(flight_ids, action):
+    """Records set-based writes to flights with a single INSERT"""
+    if action == Change.Action.DELETE:
+        rows = [{"id": flight_id} for flight_id in flight_ids]
+    else:
+        rows = Flight.objects.filter(pk__in=flight_ids).values(
+            "id", *FEED_FIELDS[Flight]
+        )
+    Change.objects.bulk_create(
+        Change(
+            model=Flight._meta.model_name,
+            object_id=row.pop("id"),
+            action=action,
+            data=row or None,
+        )
+        for row in rows
+    )
+
+
+def record_seats(flight_id):
+    Change.objects.create(
+        model=SEATS,
+        object_id=flight_id,
+        action=Change.Action.UPDATE,
+        data={
+            "tickets_sold": Ticket.objects.filter(flight_id=flight_id).count()
+        },
+    )
+
+
+def assign_sequence(batch_size):
+    """
+    Numbers the committed changes without a sequence, in the order of
+    their ids, after the highest number given so far.
+
+    Sequence numbers of changes whose transaction is still running are
+    left for a later call, and one reader numbers at a time, so a change
+    never gets a number below one a reader may have already seen. Ids
+    alone do not give that: they are taken when a change is written, not
+    when it commits. Returns how many changes were numbered.
+    """
+    table = Change._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_try_advisory_xact_lock(%s)", [SEQUENCE_LOCK_ID]
+        )
+        if not cursor.fetchone()[0]:
+            # Another reader is numbering the same changes right now
+            return 0
+        cursor.execute(
+            f"UPDATE {table} change SET sequence = numbered.sequence "
+            f"FROM ("
+            f"SELECT id, ROW_NUMBER() OVER (ORDER BY id) + ("
+            f"SELECT COALESCE(MAX(sequence), 0) FROM {table}"
+            f") AS sequence "
+            f"FROM {table} WHERE sequence IS NULL ORDER BY id LIMIT %s"
+            f") numbered WHERE change.id = numbered.id",
+            [batch_size],
+        )
+        return cursor.rowcount
+
+
+def changes_since(since, limit):
+    """
+    The first `limit` changes after the sequence number `since`. Raises
+    ChangesPruned when some of them have been pruned already.
+    """
+    assign_sequence(settings.CHANGE_FEED_SEQUENCE_BATCH)
+    bounds = Change.objects.aggregate(
+        oldest=Min("sequence"), latest=Max("sequence")
+    )
+    if bounds["oldest"] is not None and since + 1 < bounds["oldest"]:
+        raise ChangesPruned(bounds["latest"])
+    return list(
+        Change.objects.filter(sequence__gt=since).order_by("sequence")[:limit]
+    )
+
+
+def prune(before):
+    """
+    Deletes numbered changes made before `before`, returns the number.
+    The latest change is kept to tell pruned feeds from empty ones.
+    """
+    latest = Change.objects.aggregate(latest=Max("sequence"))["latest"]
+    if latest is None:
+        return 0
+    deleted, _ = Change.objects.filter(
+        sequence__lt=latest, created_at__lt=before
+    ).delete()
+    return deleted
@@ -0,0 +1,180 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.dispatch import Signal
+from rest_framework.exceptions import ValidationError
+
+from airport.models import Flight, Ticket
+from airport.schedule import (
+    airplane_conflicts,
+    airplane_overlap_as,
+    crew_conflicts,
+)
+
+# Sent with the ids of flights whose times or airplane were changed by a
+# set-based UPDATE, which bypasses the model signals, the names of the
+# changed fields and the (route id, departure time) pairs they had before
+flights_rescheduled = Signal()
+
+
+def lock_flights(queryset):
+    return list(
+        queryset.select_for_update(of=("self",))
+        .only(
+            "id", "route_id", "airplane_id", "departure_time", "arrival_time"
+        )
+        .order_by("id")
+    )
+
+
+def schedule_errors(flights, check_crew=False):
+    """
+    Validate flights changed in memory as a whole, against each other and
+    the stored flights, in a fixed number of queries.
+
+    Returns {flight id: [messages]}.
+    """
+    errors = defaultdict(list)
+    moved = {flight.pk for flight in flights}
+
+    for flight in flights:
+        try:
+            Flight.validate_time(
+                flight.departure_time, flight.arrival_time, ValidationError
+            )
+        except ValidationError as error:
+            errors[flight.pk].append(error.detail["departure_time"])
+
+    keys = Counter(
+        (flight.route_id, flight.airplane_id, flight.departure_time)
+        for flight in flights
+    )
+    taken = set(
+        Flight.objects.filter(
+            route_id__in={route for route, _, _ in keys},
+            airplane_id__in={airplane for _, airplane, _ in keys},
+            departure_time__in={departure for _, _, departure in keys},
+        )
+        .exclude(pk__in=moved)
+        .values_list("route_id", "airplane_id", "departure_time")
+    )
+    for flight in flights:
+        key = (flight.route_id, flight.airplane_id, flight.departure_time)
+        if keys[key] > 1 or key in taken:
+            errors[flight.pk].append(
+                "A flight with this route, airplane, and departure time "
+                "already exists."
+            )
+
+    for flight, other in airplane_conflicts(flights):
+        if flight.pk not in moved:
+            flight, other = other, flight
+        errors[flight.pk].append(
+            f"Airplane {flight.airplane_id} is already assigned to {other} "
+            f"({other.departure_time} - {other.arrival_time})."
+        )
+
+    if check_crew:
+        crewmates = defaultdict(list)
+        for flight_id, crew_id in Flight.crewmates.through.objects.filter(
+            flight_id__in=moved
+        ).values_list("flight_id", "crew_id"):
+            crewmates[flight_id].append(crew_id)
+        for flight, crew_id, other in crew_conflicts(
+            (flight, crewmates[flight.pk]) for flight in flights
+        ):
+            errors[flight.pk].append(
+                f"Crewmate {crew_id} is assigned to {other} "
+                f"({other.departure_time} - {other.arrival_time})."
+            )
+
+    return errors
+
+
+def seat_errors(flight_ids, airplane):
+    """Sold tickets of the flights outside the airplane's seat layout"""
+    misplaced = (
+        Ticket.objects.filter(flight_id__in=flight_ids)
+        .filter(Q(row__gt=airplane.rows) | Q(seat__gt=airplane.seats_in_row))
+        .values("flight_id")
+        .annotate(count=Count("id"))
+        .values_list("flight_id", "count")
+    )
+    return {
+        flight_id: [
+            f"{count} sold tickets do not fit into airplane {airplane} "
+            f"({airplane.rows} rows of {airplane.seats_in_row} seats)."
+        ]
+        for flight_id, count in misplaced
+    }
+
+
+def shift_flights(queryset, delta, error_to_raise):
+    """
+    Move every flight of the queryset by `delta` with a single UPDATE.
+    Returns the ids of the moved flights.
+    """
+    with transaction.atomic():
+        flights = lock_flights(queryset)
+        previous = [
+            (flight.route_id, flight.departure_time) for flight in flights
+        ]
+        for flight in flights:
+            flight.departure_time += delta
+            flight.arrival_time += delta
+
+        errors = schedule_errors(flights, check_crew=True)
+        if errors:
+            raise error_to_raise({"flights": errors})
+
+        flight_ids = [flight.pk for flight in flights]
+        with airplane_overlap_as(error_to_raise, field="flights"):
+            Flight.objects.filter(pk__in=flight_ids).update(
+                departure_time=F("departure_time") + delta,
+                arrival_time=F("arrival_time") + delta,
+            )
+        flights_rescheduled.send(
+            sender=Flight,
+            flight_ids=flight_ids,
+            fields=("departure_time", "arrival_time"),
+            previous=previous,
+        )
+    return flight_ids
+
+
+def swap_airplane(flight_ids, airplane, error_to_raise):
+    """
+    Assign the airplane to all the given flights with a single UPDATE.
+    Returns the ids of the changed flights.
+    """
+    with transaction.atomic():
+        flights = lock_flights(Flight.objects.filter(pk__in=flight_ids))
+        missing = set(flight_ids) - {flight.pk for flight in flights}
+        if missing:
+            raise error_to_raise(
+                {"flights": f"Flights {sorted(missing)} do not exist."}
+            )
+        for flight in flights:
+            flight.airplane_id = airplane.pk
+
+        errors = schedule_errors(flights)
+        for flight_id, messages in seat_errors(flight_ids, airplane).items():
+            errors[flight_id] += messages
+        if errors:
+            raise error_to_raise({"flights": errors})
+
+        flight_ids = [flight.pk for flight in flights]
+        with airplane_overlap_as(error_to_raise, field="flights"):
+            Flight.objects.filter(pk__in=flight_ids).update(
+                airplane=airplane
+            )
+        flights_rescheduled.send(
+            sender=Flight,
+            flight_ids=flight_ids,
+            fields=("airplane",),
+            previous=[
+                (flight.route_id, flight.departure_time) for flight in flights
+            ],
+        )
+    return flight_ids
@@ -0,0 +1,170 @@
+import hashlib
+import time
+import zlib
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from airport.models import Flight
+
+CACHE_PREFIX = "flight-search"
+VERSION_PREFIX = f"{CACHE_PREFIX}:version"
+# Bumped when names shown in results change, e.g. of airports or crew
+EPOCH_VERSION = f"{VERSION_PREFIX}:epoch"
+# Bumped on every flight write, for searches without route and date
+ALL_FLIGHTS_VERSION = f"{VERSION_PREFIX}:all"
+
+
+def route_version(route_id):
+    return f"{VERSION_PREFIX}:route:{route_id}"
+
+
+def date_version(date):
+    return f"{VERSION_PREFIX}:date:{date.isoformat()}"
+
+
+def departure_date(departure_time):
+    """Local date of a departure time, which may still be raw input"""
+    departure_time = Flight._meta.get_field("departure_time").to_python(
+        departure_time
+    )
+    if timezone.is_naive(departure_time):
+        departure_time = timezone.make_aware(departure_time)
+    return timezone.localdate(departure_time)
+
+
+def normalized_query(params):
+    """
+    Filters and page of a search as a tuple, the same for equivalent
+    query strings, or None when they are invalid and the search should
+    not be cached.
+    """
+    try:
+        routes, airplanes = (
+            tuple(sorted({int(value) for value in params[name].split(",")}))
+            if params.get(name) else ()
+            for name in ("routes", "airplanes")
+        )
+        date = params.get("departure-date")
+        if date:
+            date = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+    return (
+        routes,
+        airplanes,
+        date or None,
+        params.get("page", "1"),
+        params.get("page_size", ""),
+    )
+
+
+def current_versions(keys):
+    versions = cache.get_many(keys)
+    if len(versions) < len(keys):
+        # Versions evicted or never bumped start at a value never used
+        # before, so no stale result can match them
+        for key in keys:
+            if key not in versions:
+                cache.add(key, time.time_ns(), None)
+        versions = cache.get_many(keys)
+    return [versions.get(key) for key in keys]
+
+
+def search_key(request):
+    """
+    Cache key of the flight search response, built from the normalized
+    query and the versions of the flights it can contain: of its routes
+    if given, else of its departure date, else of all flights.
+    """
+    query = normalized_query(request.query_params)
+    if query is None:
+        return None
+    routes, _, date = query[:3]
+    if routes:
+        scopes = [route_version(route_id) for route_id in routes]
+    elif date:
+        scopes = [date_version(date)]
+    else:
+        scopes = [ALL_FLIGHTS_VERSION]
+
+    versions = current_versions([EPOCH_VERSION, *scopes])
+    digest = hashlib.blake2b(
+        repr((request.get_host(), query, versions)).encode(), digest_size=16
+    ).hexdigest()
+    return f"{CACHE_PREFIX}:{digest}"
+
+
+def fetch(key, compute):
+    """
+    The response cached under `key`, computed with `compute()` on a miss.
+
+    Of a burst of identical misses only the first computes the response,
+    the others wait up to FLIGHT_SEARCH_WAIT_TIMEOUT for it to be cached,
+    and compute it themselves only if it is not. Returns a
+    (data, content) pair: the computed data, or the cached JSON.
+    """
+    stored = cache.get(key)
+    if stored is not None:
+        return None, zlib.decompress(stored)
+
+    lock_key = f"{key}:lock"
+    locked = cache.add(lock_key, True, settings.FLIGHT_SEARCH_LOCK_TIMEOUT)
+    if not locked:
+        deadline = time.monotonic() + settings.FLIGHT_SEARCH_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(settings.FLIGHT_SEARCH_POLL_INTERVAL)
+            stored = cache.get(key)
+            if stored is not None:
+                return None, zlib.decompress(stored)
+            if cache.get(lock_key) is None:
+                # The first request failed, take over from it
+                locked = cache.add(
+                    lock_key, True, settings.FLIGHT_SEARCH_LOCK_TIMEOUT
+                )
+                break
+
+    try:
+        data = compute()
+        cache.set(
+            key,
+            zlib.compress(JSONRenderer().render(data)),
+            settings.FLIGHT_SEARCH_CACHE_TTL,
+        )
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return data, None
+
+
+def bump(keys):
+    now = time.time_ns()
+    cache.set_many({key: now for key in keys}, None)
+
+
+def flights_changed(scopes):
+    """
+    Make searches for the given (route id, departure time) pairs miss,
+    call once the changes are committed.
+    """
+    keys = {ALL_FLIGHTS_VERSION}
+    for route_id, departure_time in scopes:
+        keys.add(route_version(route_id))
+        keys.add(date_version(departure_date(departure_time)))
+    bump(keys)
+
+
+def flight_scopes(flight_ids):
+    return list(
+        Flight.objects.filter(pk__in=flight_ids).values_list(
+            "route_id", "departure_time"
+        )
+    )
+
+
+def invalidate():
+    """Make every search miss, e.g. after an airport is renamed"""
+    bump([EPOCH_VERSION])
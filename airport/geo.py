@@ -0,0 +1,195 @@
+import heapq
+import math
+import time
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import cache
+
+from airport.models import Airport
+
+VERSION_CACHE_KEY = "airport:geo-version"
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def unit_vector(latitude, longitude):
+    """
+    Point on the unit sphere. Straight-line distances between such points
+    grow with the great-circle ones, so a plain KD-tree can search them.
+    """
+    latitude, longitude = math.radians(latitude), math.radians(longitude)
+    return (
+        math.cos(latitude) * math.cos(longitude),
+        math.cos(latitude) * math.sin(longitude),
+        math.sin(latitude),
+    )
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+
+def km_to_chord(km):
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def great_circle_km(latitudes_1, longitudes_1, latitudes_2, longitudes_2):
+    """
+    Haversine distances between two columns of points, computed in one
+    pass over the columns rather than point by point through the ORM.
+    """
+    radians = math.radians
+    return [
+        2 * EARTH_RADIUS_KM * math.asin(math.sqrt(
+            math.sin((radians(lat_2) - radians(lat_1)) / 2) ** 2
+            + math.cos(radians(lat_1)) * math.cos(radians(lat_2))
+            * math.sin((radians(lon_2) - radians(lon_1)) / 2) ** 2
+        ))
+        for lat_1, lon_1, lat_2, lon_2 in zip(
+            latitudes_1, longitudes_1, latitudes_2, longitudes_2
+        )
+    ]
+
+
+def route_distances(pairs):
+    """Rounded distances between (source, destination) airport pairs"""
+    sources, destinations = zip(*pairs) if pairs else ((), ())
+    return [
+        round(distance)
+        for distance in great_circle_km(
+            [airport.latitude for airport in sources],
+            [airport.longitude for airport in sources],
+            [airport.latitude for airport in destinations],
+            [airport.longitude for airport in destinations],
+        )
+    ]
+
+
+class AirportKDTree:
+    """
+    In-memory KD-tree of the airports with coordinates.
+
+    Stores the tree in a flat list of
+    (point, airport id, axis, left index, right index) nodes, split on
+    the median of the x, y and z axes in turn.
+    """
+
+    def __init__(self, airports):
+        self.airports = {}
+        points = []
+        for airport_id, name, city, latitude, longitude in airports:
+            self.airports[airport_id] = {
+                "id": airport_id,
+                "name": name,
+                "closest_big_city": city,
+                "latitude": latitude,
+                "longitude": longitude,
+            }
+            points.append((unit_vector(latitude, longitude), airport_id))
+
+        self.nodes = []
+        self.root = self.build(points, 0)
+
+    def build(self, points, axis):
+        if not points:
+            return -1
+        points.sort(key=lambda point: point[0][axis])
+        median = len(points) // 2
+        index = len(self.nodes)
+        self.nodes.append(None)
+        next_axis = (axis + 1) % 3
+        left = self.build(points[:median], next_axis)
+        right = self.build(points[median + 1:], next_axis)
+        self.nodes[index] = (*points[median], axis, left, right)
+        return index
+
+    def search(self, latitude, longitude, limit, radius_km=None):
+        """
+        Up to `limit` airports nearest to the point, optionally only
+        those within `radius_km`, closest first with their distance.
+        """
+        target = unit_vector(latitude, longitude)
+        max_squared = (
+            km_to_chord(radius_km) ** 2 if radius_km is not None else 4.0
+        )
+        # Max-heap of the best (-squared distance, airport id) so far
+        best = []
+
+        def bound():
+            if len(best) < limit:
+                return max_squared
+            return -best[0][0]
+
+        def visit(index):
+            if index < 0:
+                return
+            point, airport_id, axis, left, right = self.nodes[index]
+            squared = sum((a - b) ** 2 for a, b in zip(point, target))
+            if squared <= bound():
+                heapq.heappush(best, (-squared, airport_id))
+                if len(best) > limit:
+                    heapq.heappop(best)
+            offset = target[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            visit(near)
+            if offset ** 2 <= bound():
+                visit(far)
+
+        if limit > 0:
+            visit(self.root)
+        return [
+            {
+                **self.airports[airport_id],
+                "distance": round(chord_to_km(math.sqrt(-squared)), 1),
+            }
+            for squared, airport_id in sorted(best, reverse=True)
+        ]
+
+
+_tree = None
+_tree_version = None
+_checked_at = 0.0
+_lock = Lock()
+
+
+def invalidate():
+    """Make every worker rebuild its tree on the next search"""
+    global _checked_at
+
+    cache.set(VERSION_CACHE_KEY, time.time_ns(), None)
+    _checked_at = 0.0
+
+
+def get_tree():
+    """
+    Return the tree of this worker, rebuilding it when airports changed.
+    The shared version is checked at most every
+    AIRPORT_GEO_VERSION_CHECK_INTERVAL seconds.
+    """
+    global _tree, _tree_version, _checked_at
+
+    now = time.monotonic()
+    if (
+        _tree is not None
+        and now - _checked_at < settings.AIRPORT_GEO_VERSION_CHECK_INTERVAL
+    ):
+        return _tree
+
+    with _lock:
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            version = time.time_ns()
+            cache.add(VERSION_CACHE_KEY, version, None)
+        if _tree is None or version != _tree_version:
+            _tree = AirportKDTree(
+                Airport.objects.filter(
+                    latitude__isnull=False, longitude__isnull=False
+                ).values_list(
+                    "id", "name", "closest_big_city", "latitude", "longitude"
+                )
+            )
+            _tree_version = version
+        _checked_at = now
+
+    return _tree
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "airport_seats"
+
+# pg_notify payloads are limited to 8000 bytes
+MAX_SEATS_PER_NOTIFICATION = 500
+
+
+def publish(flight_id, event, seats):
+    """
+    Announces (row, seat) pairs of a flight newly `taken` or `released`
+    to every worker. Sent inside the current transaction, the
+    notification is delivered only if and when it commits.
+    """
+    if connection.vendor != "postgresql":
+        # Only PostgreSQL passes notifications between workers
+        return
+    seats = list(seats)
+    with connection.cursor() as cursor:
+        for start in range(0, len(seats), MAX_SEATS_PER_NOTIFICATION):
+            payload = json.dumps({
+                "flight": flight_id,
+                "event": event,
+                "seats": seats[start:start + MAX_SEATS_PER_NOTIFICATION],
+            })
+            cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+
+
+class AsyncEvents:
+    """
+    Events of a watcher served by the event loop of an ASGI server,
+    put from the listener thread
+    """
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    def put(self, event):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class SeatBroker:
+    """
+    In-process fan-out of seat notifications.
+
+    One thread per worker LISTENs on its own database connection and puts
+    every notification on the queues of the watchers of that flight, so
+    the number of watchers does not change the load on the database.
+    """
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+        self.listening = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def subscribe(self, flight_id, events):
+        """Adds `events`, with a `put` method, to the watchers of a flight"""
+        with self.lock:
+            self.subscribers[flight_id].add(events)
+            if self.thread is None or not self.thread.is_alive():
+                self.stopping.clear()
+                self.thread = threading.Thread(
+                    target=self.listen, name="seat-broker", daemon=True
+                )
+                self.thread.start()
+        # Changes made before LISTEN would otherwise be missed
+        self.listening.wait(settings.LIVE_SEATS_CONNECT_TIMEOUT)
+        return events
+
+    def unsubscribe(self, flight_id, events):
+        with self.lock:
+            watchers = self.subscribers.get(flight_id)
+            if watchers is not None:
+                watchers.discard(events)
+                if not watchers:
+                    del self.subscribers[flight_id]
+
+    def stop(self):
+        """Closes the listening connection, e.g. before the database goes"""
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def dispatch(self, payload):
+        event = json.loads(payload)
+        with self.lock:
+            watchers = list(self.subscribers.get(event["flight"], ()))
+        for events in watchers:
+            events.put(event)
+
+    def listen(self):
+        wrapper = connections[self.alias]
+        while not self.stopping.is_set():
+            try:
+                listener = wrapper.get_new_connection(
+                    wrapper.get_connection_params()
+                )
+                with listener:
+                    listener.autocommit = True
+                    listener.execute(f"LISTEN {CHANNEL}")
+                    self.listening.set()
+                    while not self.stopping.is_set():
+                        for notify in listener.notifies(timeout=1):
+                            self.dispatch(notify.payload)
+            except Exception:
+                logger.exception("Seat notification listener failed")
+                self.stopping.wait(1)
+            self.listening.clear()
+
+
+broker = SeatBroker()
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def release_connection():
+    # Watchers may stay for minutes, they must not hold on to a database
+    # connection meanwhile
+    if not connection.in_atomic_block:
+        connection.close()
+
+
+def event_stream(flight_id, get_seatmap):
+    """
+    Server-sent events of a flight: its current seat map, then every
+    change, with comments keeping idle connections open. Blocks a thread
+    per watcher, see `async_event_stream` for ASGI servers.
+    """
+    # Subscribing before reading the seat map, so no change falls between
+    events = broker.subscribe(flight_id, queue.SimpleQueue())
+    try:
+        yield f"retry: {settings.LIVE_SEATS_RETRY_MS}\n\n"
+        yield format_event("seatmap", get_seatmap())
+        release_connection()
+
+        deadline = time.monotonic() + settings.LIVE_SEATS_STREAM_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                event = events.get(
+                    timeout=settings.LIVE_SEATS_KEEPALIVE_INTERVAL
+                )
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event["event"], event["seats"])
+    finally:
+        broker.unsubscribe(flight_id, events)
+
+
+async def async_event_stream(flight_id, get_seatmap):
+    """
+    The events of `event_stream` for ASGI servers, which Django would
+    only send once a synchronous stream ended. Watchers wait on the
+    event loop, so they need no thread each.
+    """
+    events = AsyncEvents()
+    await sync_to_async(broker.subscribe, thread_sensitive=False)(
+        flight_id, events
+    )
+    try:
+        yield f"retry: {settings.LIVE_SEATS_RETRY_MS}\n\n"
+        yield format_event("seatmap", await sync_to_async(get_seatmap)())
+        await sync_to_async(release_connection)()
+
+        deadline = time.monotonic() + settings.LIVE_SEATS_STREAM_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                event = await asyncio.wait_for(
+                    events.get(), settings.LIVE_SEATS_KEEPALIVE_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event["event"], event["seats"])
+    finally:
+        broker.unsubscribe(flight_id, events)
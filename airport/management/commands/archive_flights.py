@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from airport import archive, changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Move orders whose flights have all arrived, and then flights "
+        "without live tickets, to the archive tables in batches, and "
+        "prune the change feed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            help=(
+                "Date or datetime in ISO 8601 format, defaults to "
+                "ARCHIVE_FLIGHTS_AFTER ago"
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ARCHIVE_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        before = self.parse_before(options["before"])
+        batch_size = options["batch_size"]
+
+        orders = flights = 0
+        while moved := archive.archive_orders(before, batch_size):
+            orders += moved
+        while moved := archive.archive_flights(before, batch_size):
+            flights += moved
+        pruned = changes.prune(
+            timezone.now() - settings.CHANGE_FEED_RETENTION
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {orders} orders and {flights} flights "
+                f"arrived before {before.isoformat()}, pruned {pruned} "
+                f"changes older than {settings.CHANGE_FEED_RETENTION}"
+            )
+        )
+
+    @staticmethod
+    def parse_before(value):
+        if value is None:
+            return timezone.now() - settings.ARCHIVE_FLIGHTS_AFTER
+        before = parse_datetime(value)
+        if before is None and parse_date(value):
+            before = datetime.combine(parse_date(value), datetime.min.time())
+        if before is None:
+            raise CommandError(
+                "--before must be a date or datetime in ISO 8601 format."
+            )
+        if timezone.is_naive(before):
+            before = timezone.make_aware(before)
+        return before
@@ -0,0 +1,253 @@
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import DatabaseError, connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from airport.models import Airplane, Airport, Flight, Order, Route, Ticket
+from airport.views import FlightViewSet, OrderViewSet
+
+MODES = (
+    ("client-side binding", {"server_side_binding": False}),
+    (
+        "server-side binding",
+        {"server_side_binding": True, "prepare_threshold": None},
+    ),
+    (
+        "prepared statements",
+        {
+            "server_side_binding": True,
+            "prepare_threshold": settings.POSTGRES_PREPARE_THRESHOLD,
+        },
+    ),
+)
+
+SEATS_IN_ROW = 10
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of flight and order requests on the "
+        "configured database with client-side parameter binding, "
+        "server-side binding and server-side prepared statements. "
+        "Planning time is reported when pg_stat_statements tracks it. "
+        "Creates its own flights and orders and removes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--flights", type=int, default=20)
+        parser.add_argument("--history", type=int, default=20)
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        orders = options["history"] + len(MODES) * (
+            options["warmup"] + options["requests"]
+        )
+        user, buyer = (
+            get_user_model().objects.create_user(
+                email=f"benchmark-{name}-{suffix}@example.com", password=None
+            )
+            for name in ("history", "buyer")
+        )
+        airplane = Airplane.objects.create(
+            name=f"Benchmark {suffix}",
+            rows=-(-orders * 2 // options["flights"] // SEATS_IN_ROW),
+            seats_in_row=SEATS_IN_ROW,
+        )
+        route = Route.objects.create(
+            source=Airport.objects.create(
+                name=f"Benchmark A {suffix}", closest_big_city="A"
+            ),
+            destination=Airport.objects.create(
+                name=f"Benchmark B {suffix}", closest_big_city="B"
+            ),
+            distance=1,
+        )
+        database_options = connection.settings_dict["OPTIONS"]
+        try:
+            departure_time = timezone.now() + timezone.timedelta(days=30)
+            self.flights = [
+                Flight.objects.create(
+                    route=route,
+                    airplane=airplane,
+                    departure_time=departure_time
+                    + timezone.timedelta(days=day),
+                    arrival_time=departure_time
+                    + timezone.timedelta(days=day, hours=1),
+                )
+                for day in range(options["flights"])
+            ]
+            self.seats_booked = 0
+            for _ in range(options["history"]):
+                order = Order.objects.create(user=user)
+                for ticket in self.next_tickets():
+                    Ticket.objects.create(
+                        order=order,
+                        flight_id=ticket["flight"],
+                        row=ticket["row"],
+                        seat=ticket["seat"],
+                    )
+
+            # Search responses would come from the cache, and the
+            # throttles would reject most of the requests
+            with override_settings(
+                FLIGHT_SEARCH_CACHE_TTL=0,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ):
+                for name, mode_options in MODES:
+                    connection.close()
+                    connection.settings_dict["OPTIONS"] = {
+                        **database_options,
+                        **mode_options,
+                    }
+                    self.stdout.write(f"{name}:")
+                    self.run(user, buyer, route, options)
+                    self.stdout.write(
+                        f"  {self.prepared_statements()} statements "
+                        f"prepared on the connection"
+                    )
+        finally:
+            connection.close()
+            connection.settings_dict["OPTIONS"] = database_options
+            user.delete()
+            buyer.delete()
+            Flight.objects.filter(route=route).delete()
+            route.delete()
+            airplane.delete()
+            Airport.objects.filter(name__endswith=suffix).delete()
+
+    def next_tickets(self):
+        """Tickets of the next two free seats, spread over the flights"""
+        tickets = []
+        for _ in range(2):
+            flight = self.flights[self.seats_booked % len(self.flights)]
+            position = self.seats_booked // len(self.flights)
+            tickets.append(
+                {
+                    "flight": flight.pk,
+                    "row": position // SEATS_IN_ROW + 1,
+                    "seat": position % SEATS_IN_ROW + 1,
+                }
+            )
+            self.seats_booked += 1
+        return tickets
+
+    def run(self, user, buyer, route, options):
+        factory = APIRequestFactory()
+        flight_list = FlightViewSet.as_view(
+            {"get": "list"}, throttle_classes=[]
+        )
+        flight_detail = FlightViewSet.as_view(
+            {"get": "retrieve"}, throttle_classes=[]
+        )
+        orders = OrderViewSet.as_view(
+            {"get": "list", "post": "create"}, throttle_classes=[]
+        )
+
+        def authenticated(request, as_user=user):
+            force_authenticate(request, as_user)
+            return request
+
+        endpoints = (
+            (
+                "flight list",
+                lambda number: flight_list(
+                    authenticated(factory.get("/", {"routes": route.pk}))
+                ),
+            ),
+            (
+                "flight detail",
+                lambda number: flight_detail(
+                    authenticated(factory.get("/")),
+                    pk=self.flights[number % len(self.flights)].pk,
+                ),
+            ),
+            (
+                "order list",
+                lambda number: orders(authenticated(factory.get("/"))),
+            ),
+            (
+                "order create",
+                lambda number: orders(
+                    authenticated(
+                        factory.post(
+                            "/",
+                            {"tickets": self.next_tickets()},
+                            format="json",
+                        ),
+                        buyer,
+                    )
+                ),
+            ),
+        )
+
+        for name, request in endpoints:
+            for number in range(options["warmup"]):
+                request(number).render()
+
+            tracking = self.reset_planning_stats()
+            latencies = []
+            for number in range(options["requests"]):
+                started = time.perf_counter()
+                response = request(number).render()
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise RuntimeError(
+                        f"{name} failed with {response.status_code}: "
+                        f"{response.content[:200]!r}"
+                    )
+
+            percentiles = statistics.quantiles(latencies, n=20)
+            line = (
+                f"  {name}: p50 {statistics.median(latencies):.2f} ms, "
+                f"p95 {percentiles[18]:.2f} ms"
+            )
+            if tracking:
+                plans, plan_time = self.planning_stats()
+                line += f", {plans} plans in {plan_time:.1f} ms"
+            self.stdout.write(line)
+
+    @staticmethod
+    def reset_planning_stats():
+        """
+        Reset pg_stat_statements, True when it is installed and tracks
+        planning, so the planning of the requests can be read after
+        """
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT current_setting("
+                    "'pg_stat_statements.track_planning', true)"
+                )
+                if cursor.fetchone()[0] != "on":
+                    return False
+                cursor.execute("SELECT pg_stat_statements_reset()")
+        except DatabaseError:
+            return False
+        return True
+
+    @staticmethod
+    def planning_stats():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(SUM(plans), 0), "
+                "COALESCE(SUM(total_plan_time), 0) "
+                "FROM pg_stat_statements "
+                "WHERE dbid = (SELECT oid FROM pg_database "
+                "WHERE datname = current_database())"
+            )
+            return cursor.fetchone()
+
+    @staticmethod
+    def prepared_statements():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pg_prepared_statements")
+            return cursor.fetchone()[0]
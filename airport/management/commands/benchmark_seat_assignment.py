@@ -0,0 +1,159 @@
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as ModelValidationError
+from django.core.management import BaseCommand
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from airport.models import Airplane, Airport, Flight, Route, Ticket
+from airport.serializers import OrderSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Book one flight from many threads at once on the configured "
+        "database, picking seats explicitly and retrying on conflicts, "
+        "then letting the server assign them, and compare the throughput. "
+        "Creates its own flights and removes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=300)
+        parser.add_argument("--threads", type=int, default=50)
+        parser.add_argument("--seats", type=int, default=1)
+        parser.add_argument("--together", action="store_true")
+        parser.add_argument("--max-retries", type=int, default=20)
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        user = get_user_model().objects.create_user(
+            email=f"benchmark-{suffix}@example.com", password=None
+        )
+        airplane = Airplane.objects.create(
+            name=f"Benchmark {suffix}",
+            rows=-(-options["bookings"] * options["seats"] * 2 // 10),
+            seats_in_row=10,
+        )
+        route = Route.objects.create(
+            source=Airport.objects.create(
+                name=f"Benchmark A {suffix}", closest_big_city="A"
+            ),
+            destination=Airport.objects.create(
+                name=f"Benchmark B {suffix}", closest_big_city="B"
+            ),
+            distance=1,
+        )
+        departure_time = timezone.now() + timezone.timedelta(days=30)
+        flights = []
+        try:
+            for name, book in (
+                ("explicit seats with retries", self.book_explicit),
+                ("automatic assignment", self.book_automatic),
+            ):
+                flight = Flight.objects.create(
+                    route=route,
+                    airplane=airplane,
+                    departure_time=departure_time,
+                    arrival_time=departure_time + timezone.timedelta(hours=1),
+                )
+                departure_time += timezone.timedelta(hours=2)
+                flights.append(flight)
+                self.run(name, book, user, flight, options)
+        finally:
+            for flight in flights:
+                flight.delete()
+            route.delete()
+            airplane.delete()
+            user.delete()
+            Airport.objects.filter(name__endswith=suffix).delete()
+
+    def run(self, name, book, user, flight, options):
+        def task(_):
+            try:
+                return book(user, flight, options)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["threads"]) as executor:
+            results = list(executor.map(task, range(options["bookings"])))
+        elapsed = time.perf_counter() - started
+
+        booked = sum(1 for ok, _ in results if ok)
+        retries = sum(attempts - 1 for _, attempts in results)
+        self.stdout.write(
+            f"{name}: {booked}/{options['bookings']} orders in "
+            f"{elapsed:.2f} s ({booked / elapsed:.0f} orders/s), "
+            f"{retries} retries, "
+            f"{Ticket.objects.filter(flight=flight).count()} tickets"
+        )
+
+    @staticmethod
+    def book_explicit(user, flight, options):
+        """
+        What clients do without automatic assignment: read the taken
+        seats, pick free ones and send the order again on conflicts
+        """
+        airplane = flight.airplane
+        for attempt in range(1, options["max_retries"] + 1):
+            taken = set(
+                Ticket.objects.filter(flight=flight).values_list(
+                    "row", "seat"
+                )
+            )
+            free = [
+                (row, seat)
+                for row in range(1, airplane.rows + 1)
+                for seat in range(1, airplane.seats_in_row + 1)
+                if (row, seat) not in taken
+            ]
+            if options["together"]:
+                row, seat = random.choice(free)
+                seats = [
+                    (row, number)
+                    for number in range(seat, seat + options["seats"])
+                ]
+            else:
+                seats = random.sample(free, options["seats"])
+            serializer = OrderSerializer(
+                data={
+                    "tickets": [
+                        {"row": row, "seat": seat, "flight": flight.pk}
+                        for row, seat in seats
+                    ]
+                }
+            )
+            try:
+                serializer.is_valid(raise_exception=True)
+                serializer.save(user=user)
+                return True, attempt
+            except (DatabaseError, ModelValidationError, ValidationError):
+                # Taken by another order since it was read, or a deadlock
+                # between orders inserting the same seats
+                continue
+        return False, options["max_retries"]
+
+    @staticmethod
+    def book_automatic(user, flight, options):
+        serializer = OrderSerializer(
+            data={
+                "seat_requests": [
+                    {
+                        "flight": flight.pk,
+                        "count": options["seats"],
+                        "together": options["together"],
+                    }
+                ]
+            }
+        )
+        try:
+            serializer.is_valid(raise_exception=True)
+            serializer.save(user=user)
+        except ValidationError:
+            return False, 1
+        return True, 1
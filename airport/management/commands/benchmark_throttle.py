@@ -0,0 +1,55 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import BaseCommand
+from rest_framework import throttling
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from airport_api.throttling import SlidingWindowRateThrottle
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request overhead of the sliding-window throttle "
+        "against DRF's timestamp-history throttle on the configured cache"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checks", type=int, default=5000)
+        parser.add_argument("--rate", default="100000/hour")
+
+    def handle(self, *args, **options):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = AnonymousUser()
+
+        for name, base in (
+            ("timestamp history", throttling.SimpleRateThrottle),
+            ("sliding window", SlidingWindowRateThrottle),
+        ):
+            throttle_class = type(
+                "BenchmarkThrottle",
+                (base,),
+                {
+                    "rate": options["rate"],
+                    "get_cache_key": lambda self, request, view: (
+                        "throttle_benchmark"
+                    ),
+                },
+            )
+            cache.delete_many(
+                ["throttle_benchmark"]
+                + [f"throttle_benchmark:{int(time.time() // 3600) + i}"
+                   for i in (-1, 0)]
+            )
+
+            started = time.perf_counter()
+            for _ in range(options["checks"]):
+                throttle_class().allow_request(request, None)
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(
+                f"{name}: {elapsed / options['checks'] * 1e6:.1f} us/check "
+                f"after {options['checks']} checks"
+            )
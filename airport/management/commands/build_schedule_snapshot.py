@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from airport import snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the flights that have not departed yet to the binary "
+        "snapshot served at /api/airport/schedule-snapshot/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.SCHEDULE_SNAPSHOT_FILE,
+            help="Defaults to SCHEDULE_SNAPSHOT_FILE",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.SCHEDULE_SNAPSHOT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        flights = snapshot.build(options["output"], options["chunk_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {flights} flights to {options['output']}"
+            )
+        )
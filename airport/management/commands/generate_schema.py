@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from airport_api.schema import generate_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI schema served at /api/doc/ to "
+        "OPENAPI_SCHEMA_FILE, or check that the file is up to date"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the schema file differs from the current API",
+        )
+
+    def handle(self, *args, **options):
+        schema_file = Path(settings.OPENAPI_SCHEMA_FILE)
+        content = generate_schema()
+
+        if options["check"]:
+            if not schema_file.exists() or (
+                schema_file.read_bytes() != content
+            ):
+                raise CommandError(
+                    f"{schema_file.name} is out of date, "
+                    f"run `manage.py generate_schema` and commit it"
+                )
+            self.stdout.write(self.style.SUCCESS("Schema is up to date"))
+            return
+
+        schema_file.write_bytes(content)
+        self.stdout.write(
+            self.style.SUCCESS(f"Schema written to {schema_file}")
+        )
@@ -0,0 +1,143 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+# Runs in a fresh interpreter, so imports are measured from a cold start
+PROFILE_SCRIPT = """
+import io
+import json
+import sys
+import time
+
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+
+application = get_wsgi_application()
+loaded = time.perf_counter()
+
+environ = {
+    "REQUEST_METHOD": "GET",
+    "PATH_INFO": sys.argv[1],
+    "SERVER_NAME": "localhost",
+    "SERVER_PORT": "80",
+    "HTTP_HOST": "localhost",
+    "wsgi.input": io.BytesIO(),
+    "wsgi.url_scheme": "http",
+}
+statuses = []
+response = application(
+    environ, lambda status, headers: statuses.append(status)
+)
+b"".join(response)
+finished = time.perf_counter()
+
+print(json.dumps({
+    "setup_ms": (loaded - started) * 1000,
+    "first_request_ms": (finished - loaded) * 1000,
+    "status": statuses[0],
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a fresh worker process and report per-package import time, "
+        "application load time and time to the first request"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default="/api/airport/",
+            help="Path of the first request",
+        )
+        parser.add_argument(
+            "--env",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="Environment of the worker, e.g. --env ENABLE_ADMIN=0",
+        )
+        parser.add_argument("--limit", type=int, default=15)
+        parser.add_argument(
+            "--max-boot-ms",
+            type=float,
+            help="Fail if start-up and first request take longer",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the raw measurements as JSON",
+        )
+
+    def handle(self, *args, **options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE
+            ),
+        }
+        for variable in options["env"]:
+            name, _, value = variable.partition("=")
+            env[name] = value
+
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROFILE_SCRIPT,
+             options["path"]],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(process.stderr[-2000:])
+
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        result["packages_ms"] = self.import_times(process.stderr)
+        result["boot_ms"] = result["setup_ms"] + result["first_request_ms"]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result))
+        else:
+            self.report(result, options["limit"])
+
+        if options["max_boot_ms"] and (
+            result["boot_ms"] > options["max_boot_ms"]
+        ):
+            raise CommandError(
+                f"Boot took {result['boot_ms']:.0f} ms, "
+                f"more than {options['max_boot_ms']:.0f} ms"
+            )
+
+    @staticmethod
+    def import_times(importtime_output):
+        """Sum the self import time of every top-level package in ms"""
+        packages = defaultdict(float)
+        for line in importtime_output.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, _, module = line[len("import time:"):].split("|")
+            packages[module.strip().split(".")[0]] += int(self_us) / 1000
+        return dict(
+            sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        )
+
+    def report(self, result, limit):
+        self.stdout.write(
+            f"Imports:       {sum(result['packages_ms'].values()):8.1f} ms"
+        )
+        self.stdout.write(f"App load:      {result['setup_ms']:8.1f} ms")
+        self.stdout.write(
+            f"First request: {result['first_request_ms']:8.1f} ms "
+            f"({result['status']})"
+        )
+        self.stdout.write(f"Boot total:    {result['boot_ms']:8.1f} ms")
+        self.stdout.write("\nSlowest packages to import:")
+        for package, duration in list(result["packages_ms"].items())[:limit]:
+            self.stdout.write(f"  {duration:8.1f} ms  {package}")
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:10
+
+import airport.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+
+FLIGHT_AIRPLANE_NO_OVERLAP = (
+    django.contrib.postgres.constraints.ExclusionConstraint(
+        expressions=[
+            (
+                airport.models.TsTzRange(
+                    "departure_time",
+                    "arrival_time",
+                    django.contrib.postgres.fields.ranges.RangeBoundary(),
+                ),
+                "&&",
+            ),
+            ("airplane", "="),
+        ],
+        name="flight_airplane_no_overlap",
+        violation_error_message="Airplane is already assigned to an overlapping flight.",
+    )
+)
+
+
+def btree_gist_available(schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist'"
+        )
+        return cursor.fetchone() is not None
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    # The GiST constraint needs btree_gist for the airplane equality;
+    # without it overlaps are checked through flight_airplane_time_idx.
+    if not btree_gist_available(schema_editor):
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.add_constraint(
+        apps.get_model("airport", "Flight"), FLIGHT_AIRPLANE_NO_OVERLAP
+    )
+
+
+def remove_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "ALTER TABLE airport_flight "
+        "DROP CONSTRAINT IF EXISTS flight_airplane_no_overlap"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["airplane", "departure_time", "arrival_time"],
+                name="flight_airplane_time_idx",
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name="flight",
+                    constraint=FLIGHT_AIRPLANE_NO_OVERLAP,
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(
+                    add_exclusion_constraint, remove_exclusion_constraint
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:13
+
+import airport.models
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+FLIGHT_PERIOD_INDEX = django.contrib.postgres.indexes.GistIndex(
+    airport.models.TsTzRange(
+        "departure_time",
+        "arrival_time",
+        django.contrib.postgres.fields.ranges.RangeBoundary(),
+    ),
+    name="flight_period_idx",
+)
+
+
+def add_period_index(apps, schema_editor):
+    # Range expressions only exist on PostgreSQL; elsewhere overlap
+    # lookups scan flight_airplane_time_idx instead.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.add_index(
+        apps.get_model("airport", "Flight"), FLIGHT_PERIOD_INDEX
+    )
+
+
+def remove_period_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"DROP INDEX IF EXISTS "
+        f"{schema_editor.quote_name(FLIGHT_PERIOD_INDEX.name)}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0002_flight_airplane_schedule"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="flight", index=FLIGHT_PERIOD_INDEX
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(add_period_index, remove_period_index),
+            ],
+        ),
+    ]
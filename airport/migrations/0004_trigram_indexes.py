@@ -0,0 +1,97 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:16
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    (
+        "airplane",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["name"],
+            name="airplane_name_trgm_idx",
+            opclasses=["gin_trgm_ops"],
+        ),
+    ),
+    (
+        "airport",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["name"],
+            name="airport_name_trgm_idx",
+            opclasses=["gin_trgm_ops"],
+        ),
+    ),
+    (
+        "airport",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["closest_big_city"],
+            name="airport_city_trgm_idx",
+            opclasses=["gin_trgm_ops"],
+        ),
+    ),
+    (
+        "crew",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["first_name"],
+            name="crew_first_name_trgm_idx",
+            opclasses=["gin_trgm_ops"],
+        ),
+    ),
+    (
+        "crew",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["last_name"],
+            name="crew_last_name_trgm_idx",
+            opclasses=["gin_trgm_ops"],
+        ),
+    ),
+]
+
+
+def pg_trgm_available(schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        return cursor.fetchone() is not None
+
+
+def add_trigram_indexes(apps, schema_editor):
+    # Without pg_trgm airport.search falls back to unindexed substring
+    # matching.
+    if not pg_trgm_available(schema_editor):
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for model_name, index in TRIGRAM_INDEXES:
+        schema_editor.add_index(apps.get_model("airport", model_name), index)
+
+
+def remove_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _, index in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0003_flight_period_idx"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name=model_name, index=index)
+                for model_name, index in TRIGRAM_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(
+                    add_trigram_indexes, remove_trigram_indexes
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:50
+
+import airport.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.db.models.constraints
+from django.db import migrations, models
+
+
+def flight_airplane_no_overlap(deferrable):
+    return django.contrib.postgres.constraints.ExclusionConstraint(
+        deferrable=deferrable,
+        expressions=[
+            (
+                airport.models.TsTzRange(
+                    "departure_time",
+                    "arrival_time",
+                    django.contrib.postgres.fields.ranges.RangeBoundary(),
+                ),
+                "&&",
+            ),
+            ("airplane", "="),
+        ],
+        name="flight_airplane_no_overlap",
+        violation_error_message="Airplane is already assigned to an overlapping flight.",
+    )
+
+
+def replace_exclusion_constraint(deferrable):
+    # The constraint only exists where 0002 found btree_gist, and
+    # PostgreSQL cannot make an existing exclusion constraint deferrable
+    def replace(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_constraint "
+                "WHERE conname = 'flight_airplane_no_overlap'"
+            )
+            if cursor.fetchone() is None:
+                return
+        model = apps.get_model("airport", "Flight")
+        schema_editor.remove_constraint(
+            model, flight_airplane_no_overlap(None)
+        )
+        schema_editor.add_constraint(
+            model, flight_airplane_no_overlap(deferrable)
+        )
+
+    return replace
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_archive"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="flight",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["IMMEDIATE"],
+                fields=("route", "airplane", "departure_time"),
+                name="flight_route_airplane_departure_uniq",
+                violation_error_message="A flight with this route, airplane, and departure time already exists.",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="flight",
+            unique_together=set(),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveConstraint(
+                    model_name="flight",
+                    name="flight_airplane_no_overlap",
+                ),
+                migrations.AddConstraint(
+                    model_name="flight",
+                    constraint=flight_airplane_no_overlap(
+                        django.db.models.constraints.Deferrable["IMMEDIATE"]
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(
+                    replace_exclusion_constraint(
+                        django.db.models.constraints.Deferrable["IMMEDIATE"]
+                    ),
+                    replace_exclusion_constraint(None),
+                ),
+            ],
+        ),
+    ]
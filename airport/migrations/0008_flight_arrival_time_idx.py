@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0007_flight_deferrable_constraints"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["arrival_time"], name="flight_arrival_time_idx"
+            ),
+        ),
+    ]
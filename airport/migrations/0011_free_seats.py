@@ -0,0 +1,89 @@
+# Generated by Django 5.1.3 on 2026-10-19 11:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_free_seats(apps, schema_editor):
+    FreeSeat = apps.get_model("airport", "FreeSeat")
+    Flight = apps.get_model("airport", "Flight")
+    Airplane = apps.get_model("airport", "Airplane")
+    Ticket = apps.get_model("airport", "Ticket")
+    if schema_editor.connection.vendor != "postgresql":
+        # Without generate_series the seats are listed in Python
+        taken = set(Ticket.objects.values_list("flight_id", "row", "seat"))
+        layouts = Flight.objects.values_list(
+            "id", "airplane__rows", "airplane__seats_in_row"
+        )
+        FreeSeat.objects.bulk_create(
+            (
+                FreeSeat(flight_id=flight_id, row=row, seat=seat)
+                for flight_id, rows, seats_in_row in layouts
+                for row in range(1, rows + 1)
+                for seat in range(1, seats_in_row + 1)
+                if (flight_id, row, seat) not in taken
+            ),
+            batch_size=1000,
+        )
+        return
+    schema_editor.execute(
+        f'INSERT INTO {FreeSeat._meta.db_table} (flight_id, "row", seat) '
+        f"SELECT flight.id, seat_row.number, seat_number.number "
+        f"FROM {Flight._meta.db_table} flight "
+        f"JOIN {Airplane._meta.db_table} airplane "
+        f"ON airplane.id = flight.airplane_id "
+        f"CROSS JOIN LATERAL generate_series(1, airplane.rows) "
+        f"AS seat_row(number) "
+        f"CROSS JOIN LATERAL generate_series(1, airplane.seats_in_row) "
+        f"AS seat_number(number) "
+        f"WHERE NOT EXISTS ("
+        f"SELECT 1 FROM {Ticket._meta.db_table} ticket "
+        f"WHERE ticket.flight_id = flight.id "
+        f'AND ticket."row" = seat_row.number '
+        f"AND ticket.seat = seat_number.number"
+        f")"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0010_change_feed"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FreeSeat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("row", models.IntegerField()),
+                ("seat", models.IntegerField()),
+                (
+                    "flight",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="free_seats",
+                        to="airport.flight",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["row", "seat"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("flight", "row", "seat"),
+                        name="free_seat_flight_row_seat_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_free_seats, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,18 @@ import os
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, GistIndex
+from django.contrib.postgres.fields import (
+    ArrayField,
+    DateTimeRangeField,
+    RangeBoundary,
+    RangeOperators,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Deferrable
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
@@ -38,15 +49,47 @@ class Airplane(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # Trigram indexes are only created where pg_trgm is available
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="airplane_name_trgm_idx",
+            ),
+        ]
 
 
 class Airport(models.Model):
     name = models.CharField(max_length=255, unique=True)
     closest_big_city = models.CharField(max_length=255)
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
 
     def __str__(self):
         return f"{self.name}({self.closest_big_city})"
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="airport_name_trgm_idx",
+            ),
+            GinIndex(
+                fields=["closest_big_city"],
+                opclasses=["gin_trgm_ops"],
+                name="airport_city_trgm_idx",
+            ),
+        ]
+
 
 class Route(models.Model):
     source = models.ForeignKey(
@@ -72,6 +115,25 @@ class Crew(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["first_name"],
+                opclasses=["gin_trgm_ops"],
+                name="crew_first_name_trgm_idx",
+            ),
+            GinIndex(
+                fields=["last_name"],
+                opclasses=["gin_trgm_ops"],
+                name="crew_last_name_trgm_idx",
+            ),
+        ]
+
+
+class TsTzRange(models.Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
 
 class Flight(models.Model):
     route = models.ForeignKey(
@@ -97,6 +159,28 @@ class Flight(models.Model):
                 }
             )
 
+    @staticmethod
+    def validate_airplane_schedule(
+            airplane,
+            departure_time,
+            arrival_time,
+            error_to_raise,
+            exclude_pk=None,
+    ):
+        conflict = Flight.objects.filter(
+            airplane=airplane,
+            departure_time__lt=arrival_time,
+            arrival_time__gt=departure_time,
+        ).exclude(pk=exclude_pk).first()
+        if conflict:
+            raise error_to_raise(
+                {
+                    "airplane": f"Airplane {airplane} is already assigned "
+                                f"to {conflict} ({conflict.departure_time} - "
+                                f"{conflict.arrival_time})."
+                }
+            )
+
     def clean(self):
         Flight.validate_time(
             self.departure_time,
@@ -105,7 +189,52 @@ class Flight(models.Model):
         )
 
     class Meta:
-        unique_together = ("route", "airplane", "departure_time")
+        indexes = [
+            models.Index(
+                fields=["airplane", "departure_time", "arrival_time"],
+                name="flight_airplane_time_idx",
+            ),
+            models.Index(
+                fields=["departure_time"], name="flight_departure_time_idx"
+            ),
+            models.Index(
+                fields=["arrival_time"], name="flight_arrival_time_idx"
+            ),
+            GistIndex(
+                TsTzRange("departure_time", "arrival_time", RangeBoundary()),
+                name="flight_period_idx",
+            ),
+        ]
+        # Deferrable constraints are checked at the end of each statement
+        # instead of row by row, so one UPDATE can shift a whole chain of
+        # flights into each other's slots
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route", "airplane", "departure_time"],
+                name="flight_route_airplane_departure_uniq",
+                deferrable=Deferrable.IMMEDIATE,
+                violation_error_message="A flight with this route, "
+                                        "airplane, and departure time "
+                                        "already exists.",
+            ),
+            # Created by migration only where btree_gist is available,
+            # otherwise flight_airplane_time_idx serves the overlap queries
+            ExclusionConstraint(
+                name="flight_airplane_no_overlap",
+                expressions=[
+                    (
+                        TsTzRange(
+                            "departure_time", "arrival_time", RangeBoundary()
+                        ),
+                        RangeOperators.OVERLAPS,
+                    ),
+                    ("airplane", RangeOperators.EQUAL),
+                ],
+                deferrable=Deferrable.IMMEDIATE,
+                violation_error_message="Airplane is already assigned "
+                                        "to an overlapping flight.",
+            )
+        ]
 
     def __str__(self):
         return f"Flight {self.id}"
@@ -123,7 +252,7 @@ class Order(models.Model):
         ordering = ["-created_at"]
 
     def __str__(self):
-        return self.created_at
+        return str(self.created_at)
 
 
 class Ticket(models.Model):
@@ -180,3 +309,136 @@ class Ticket(models.Model):
         return super(Ticket, self).save(
             force_insert, force_update, using, update_fields
         )
+
+
+class FreeSeat(models.Model):
+    """
+    A seat of a flight without a ticket, kept in step with the tickets
+    and the flight's airplane (see `airport.seating`). Automatic seat
+    assignment claims these rows with SKIP LOCKED, so concurrent orders
+    take different seats instead of failing over the same one.
+    """
+
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="free_seats"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+
+    class Meta:
+        ordering = ["row", "seat"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["flight", "row", "seat"],
+                name="free_seat_flight_row_seat_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Flight {self.flight_id} - row: {self.row} seat: {self.seat}"
+
+
+# Departed flights and their orders are moved to the tables below by
+# `manage.py archive_flights`, keeping the live tables small. The archive
+# only grows at its end in time, which block range (BRIN) indexes on the
+# times exploit at a fraction of the size of a B-tree.
+
+class ArchivedFlight(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="archived_flights"
+    )
+    airplane = models.ForeignKey(
+        Airplane, on_delete=models.CASCADE, related_name="archived_flights"
+    )
+    crewmates = ArrayField(models.BigIntegerField(), default=list)
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-departure_time"]
+        indexes = [
+            BrinIndex(
+                fields=["departure_time"],
+                name="archived_flight_departure_brin",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Flight {self.id}"
+
+
+class ArchivedOrder(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_orders"
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            BrinIndex(
+                fields=["created_at"], name="archived_order_created_brin"
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.created_at)
+
+
+class ArchivedTicket(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    # Orders are archived once all their flights have departed, while a
+    # departed flight stays live until no live order holds a ticket for it
+    flight = models.ForeignKey(
+        ArchivedFlight,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="tickets",
+    )
+    order = models.ForeignKey(
+        ArchivedOrder, on_delete=models.CASCADE, related_name="tickets"
+    )
+
+    class Meta:
+        ordering = ["row", "seat"]
+
+
+class Change(models.Model):
+    """
+    A write to the schedule, in the feed at /api/airport/changes/.
+
+    `sequence` is assigned once the writing transaction has committed
+    (see `airport.changes.assign_sequence`), so readers paging by it
+    never skip a change committed late.
+    """
+
+    class Action(models.TextChoices):
+        INSERT = "insert"
+        UPDATE = "update"
+        DELETE = "delete"
+
+    sequence = models.BigIntegerField(null=True, blank=True, unique=True)
+    model = models.CharField(max_length=31)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=7, choices=Action.choices)
+    data = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["sequence"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(sequence__isnull=True),
+                name="change_unsequenced_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.model} {self.object_id}"
@@ -0,0 +1,173 @@
+from contextlib import contextmanager
+from operator import itemgetter
+
+from django.conf import settings
+from django.contrib.postgres.fields import RangeBoundary
+from django.db import IntegrityError, transaction
+
+from airport.models import Flight, TsTzRange
+
+# Exclusion constraint backing `airplane_conflicts` on PostgreSQL
+AIRPLANE_OVERLAP_CONSTRAINT = "flight_airplane_no_overlap"
+
+
+def sweep_overlaps(intervals):
+    """
+    Find overlapping [start, end) intervals within each group.
+
+    Takes (group, start, end, item) tuples and yields
+    (group, item, other_item) for every interval that starts before
+    an earlier-starting interval of the same group has ended.
+    Runs in O(n log n).
+    """
+    latest_end = {}
+    for group, start, end, item in sorted(intervals, key=itemgetter(0, 1)):
+        previous = latest_end.get(group)
+        if previous is not None and previous[0] > start:
+            yield group, item, previous[1]
+            if end <= previous[0]:
+                continue
+        latest_end[group] = (end, item)
+
+
+def overlapping(queryset, start, end, prefix=""):
+    """
+    Filter a queryset to flights overlapping [start, end) using the
+    flight_period_idx GiST index. `prefix` is the lookup path to the
+    flight when filtering a related model, e.g. "flight__".
+    """
+    return queryset.alias(
+        flight_period=TsTzRange(
+            f"{prefix}departure_time",
+            f"{prefix}arrival_time",
+            RangeBoundary(),
+        )
+    ).filter(flight_period__overlap=(start, end))
+
+
+def airplane_conflicts(flights):
+    """
+    Check a whole schedule of new or changed flights for airplanes
+    assigned to overlapping flights, both within the schedule and
+    against the stored flights, using a single indexed query.
+
+    Returns (flight, conflicting_flight) pairs.
+    """
+    flights = list(flights)
+    if not flights:
+        return []
+
+    stored = Flight.objects.filter(
+        airplane_id__in={flight.airplane_id for flight in flights},
+        departure_time__lt=max(flight.arrival_time for flight in flights),
+        arrival_time__gt=min(flight.departure_time for flight in flights),
+    ).exclude(
+        pk__in=[flight.pk for flight in flights if flight.pk]
+    ).only("id", "airplane_id", "departure_time", "arrival_time")
+
+    scheduled = {id(flight) for flight in flights}
+    conflicts = []
+    for _, flight, other in sweep_overlaps(
+        (
+            flight.airplane_id,
+            flight.departure_time,
+            flight.arrival_time,
+            flight,
+        )
+        for flight in [*flights, *stored]
+    ):
+        if id(flight) not in scheduled:
+            flight, other = other, flight
+        if id(flight) in scheduled:
+            conflicts.append((flight, other))
+    return conflicts
+
+
+@contextmanager
+def airplane_overlap_as(error_to_raise, field="airplane"):
+    """
+    Turn a violation of the airplane exclusion constraint into
+    error_to_raise on `field`. Concurrent writers may both pass
+    `airplane_conflicts` before either has stored its flights.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as error:
+        diag = getattr(error.__cause__, "diag", None)
+        if getattr(diag, "constraint_name", None) != (
+            AIRPLANE_OVERLAP_CONSTRAINT
+        ):
+            raise
+        constraint = next(
+            constraint
+            for constraint in Flight._meta.constraints
+            if constraint.name == AIRPLANE_OVERLAP_CONSTRAINT
+        )
+        raise error_to_raise(
+            {field: [constraint.violation_error_message]}
+        ) from error
+
+
+def crew_conflicts(crew_assignments):
+    """
+    Check (flight, crewmates) assignments of a whole schedule for crew
+    members on overlapping flights or with less than CREW_MIN_REST
+    between two flights, against each other and the stored flights.
+
+    Returns (flight, crew_id, conflicting_flight) triples.
+    """
+    crew_assignments = [
+        (flight, [getattr(crew, "pk", crew) for crew in crewmates])
+        for flight, crewmates in crew_assignments
+    ]
+    crew_ids = {
+        crew for _, crewmates in crew_assignments for crew in crewmates
+    }
+    if not crew_ids:
+        return []
+
+    rest = settings.CREW_MIN_REST
+    flights = [flight for flight, _ in crew_assignments]
+    stored = overlapping(
+        Flight.crewmates.through.objects.filter(crew_id__in=crew_ids),
+        min(flight.departure_time for flight in flights) - rest,
+        max(flight.arrival_time for flight in flights) + rest,
+        prefix="flight__",
+    ).exclude(
+        flight_id__in=[flight.pk for flight in flights if flight.pk]
+    ).values_list(
+        "crew_id",
+        "flight_id",
+        "flight__departure_time",
+        "flight__arrival_time",
+    )
+
+    # A flight blocks its crew until the end of the rest period
+    intervals = [
+        (crew, flight.departure_time, flight.arrival_time + rest, flight)
+        for flight, crewmates in crew_assignments
+        for crew in crewmates
+    ]
+    intervals += [
+        (
+            crew,
+            departure_time,
+            arrival_time + rest,
+            Flight(
+                pk=flight_id,
+                departure_time=departure_time,
+                arrival_time=arrival_time,
+            ),
+        )
+        for crew, flight_id, departure_time, arrival_time in stored
+    ]
+    scheduled = {id(flight) for flight in flights}
+
+    conflicts = []
+    for crew, flight, other in sweep_overlaps(intervals):
+        if id(flight) not in scheduled:
+            flight, other = other, flight
+        if id(flight) in scheduled:
+            conflicts.append((flight, crew, other))
+    return conflicts
@@ -0,0 +1,60 @@
+from functools import lru_cache
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+
+@lru_cache
+def trigram_enabled(using):
+    """Whether the pg_trgm extension is installed in the database"""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def _greatest(expressions):
+    if len(expressions) == 1:
+        return expressions[0]
+    return Greatest(*expressions)
+
+
+def search(queryset, fields, query):
+    """
+    Filter a queryset to rows where any of the fields matches the query
+    and order them by relevance.
+
+    With pg_trgm the substring match and similarity ranking are served
+    by the trigram GIN indexes and misspelled queries still match.
+    Otherwise rows are matched by substring and ranked by prefix matches.
+    """
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": query})
+
+    if trigram_enabled(queryset.db):
+        for field in fields:
+            condition |= Q(**{f"{field}__trigram_similar": query})
+        rank = _greatest(
+            [TrigramSimilarity(field, query) for field in fields]
+        )
+    else:
+        rank = _greatest(
+            [
+                Case(
+                    When(**{f"{field}__istartswith": query}, then=Value(1.0)),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+                for field in fields
+            ]
+        )
+
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return queryset.filter(condition).annotate(
+        search_rank=rank
+    ).order_by("-search_rank", *ordering, "pk")
@@ -0,0 +1,237 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.dispatch import Signal
+
+from airport.models import Airplane, Flight, FreeSeat, Ticket
+
+# Sent with the flight id and the (row, seat) pairs of tickets created by
+# automatic seat assignment with a single INSERT, which bypasses the model
+# signals
+tickets_assigned = Signal()
+
+
+class SeatsTaken(Exception):
+    """The seats of a candidate block were claimed by another order"""
+
+
+def materialize(flight_ids):
+    """
+    Rebuild the free seats of the flights from their airplanes and
+    tickets, after a flight is created or gets another airplane
+    """
+    flight_ids = list(flight_ids)
+    if connection.vendor != "postgresql":
+        # Without generate_series the seats are listed in Python
+        FreeSeat.objects.filter(flight_id__in=flight_ids).delete()
+        taken = set(
+            Ticket.objects.filter(flight_id__in=flight_ids).values_list(
+                "flight_id", "row", "seat"
+            )
+        )
+        layouts = Flight.objects.filter(id__in=flight_ids).values_list(
+            "id", "airplane__rows", "airplane__seats_in_row"
+        )
+        FreeSeat.objects.bulk_create(
+            (
+                FreeSeat(flight_id=flight_id, row=row, seat=seat)
+                for flight_id, rows, seats_in_row in layouts
+                for row in range(1, rows + 1)
+                for seat in range(1, seats_in_row + 1)
+                if (flight_id, row, seat) not in taken
+            ),
+            batch_size=1000,
+        )
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FreeSeat._meta.db_table} "
+            f"WHERE flight_id = ANY(%s)",
+            [flight_ids],
+        )
+        cursor.execute(
+            f'INSERT INTO {FreeSeat._meta.db_table} (flight_id, "row", seat) '
+            f"SELECT flight.id, seat_row.number, seat_number.number "
+            f"FROM {Flight._meta.db_table} flight "
+            f"JOIN {Airplane._meta.db_table} airplane "
+            f"ON airplane.id = flight.airplane_id "
+            f"CROSS JOIN LATERAL generate_series(1, airplane.rows) "
+            f"AS seat_row(number) "
+            f"CROSS JOIN LATERAL generate_series(1, airplane.seats_in_row) "
+            f"AS seat_number(number) "
+            f"WHERE flight.id = ANY(%s) AND NOT EXISTS ("
+            f"SELECT 1 FROM {Ticket._meta.db_table} ticket "
+            f"WHERE ticket.flight_id = flight.id "
+            f'AND ticket."row" = seat_row.number '
+            f"AND ticket.seat = seat_number.number"
+            f")",
+            [flight_ids],
+        )
+
+
+def take(flight_id, seats):
+    """Remove seats booked explicitly from the free ones"""
+    for row, seat in seats:
+        FreeSeat.objects.filter(
+            flight_id=flight_id, row=row, seat=seat
+        ).delete()
+
+
+def release(flight_id, seats):
+    """Return the seats of deleted tickets to the free ones"""
+    FreeSeat.objects.bulk_create(
+        [
+            FreeSeat(flight_id=flight_id, row=row, seat=seat)
+            for row, seat in seats
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def take_locked(queryset):
+    """
+    Delete the free seats of the queryset that no concurrent order has
+    locked, in two statements for databases without DELETE ... RETURNING
+    from a locking subquery. Returns the (row, seat) pairs taken.
+    """
+    seats = list(
+        queryset.select_for_update(skip_locked=True).values_list(
+            "id", "row", "seat"
+        )
+    )
+    FreeSeat.objects.filter(id__in=[id_ for id_, _, _ in seats]).delete()
+    return sorted((row, seat) for _, row, seat in seats)
+
+
+def claim_any(flight_id, count):
+    """
+    Take up to `count` free seats of the flight, front rows first.
+    Seats being claimed by concurrent orders are skipped rather than
+    waited for. Returns the (row, seat) pairs taken.
+    """
+    if connection.vendor != "postgresql":
+        return take_locked(
+            FreeSeat.objects.filter(flight_id=flight_id).order_by(
+                "row", "seat"
+            )[:count]
+        )
+    table = FreeSeat._meta.db_table
+    with connection.cursor() as cursor:
+        # Materialized, since a subquery rescanned by the delete would
+        # skip the seats it already took and return further ones
+        cursor.execute(
+            f"WITH claimed AS MATERIALIZED ("
+            f'SELECT id FROM {table} WHERE flight_id = %s '
+            f'ORDER BY "row", seat LIMIT %s FOR UPDATE SKIP LOCKED'
+            f") DELETE FROM {table} WHERE id IN (SELECT id FROM claimed) "
+            f'RETURNING "row", seat',
+            [flight_id, count],
+        )
+        return sorted(cursor.fetchall())
+
+
+def candidate_blocks(flight_id, count):
+    """
+    First seats of the blocks of `count` free seats next to each other
+    in a row, from the runs of consecutive free seats, front rows first
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT "row", MIN(seat), COUNT(*) FROM ('
+            f'SELECT "row", seat, seat - ROW_NUMBER() OVER ('
+            f'PARTITION BY "row" ORDER BY seat) AS run '
+            f"FROM {FreeSeat._meta.db_table} WHERE flight_id = %s"
+            f') runs GROUP BY "row", run HAVING COUNT(*) >= %s '
+            f'ORDER BY "row", MIN(seat)',
+            [flight_id, count],
+        )
+        return [
+            (row, start)
+            for row, first, length in cursor.fetchall()
+            for start in range(first, first + length - count + 1, count)
+        ]
+
+
+def claim_block(flight_id, row, start, count):
+    """
+    Take the seats `start` to `start + count - 1` of the row, all or
+    none: raises SeatsTaken, undoing the claim, if another order got one
+    """
+    table = FreeSeat._meta.db_table
+    with transaction.atomic():
+        if connection.vendor != "postgresql":
+            seats = take_locked(
+                FreeSeat.objects.filter(
+                    flight_id=flight_id,
+                    row=row,
+                    seat__range=(start, start + count - 1),
+                )
+            )
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE id IN ("
+                    f"SELECT id FROM {table} WHERE flight_id = %s "
+                    f'AND "row" = %s AND seat BETWEEN %s AND %s '
+                    f"FOR UPDATE SKIP LOCKED"
+                    f') RETURNING "row", seat',
+                    [flight_id, row, start, start + count - 1],
+                )
+                seats = sorted(cursor.fetchall())
+        if len(seats) < count:
+            raise SeatsTaken()
+    return seats
+
+
+def claim_together(flight_id, count):
+    """
+    Take `count` free seats next to each other in a row. Blocks being
+    claimed by concurrent orders are passed over, and the blocks are read
+    again up to SEAT_ASSIGNMENT_ATTEMPTS times while all of them were.
+    Returns the seats, or [] when no block could be taken.
+    """
+    for _ in range(settings.SEAT_ASSIGNMENT_ATTEMPTS):
+        blocks = candidate_blocks(flight_id, count)
+        if not blocks:
+            break
+        for row, start in blocks:
+            try:
+                return claim_block(flight_id, row, start, count)
+            except SeatsTaken:
+                continue
+    return []
+
+
+def claim(flight, count, together, error_to_raise):
+    """
+    Take `count` free seats of the flight, next to each other in a row
+    when `together`. Must run in the transaction creating the tickets,
+    so the seats return to the free ones if it fails.
+    """
+    if together:
+        seats = claim_together(flight.pk, count)
+    else:
+        seats = claim_any(flight.pk, count)
+    if len(seats) < count:
+        raise error_to_raise(
+            {
+                "seat_requests": (
+                    f"Flight {flight.pk} has no {count} free seats"
+                    f"{' next to each other' if together else ''}."
+                )
+            }
+        )
+    return seats
+
+
+def assign(order, flight, count, together, error_to_raise):
+    """
+    Add tickets for `count` seats of the flight picked by the server to
+    the order. Returns the (row, seat) pairs assigned.
+    """
+    seats = claim(flight, count, together, error_to_raise)
+    Ticket.objects.bulk_create(
+        Ticket(order=order, flight=flight, row=row, seat=seat)
+        for row, seat in seats
+    )
+    tickets_assigned.send(sender=Ticket, flight_id=flight.pk, seats=seats)
+    return seats
@@ -0,0 +1,81 @@
+import base64
+
+
+def bitmap(rows, seats_in_row, taken):
+    """
+    Base64 of one bit per seat, row by row, most significant bit first:
+    seat `s` of row `r` is bit `(r - 1) * seats_in_row + s - 1`.
+    """
+    bits = bytearray((rows * seats_in_row + 7) // 8)
+    for row, seat in taken:
+        if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+            index = (row - 1) * seats_in_row + seat - 1
+            bits[index >> 3] |= 0x80 >> (index & 7)
+    return base64.b64encode(bits).decode()
+
+
+def runs(rows, seats_in_row, taken):
+    """
+    Lengths of alternating free and taken runs of every row, starting
+    with a free one, e.g. [2, 1, 3] is two free, one taken, three free.
+    """
+    taken_by_row = [set() for _ in range(rows)]
+    for row, seat in taken:
+        if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+            taken_by_row[row - 1].add(seat)
+
+    encoded = []
+    for row_taken in taken_by_row:
+        row_runs = []
+        length = 0
+        is_taken = False
+        for seat in range(1, seats_in_row + 1):
+            if (seat in row_taken) != is_taken:
+                row_runs.append(length)
+                length = 0
+                is_taken = not is_taken
+            length += 1
+        row_runs.append(length)
+        encoded.append(row_runs)
+    return encoded
+
+
+def free_masks(rows, seats_in_row, taken):
+    """Free seats of every row, bit `s - 1` set when seat `s` is free"""
+    masks = [(1 << seats_in_row) - 1] * rows
+    for row, seat in taken:
+        if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+            masks[row - 1] &= ~(1 << (seat - 1))
+    return masks
+
+
+def block_starts(mask, count):
+    """
+    Bits of the seats followed by `count - 1` free seats in the mask.
+    Each AND with the mask shifted down doubles the length of the free
+    runs checked, so a block takes log2(count) steps.
+    """
+    length = 1
+    while length < count:
+        shift = min(length, count - length)
+        mask &= mask >> shift
+        length += shift
+    return mask
+
+
+def adjacent_blocks(rows, seats_in_row, taken, count):
+    """
+    (row, first seat) of every block of `count` free seats next to each
+    other in a row, front rows and lower seat numbers first
+    """
+    blocks = []
+    for row, mask in enumerate(free_masks(rows, seats_in_row, taken), 1):
+        starts = block_starts(mask, count)
+        while starts:
+            lowest = starts & -starts
+            blocks.append((row, lowest.bit_length()))
+            starts ^= lowest
+    return blocks
+
+
+ENCODINGS = {"bitmap": bitmap, "runs": runs}
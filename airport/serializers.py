@@ -1,3 +1,6 @@
+from collections import defaultdict
+
+from django.conf import settings
 from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
@@ -5,8 +8,12 @@ from rest_framework.relations import SlugRelatedField
 from rest_framework.validators import UniqueTogetherValidator
 
 from airport.models import (
+    ArchivedFlight,
+    ArchivedOrder,
+    ArchivedTicket,
     Airplane,
     AirplaneType,
+    Change,
     Airport,
     Route,
     Crew,
@@ -14,6 +21,13 @@ from airport.models import (
     Ticket,
     Order
 )
+from airport import live, seating
+from airport.geo import route_distances
+from airport.schedule import (
+    airplane_conflicts,
+    airplane_overlap_as,
+    crew_conflicts,
+)
 
 
 class AirplaneTypeSerializer(serializers.ModelSerializer):
@@ -57,13 +71,125 @@ class AirplaneImageSerializer(serializers.ModelSerializer):
 class AirportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Airport
-        fields = ["id", "name", "closest_big_city"]
+        fields = ["id", "name", "closest_big_city", "latitude", "longitude"]
+
+
+class NearbyAirportSerializer(AirportSerializer):
+    distance = serializers.FloatField(help_text="Great-circle distance, km")
+
+    class Meta(AirportSerializer.Meta):
+        fields = AirportSerializer.Meta.fields + ["distance"]
+
+
+class NearbyAirportQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(
+        min_value=-90, max_value=90, help_text="Latitude in degrees"
+    )
+    lon = serializers.FloatField(
+        min_value=-180, max_value=180, help_text="Longitude in degrees"
+    )
+    radius = serializers.FloatField(
+        min_value=0,
+        required=False,
+        help_text="Only airports within this many km",
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=10,
+        help_text="Maximum number of airports",
+    )
+
+
+class AirportAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(
+        allow_blank=True,
+        trim_whitespace=False,
+        help_text="Typed prefix (e.g., ?q=bor)",
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=10,
+        help_text="Maximum number of airports",
+    )
+
+
+def _has_coordinates(airport):
+    return airport.latitude is not None and airport.longitude is not None
+
+
+class RouteImportSerializer(serializers.ListSerializer):
+    """Fills the missing distances of a whole list of routes at once"""
+
+    def to_internal_value(self, data):
+        attrs = super(RouteImportSerializer, self).to_internal_value(data)
+        missing = [route for route in attrs if "distance" not in route]
+        errors = [
+            RouteSerializer.MISSING_DISTANCE
+            if "distance" not in route and not (
+                _has_coordinates(route["source"])
+                and _has_coordinates(route["destination"])
+            )
+            else {}
+            for route in attrs
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+
+        for route, distance in zip(
+            missing,
+            route_distances(
+                [(route["source"], route["destination"]) for route in missing]
+            ),
+        ):
+            route["distance"] = distance
+        return attrs
 
 
 class RouteSerializer(serializers.ModelSerializer):
+    MISSING_DISTANCE = {
+        "distance": "Required unless both airports have coordinates."
+    }
+
+    def validate(self, attrs):
+        data = super(RouteSerializer, self).validate(attrs=attrs)
+        # Lists of routes get their distances from RouteImportSerializer
+        if "distance" in attrs or isinstance(
+            self.parent, serializers.ListSerializer
+        ):
+            return data
+
+        source, destination = (
+            attrs.get(field, getattr(self.instance, field, None))
+            for field in ("source", "destination")
+        )
+        located = _has_coordinates(source) and _has_coordinates(destination)
+        if self.instance is not None:
+            # Updates keep the stored distance unless the airports change
+            # to ones it can be computed for
+            moved = (source, destination) != (
+                self.instance.source, self.instance.destination
+            )
+            if moved and located:
+                data["distance"] = route_distances([(source, destination)])[0]
+            return data
+
+        if not located:
+            raise ValidationError(self.MISSING_DISTANCE)
+        data["distance"] = route_distances([(source, destination)])[0]
+        return data
+
     class Meta:
         model = Route
+        list_serializer_class = RouteImportSerializer
         fields = ["id", "source", "destination", "distance"]
+        extra_kwargs = {
+            "distance": {
+                "required": False,
+                "help_text": "Great-circle distance in km by default",
+            }
+        }
 
 
 class RouteListSerializer(RouteSerializer):
@@ -86,21 +212,123 @@ class CrewSerializer(serializers.ModelSerializer):
         fields = ["id", "first_name", "last_name", "full_name"]
 
 
+def _crew_conflict_message(crew_id, other):
+    return (
+        f"Crewmate {crew_id} is assigned to "
+        f"{other if other.pk else 'another flight'} "
+        f"({other.departure_time} - {other.arrival_time}) "
+        f"without {settings.CREW_MIN_REST} of rest in between."
+    )
+
+
+class FlightScheduleSerializer(serializers.ListSerializer):
+    """Validates a whole list of flights against each other at once"""
+
+    def to_internal_value(self, data):
+        attrs = super(FlightScheduleSerializer, self).to_internal_value(data)
+        flights = [
+            Flight(
+                route=flight["route"],
+                airplane=flight["airplane"],
+                departure_time=flight["departure_time"],
+                arrival_time=flight["arrival_time"],
+            )
+            for flight in attrs
+        ]
+        positions = {id(flight): i for i, flight in enumerate(flights)}
+        errors = [{} for _ in flights]
+        for flight, other in airplane_conflicts(flights):
+            errors[positions[id(flight)]]["airplane"] = [
+                f"Airplane {flight.airplane} is already assigned to "
+                f"{other if other.pk else 'another flight'} "
+                f"({other.departure_time} - {other.arrival_time})."
+            ]
+        for flight, crew_id, other in crew_conflicts(
+            zip(flights, (flight.get("crewmates", []) for flight in attrs))
+        ):
+            errors[positions[id(flight)]].setdefault("crewmates", []).append(
+                _crew_conflict_message(crew_id, other)
+            )
+        if any(errors):
+            raise ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        flights = []
+        for position, attrs in enumerate(validated_data):
+            try:
+                flights.append(self.child.create(attrs))
+            except ValidationError as error:
+                errors = [{} for _ in validated_data]
+                errors[position] = error.detail
+                raise ValidationError(errors)
+        return flights
+
+
 class FlightSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         data = super(FlightSerializer, self).validate(attrs=attrs)
+        departure_time, arrival_time, airplane = (
+            attrs.get(field, getattr(self.instance, field, None))
+            for field in ("departure_time", "arrival_time", "airplane")
+        )
         Flight.validate_time(
-            attrs["departure_time"],
-            attrs["arrival_time"],
+            departure_time,
+            arrival_time,
             ValidationError
         )
+        # Lists of flights are checked together by FlightScheduleSerializer
+        if not isinstance(self.parent, serializers.ListSerializer):
+            Flight.validate_airplane_schedule(
+                airplane,
+                departure_time,
+                arrival_time,
+                ValidationError,
+                exclude_pk=getattr(self.instance, "pk", None),
+            )
+            self.validate_crew_schedule(attrs, departure_time, arrival_time)
         return data
 
+    def validate_crew_schedule(self, attrs, departure_time, arrival_time):
+        if "crewmates" in attrs:
+            crewmates = attrs["crewmates"]
+        elif self.instance:
+            crewmates = self.instance.crewmates.all()
+        else:
+            return
+
+        flight = Flight(
+            pk=getattr(self.instance, "pk", None),
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        )
+        conflicts = crew_conflicts([(flight, crewmates)])
+        if conflicts:
+            raise ValidationError(
+                {
+                    "crewmates": [
+                        _crew_conflict_message(crew_id, other)
+                        for _, crew_id, other in conflicts
+                    ]
+                }
+            )
+
+    def create(self, validated_data):
+        with airplane_overlap_as(ValidationError):
+            return super(FlightSerializer, self).create(validated_data)
+
+    def update(self, instance, validated_data):
+        with airplane_overlap_as(ValidationError):
+            return super(FlightSerializer, self).update(
+                instance, validated_data
+            )
+
     departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
     arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
 
     class Meta:
         model = Flight
+        list_serializer_class = FlightScheduleSerializer
         fields = [
             "id",
             "route",
@@ -119,6 +347,102 @@ class FlightSerializer(serializers.ModelSerializer):
         ]
 
 
+class ChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Change
+        fields = [
+            "sequence", "model", "object_id", "action", "data", "created_at"
+        ]
+
+
+class ChangeFeedQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(
+        min_value=0,
+        help_text=(
+            "Last sequence number already applied, 0 for all changes. "
+            "Once those are pruned the feed answers 410 with the `latest` "
+            "sequence number to continue from after downloading "
+            "everything again."
+        ),
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.CHANGE_FEED_MAX_PAGE_SIZE,
+        default=settings.CHANGE_FEED_PAGE_SIZE,
+        help_text="Maximum number of changes",
+    )
+
+
+class ChangeFeedSerializer(serializers.Serializer):
+    changes = ChangeSerializer(many=True)
+    next = serializers.IntegerField(
+        help_text="Pass as `since` to read the following changes"
+    )
+    more = serializers.BooleanField(
+        help_text="Whether more changes are ready to be read right away"
+    )
+
+
+class ChangeFeedPrunedSerializer(serializers.Serializer):
+    detail = serializers.CharField()
+    latest = serializers.IntegerField(
+        help_text="Pass as `since` once everything is downloaded again"
+    )
+
+
+class FlightBoardQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.FLIGHT_BOARD_MAX_SIZE,
+        default=settings.FLIGHT_BOARD_SIZE,
+        help_text="Number of flights",
+    )
+
+
+class FlightBoardSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    route_id = serializers.IntegerField()
+    source = serializers.CharField()
+    destination = serializers.CharField()
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+
+
+class FlightShiftSerializer(serializers.Serializer):
+    airplane = serializers.PrimaryKeyRelatedField(
+        queryset=Airplane.objects.all(), required=False
+    )
+    route = serializers.PrimaryKeyRelatedField(
+        queryset=Route.objects.all(), required=False
+    )
+    after = serializers.DateTimeField(
+        help_text="Flights departing at or after this time are shifted"
+    )
+    delta = serializers.DurationField(
+        help_text="Negative to bring the flights forward"
+    )
+
+    def validate(self, attrs):
+        if "airplane" not in attrs and "route" not in attrs:
+            raise ValidationError(
+                "Choose the flights by airplane, route or both."
+            )
+        return attrs
+
+
+class AirplaneSwapSerializer(serializers.Serializer):
+    flights = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+    airplane = serializers.PrimaryKeyRelatedField(
+        queryset=Airplane.objects.all()
+    )
+
+
+class RescheduledFlightsSerializer(serializers.Serializer):
+    flights = serializers.ListField(child=serializers.IntegerField())
+
+
 class FlightListSerializer(FlightSerializer):
     airplane = serializers.SlugRelatedField(read_only=True, slug_field="name")
     route = serializers.StringRelatedField()
@@ -130,7 +454,9 @@ class FlightListSerializer(FlightSerializer):
 
     def get_tickets_available(self, obj):
         total_seats = obj.airplane.rows * obj.airplane.seats_in_row
-        occupied_seats = obj.tickets.count()
+        occupied_seats = getattr(obj, "occupied_seats", None)
+        if occupied_seats is None:
+            occupied_seats = obj.tickets.count()
         return total_seats - occupied_seats
 
     class Meta:
@@ -146,6 +472,17 @@ class FlightListSerializer(FlightSerializer):
         ]
 
 
+class CrewFlightSerializer(serializers.ModelSerializer):
+    route = serializers.StringRelatedField()
+    airplane = serializers.SlugRelatedField(read_only=True, slug_field="name")
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+
+    class Meta:
+        model = Flight
+        fields = ["id", "route", "airplane", "departure_time", "arrival_time"]
+
+
 class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
@@ -181,6 +518,58 @@ class TicketSeatsSerializer(TicketSerializer):
         fields = ("row", "seat")
 
 
+class SeatMapSerializer(serializers.Serializer):
+    flight = serializers.IntegerField()
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    tickets_sold = serializers.IntegerField()
+    encoding = serializers.ChoiceField(choices=["bitmap", "runs"])
+    bitmap = serializers.CharField(required=False)
+    runs = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField()),
+        required=False,
+    )
+
+
+class AdjacentSeatsQuerySerializer(serializers.Serializer):
+    count = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.SEAT_ASSIGNMENT_MAX_SEATS,
+        help_text="Number of seats next to each other in a row",
+    )
+
+
+class FlightsAdjacentSeatsQuerySerializer(AdjacentSeatsQuerySerializer):
+    flights = serializers.CharField(
+        help_text="Comma separated flight IDs, e.g. of search results"
+    )
+
+    def validate_flights(self, value):
+        try:
+            flight_ids = list(
+                dict.fromkeys(int(flight_id) for flight_id in value.split(","))
+            )
+        except ValueError:
+            raise ValidationError("Provide comma separated flight IDs.")
+        if len(flight_ids) > settings.ADJACENT_SEATS_MAX_FLIGHTS:
+            raise ValidationError(
+                f"Provide at most {settings.ADJACENT_SEATS_MAX_FLIGHTS} "
+                f"flights."
+            )
+        return flight_ids
+
+
+class SeatBlockSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seats = serializers.ListField(child=serializers.IntegerField())
+
+
+class AdjacentSeatsSerializer(serializers.Serializer):
+    flight = serializers.IntegerField()
+    count = serializers.IntegerField()
+    blocks = SeatBlockSerializer(many=True)
+
+
 class FlightDetailSerializer(FlightSerializer):
     route = RouteDetailSerializer(read_only=True)
     airplane = AirplaneDetailSerializer(read_only=True)
@@ -202,21 +591,105 @@ class FlightDetailSerializer(FlightSerializer):
         ]
 
 
+class SeatRequestSerializer(serializers.Serializer):
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+    count = serializers.IntegerField(
+        min_value=1, max_value=settings.SEAT_ASSIGNMENT_MAX_SEATS
+    )
+    together = serializers.BooleanField(
+        default=False, help_text="Seats next to each other in one row"
+    )
+
+    def validate(self, attrs):
+        airplane = attrs["flight"].airplane
+        if attrs["together"] and attrs["count"] > airplane.seats_in_row:
+            raise ValidationError(
+                {
+                    "count": f"Airplane {airplane} has only "
+                             f"{airplane.seats_in_row} seats in a row."
+                }
+            )
+        return attrs
+
+
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = TicketSerializer(
+        many=True, read_only=False, allow_empty=False, required=False
+    )
+    seat_requests = SeatRequestSerializer(
+        many=True,
+        write_only=True,
+        required=False,
+        help_text="Seats for the server to pick, returned in tickets",
+    )
 
     class Meta:
         model = Order
-        fields = ["id", "tickets", "created_at"]
+        fields = ["id", "tickets", "seat_requests", "created_at"]
+
+    def validate(self, attrs):
+        if not attrs.get("tickets") and not attrs.get("seat_requests"):
+            raise ValidationError(
+                {"tickets": "Pick seats here or request any in seat_requests."}
+            )
+        return attrs
 
     def create(self, validated_data):
         with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
+            tickets_data = validated_data.pop("tickets", [])
+            seat_requests = validated_data.pop("seat_requests", [])
             order = Order.objects.create(**validated_data)
+            taken = defaultdict(list)
             for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+                ticket = Ticket.objects.create(order=order, **ticket_data)
+                taken[ticket.flight_id].append((ticket.row, ticket.seat))
+            for seat_request in seat_requests:
+                flight = seat_request["flight"]
+                taken[flight.pk] += seating.assign(
+                    order,
+                    flight,
+                    seat_request["count"],
+                    seat_request["together"],
+                    ValidationError,
+                )
+            for flight_id, seats in taken.items():
+                live.publish(flight_id, "taken", seats)
             return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class ArchivedFlightSerializer(serializers.ModelSerializer):
+    airplane = serializers.SlugRelatedField(read_only=True, slug_field="name")
+    route = serializers.StringRelatedField()
+    tickets_sold = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ArchivedFlight
+        fields = [
+            "id",
+            "route",
+            "airplane",
+            "crewmates",
+            "departure_time",
+            "arrival_time",
+            "tickets_sold",
+        ]
+
+
+class ArchivedTicketSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedTicket
+        fields = ["id", "row", "seat", "flight"]
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    tickets = ArchivedTicketSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedOrder
+        fields = ["id", "tickets", "created_at"]
@@ -0,0 +1,236 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from airport import (
+    autocomplete,
+    board,
+    changes,
+    flight_search,
+    geo,
+    live,
+    seating,
+)
+from airport.archive import flights_archived, tickets_archived
+from airport.disruption import flights_rescheduled
+from airport.seating import tickets_assigned
+from airport.models import (
+    Airplane,
+    Airport,
+    Change,
+    Crew,
+    Flight,
+    Route,
+    Ticket,
+)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+def airport_changed(sender, **kwargs):
+    transaction.on_commit(autocomplete.invalidate)
+    transaction.on_commit(geo.invalidate)
+    transaction.on_commit(board.invalidate)
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def route_changed(sender, **kwargs):
+    transaction.on_commit(board.invalidate)
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def flight_changed(sender, instance, **kwargs):
+    transaction.on_commit(partial(board.flights_changed, [instance.pk]))
+
+
+@receiver(flights_rescheduled)
+@receiver(flights_archived)
+def flights_changed_in_bulk(sender, flight_ids, **kwargs):
+    transaction.on_commit(partial(board.flights_changed, flight_ids))
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_save, sender=Airplane)
+@receiver(post_save, sender=Route)
+@receiver(post_save, sender=Flight)
+def record_save(sender, instance, created, **kwargs):
+    changes.record(
+        instance, Change.Action.INSERT if created else Change.Action.UPDATE
+    )
+
+
+@receiver(post_delete, sender=Airport)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_delete, sender=Route)
+@receiver(post_delete, sender=Flight)
+def record_delete(sender, instance, **kwargs):
+    changes.record(instance, Change.Action.DELETE)
+
+
+@receiver(flights_rescheduled)
+def record_rescheduled(sender, flight_ids, **kwargs):
+    changes.record_flights(flight_ids, Change.Action.UPDATE)
+
+
+@receiver(flights_archived)
+def record_archived(sender, flight_ids, **kwargs):
+    changes.record_flights(flight_ids, Change.Action.DELETE)
+
+
+@receiver(post_save, sender=Ticket)
+def record_ticket_sold(sender, instance, created, **kwargs):
+    if created:
+        changes.record_seats(instance.flight_id)
+
+
+@receiver(tickets_assigned)
+def record_tickets_assigned(sender, flight_id, **kwargs):
+    changes.record_seats(flight_id)
+
+
+@receiver(tickets_archived)
+def record_tickets_archived(sender, flight_ids, **kwargs):
+    for flight_id in flight_ids:
+        changes.record_seats(flight_id)
+
+
+@receiver(post_delete, sender=Ticket)
+def record_ticket_deleted(sender, instance, origin=None, **kwargs):
+    # Tickets deleted with their flights go with the flights' own changes
+    if getattr(origin, "model", type(origin)) is not Flight:
+        changes.record_seats(instance.flight_id)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Crew)
+@receiver(post_delete, sender=Crew)
+def flight_search_names_changed(sender, **kwargs):
+    transaction.on_commit(flight_search.invalidate)
+
+
+@receiver(pre_save, sender=Flight)
+def remember_previous_flight(sender, instance, **kwargs):
+    # Searches for the route and date the flight is moved away from must
+    # miss as well, and free seats follow a new airplane
+    if not instance._state.adding:
+        instance._previous = Flight.objects.filter(pk=instance.pk).values(
+            "route_id", "departure_time", "airplane_id"
+        ).first()
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def flight_search_flight_changed(sender, instance, **kwargs):
+    scopes = [(instance.route_id, instance.departure_time)]
+    previous = getattr(instance, "_previous", None)
+    if previous:
+        scopes.append((previous["route_id"], previous["departure_time"]))
+    transaction.on_commit(partial(flight_search.flights_changed, scopes))
+
+
+@receiver(flights_rescheduled)
+@receiver(flights_archived)
+@receiver(tickets_archived)
+def flight_search_flights_changed(sender, flight_ids, previous=(), **kwargs):
+    scopes = flight_search.flight_scopes(flight_ids) + list(previous)
+    transaction.on_commit(partial(flight_search.flights_changed, scopes))
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def flight_search_seats_changed(
+    sender, instance, signal, created=False, origin=None, **kwargs
+):
+    if signal is post_save and not created:
+        return
+    # Tickets deleted with their flights go with the flights' own changes
+    if getattr(origin, "model", type(origin)) is Flight:
+        return
+    if Ticket.flight.is_cached(instance):
+        scopes = [(instance.flight.route_id, instance.flight.departure_time)]
+    else:
+        scopes = flight_search.flight_scopes([instance.flight_id])
+    transaction.on_commit(partial(flight_search.flights_changed, scopes))
+
+
+@receiver(tickets_assigned)
+def flight_search_seats_assigned(sender, flight_id, **kwargs):
+    scopes = flight_search.flight_scopes([flight_id])
+    transaction.on_commit(partial(flight_search.flights_changed, scopes))
+
+
+@receiver(m2m_changed, sender=Flight.crewmates.through)
+def flight_search_crew_changed(sender, instance, action, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, Flight):
+        transaction.on_commit(
+            partial(
+                flight_search.flights_changed,
+                [(instance.route_id, instance.departure_time)],
+            )
+        )
+    else:
+        transaction.on_commit(flight_search.invalidate)
+
+
+@receiver(post_save, sender=Flight)
+def flight_seats_changed(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous", None)
+    if created or (
+        previous and previous["airplane_id"] != instance.airplane_id
+    ):
+        seating.materialize([instance.pk])
+
+
+@receiver(flights_rescheduled)
+def flights_seats_changed(sender, flight_ids, fields=(), **kwargs):
+    if "airplane" in fields:
+        seating.materialize(flight_ids)
+
+
+@receiver(pre_save, sender=Ticket)
+def seat_taken(sender, instance, **kwargs):
+    # Before the insert, so an order picking a seat waits on the free seat
+    # row like the automatic assignment does, rather than on its ticket
+    if instance._state.adding:
+        seating.take(instance.flight_id, [(instance.row, instance.seat)])
+
+
+@receiver(post_delete, sender=Ticket)
+def seat_released(sender, instance, origin=None, **kwargs):
+    if getattr(origin, "model", type(origin)) is not Flight:
+        seats = [(instance.row, instance.seat)]
+        seating.release(instance.flight_id, seats)
+        live.publish(instance.flight_id, "released", seats)
+
+
+@receiver(pre_save, sender=Airplane)
+def remember_previous_layout(sender, instance, **kwargs):
+    if not instance._state.adding:
+        instance._previous_layout = Airplane.objects.filter(
+            pk=instance.pk
+        ).values_list("rows", "seats_in_row").first()
+
+
+@receiver(post_save, sender=Airplane)
+def airplane_seats_changed(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_layout", None)
+    if previous and previous != (instance.rows, instance.seats_in_row):
+        seating.materialize(
+            instance.flights.values_list("id", flat=True)
+        )
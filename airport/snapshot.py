@@ -0,0 +1,278 @@
+"""
+Compact binary snapshot of the future schedule for edge search nodes.
+
+Layout, all numbers little-endian:
+
+- header: magic, format version, number of flights, number of strings,
+  generation time in Unix seconds and the SHA-256 of everything after
+  the header, which is also the ETag of the download
+- one fixed-width array per column of COLUMNS, flights ordered by id,
+  each starting at a multiple of 8 bytes
+- string table: `strings + 1` uint32 offsets into the UTF-8 text that
+  follows; name columns hold indexes into it
+
+Readers memory-map the file, so columns are read straight from the page
+cache without parsing the whole snapshot.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.db.models import Count, F
+from django.utils import timezone
+
+from airport.models import Flight
+
+MAGIC = b"ASCH"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIq32s")
+
+# (name, array type code), wide columns first to keep every one aligned
+COLUMNS = (
+    ("flight_id", "q"),
+    ("route_id", "q"),
+    ("source_id", "q"),
+    ("destination_id", "q"),
+    ("airplane_id", "q"),
+    ("departure_time", "q"),
+    ("arrival_time", "q"),
+    ("capacity", "I"),
+    ("seats_remaining", "I"),
+    ("source", "I"),
+    ("source_city", "I"),
+    ("destination", "I"),
+    ("destination_city", "I"),
+    ("airplane", "I"),
+)
+STRING_COLUMNS = (
+    "source", "source_city", "destination", "destination_city", "airplane"
+)
+TIME_COLUMNS = ("departure_time", "arrival_time")
+
+LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _padding(size):
+    return -size % 8
+
+
+def _to_bytes(values):
+    if not LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _future_flights():
+    return (
+        Flight.objects.filter(departure_time__gte=timezone.now())
+        .annotate(
+            capacity=F("airplane__rows") * F("airplane__seats_in_row"),
+            tickets_sold=Count("tickets"),
+        )
+        .order_by("id")
+        .values_list(
+            "id",
+            "route_id",
+            "route__source_id",
+            "route__destination_id",
+            "airplane_id",
+            "departure_time",
+            "arrival_time",
+            "capacity",
+            "tickets_sold",
+            "route__source__name",
+            "route__source__closest_big_city",
+            "route__destination__name",
+            "route__destination__closest_big_city",
+            "airplane__name",
+        )
+    )
+
+
+def build(path, chunk_size):
+    """
+    Write the snapshot of flights that have not departed yet to `path`,
+    streaming them through a server-side cursor. The file is replaced
+    atomically, so readers see either the old or the new snapshot.
+    Returns the number of flights.
+    """
+    columns = {name: array(code) for name, code in COLUMNS}
+    appenders = [columns[name].append for name, _ in COLUMNS]
+    string_ids = {}
+
+    def string_id(value):
+        return string_ids.setdefault(value, len(string_ids))
+
+    for (
+        flight_id, route_id, source_id, destination_id, airplane_id,
+        departure_time, arrival_time, capacity, tickets_sold,
+        *names,
+    ) in _future_flights().iterator(chunk_size=chunk_size):
+        values = (
+            flight_id, route_id, source_id, destination_id, airplane_id,
+            int(departure_time.timestamp()), int(arrival_time.timestamp()),
+            capacity, max(capacity - tickets_sold, 0),
+            *(string_id(name) for name in names),
+        )
+        for append, value in zip(appenders, values):
+            append(value)
+
+    offsets = array("I", [0])
+    text = bytearray()
+    for value in string_ids:
+        text += value.encode()
+        offsets.append(len(text))
+
+    body = bytearray()
+    for name, _ in COLUMNS:
+        body += _to_bytes(columns[name])
+        body += bytes(_padding(len(body)))
+    body += _to_bytes(offsets)
+    body += text
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(columns["flight_id"]),
+        len(string_ids),
+        int(timezone.now().timestamp()),
+        hashlib.sha256(body).digest(),
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as file:
+        try:
+            file.write(header)
+            file.write(body)
+        except BaseException:
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)
+    return len(columns["flight_id"])
+
+
+def read_header(file):
+    """Header of an open snapshot file as a dict"""
+    data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise SnapshotError("Truncated schedule snapshot.")
+    magic, version, _, flights, strings, generated_at, digest = (
+        HEADER.unpack(data)
+    )
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError("Unsupported schedule snapshot format.")
+    return {
+        "flights": flights,
+        "strings": strings,
+        "generated_at": generated_at,
+        "etag": f'"{digest.hex()}"',
+    }
+
+
+class ScheduleSnapshot:
+    """
+    Memory-mapped snapshot written by `build`. Column values are read
+    from the mapping without copying; only the strings and datetimes of
+    the flights actually looked up are decoded.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            header = read_header(file)
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.generated_at = datetime.fromtimestamp(
+            header["generated_at"], dt_timezone.utc
+        )
+        self.etag = header["etag"]
+        self._views = [memoryview(self._mmap)]
+
+        self.columns = {}
+        try:
+            offset = HEADER.size
+            for name, code in COLUMNS:
+                offset = self._column(name, code, offset, header["flights"])
+                offset += _padding(offset)
+            offset = self._column(
+                "_offsets", "I", offset, header["strings"] + 1
+            )
+        except SnapshotError:
+            self.close()
+            raise
+        self._text = self._views[0][offset:]
+        self._views.append(self._text)
+
+    def _column(self, name, code, offset, length):
+        size = array(code).itemsize * length
+        view = self._views[0][offset:offset + size]
+        if len(view) != size:
+            raise SnapshotError("Truncated schedule snapshot.")
+        if LITTLE_ENDIAN:
+            view = view.cast(code)
+            self._views.append(view)
+        else:
+            swapped = array(code, view.tobytes())
+            swapped.byteswap()
+            view.release()
+            view = swapped
+        self.columns[name] = view
+        return offset + size
+
+    def __len__(self):
+        return len(self.columns["flight_id"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the column views, then unmap the file"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self.columns = {}
+        self._mmap.close()
+
+    def string(self, index):
+        offsets = self.columns["_offsets"]
+        return str(self._text[offsets[index]:offsets[index + 1]], "utf-8")
+
+    def flight(self, index):
+        """Flight at position `index` as a dict"""
+        flight = {}
+        for name, _ in COLUMNS:
+            value = self.columns[name][index]
+            if name in STRING_COLUMNS:
+                value = self.string(value)
+            elif name in TIME_COLUMNS:
+                value = datetime.fromtimestamp(value, dt_timezone.utc)
+            flight[name] = value
+        return flight
+
+    def find(self, flight_id):
+        """Flight with the id, found by binary search, or None"""
+        ids = self.columns["flight_id"]
+        index = bisect_left(ids, flight_id)
+        if index < len(ids) and ids[index] == flight_id:
+            return self.flight(index)
+        return None
+
+    def __iter__(self):
+        return (self.flight(index) for index in range(len(self)))
@@ -0,0 +1,135 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from airport.models import Crew, Flight, Order, Ticket
+from airport.tests.test_airplane_api import (
+    sample_airplane,
+    sample_airplane_type,
+)
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Changelists make the same number of queries for any number of rows"""
+
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            email="admin@admin.admin", password="Test1234!"
+        )
+        self.client.force_login(self.admin_user)
+        self.airplane_type = sample_airplane_type()
+        self.crewmate = Crew.objects.create(first_name="A", last_name="B")
+        self.count = 0
+
+    def add_rows(self, number):
+        for _ in range(number):
+            self.count += 1
+            route = sample_route(
+                source=sample_source(
+                    name=f"Source {self.count}", closest_big_city="Test"
+                ),
+                destination=sample_destination(
+                    name=f"Destination {self.count}", closest_big_city="Test"
+                ),
+            )
+            airplane = sample_airplane(
+                name=f"Airplane {self.count}",
+                airplane_type=self.airplane_type,
+            )
+            flight = sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=f"2024-11-{self.count:02} 11:00:00+00:00",
+                arrival_time=f"2024-11-{self.count:02} 12:00:00+00:00",
+            )
+            flight.crewmates.add(self.crewmate)
+            order = Order.objects.create(user=self.admin_user)
+            Ticket.objects.create(row=1, seat=1, flight=flight, order=order)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, model_name):
+        url = reverse(f"admin:airport_{model_name}_changelist")
+        self.add_rows(1)
+        few = self.count_queries(url)
+        self.add_rows(4)
+        many = self.count_queries(url)
+
+        self.assertEqual(few, many)
+
+    def test_flight_changelist(self):
+        self.assert_constant_queries("flight")
+
+    def test_ticket_changelist(self):
+        self.assert_constant_queries("ticket")
+
+    def test_order_changelist(self):
+        self.assert_constant_queries("order")
+
+    def test_route_changelist(self):
+        self.assert_constant_queries("route")
+
+    def test_airplane_changelist(self):
+        self.assert_constant_queries("airplane")
+
+    def test_airport_changelist(self):
+        self.assert_constant_queries("airport")
+
+    def test_crew_changelist(self):
+        self.assert_constant_queries("crew")
+
+    def test_airplanetype_changelist(self):
+        self.assert_constant_queries("airplanetype")
+
+    def test_order_change_page_does_not_list_flights(self):
+        self.add_rows(1)
+        url = reverse(
+            "admin:airport_order_change", args=[Order.objects.get().id]
+        )
+        # Warms up the content type cache
+        self.client.get(url)
+        few = self.count_queries(url)
+        self.add_rows(4)
+
+        self.assertEqual(self.count_queries(url), few)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=0)
+    def test_unfiltered_changelist_uses_estimated_count(self):
+        self.add_rows(2)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE airport_flight")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("admin:airport_flight_changelist"))
+
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertIn("reltuples", sql)
+        self.assertNotIn('SELECT COUNT(*) AS "__count" FROM "airport_flight"', sql)
+
+    def test_remove_crew_action(self):
+        self.add_rows(2)
+
+        res = self.client.post(
+            reverse("admin:airport_flight_changelist"),
+            {
+                "action": "remove_crew",
+                "_selected_action": list(
+                    Flight.objects.values_list("id", flat=True)
+                ),
+            },
+        )
+
+        self.assertEqual(res.status_code, 302)
+        self.assertFalse(Flight.crewmates.through.objects.exists())
@@ -0,0 +1,199 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import (
+    ArchivedFlight,
+    ArchivedOrder,
+    ArchivedTicket,
+    Change,
+    Crew,
+    Flight,
+    Order,
+    Ticket,
+)
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from analytics.models import FlightOccupancy, RouteDailyOccupancy
+from analytics.tests.test_occupancy import snapshot
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+class ArchiveFlightsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.route = sample_route(
+            source=sample_source(name="Source", closest_big_city="Test"),
+            destination=sample_destination(
+                name="Destination", closest_big_city="Test"
+            ),
+        )
+        self.airplane = sample_airplane(name="Test")
+        self.crewmate = Crew.objects.create(first_name="A", last_name="B")
+        self.past = self.flight("2024-01-10")
+        self.past.crewmates.add(self.crewmate)
+        self.past_return = self.flight("2024-01-20")
+        self.future = self.flight("2024-03-10")
+
+        self.past_order = self.order((self.past, 1))
+        # Holds the return flight live until its own flight departs
+        self.round_trip = self.order((self.past_return, 1), (self.future, 1))
+
+    def flight(self, day):
+        return sample_flight(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=f"{day} 10:00:00+00:00",
+            arrival_time=f"{day} 12:00:00+00:00",
+        )
+
+    def order(self, *seats):
+        order = Order.objects.create(user=self.user)
+        for flight, seat in seats:
+            Ticket.objects.create(row=1, seat=seat, flight=flight, order=order)
+        return order
+
+    def archive(self, before="2024-02-01"):
+        out = StringIO()
+        call_command(
+            "archive_flights", f"--before={before}", "--batch-size=1",
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_moves_departed_orders_and_flights(self):
+        output = self.archive()
+
+        self.assertIn("Archived 1 orders and 1 flights", output)
+        self.assertFalse(Order.objects.filter(id=self.past_order.id).exists())
+        self.assertFalse(Flight.objects.filter(id=self.past.id).exists())
+
+        archived_flight = ArchivedFlight.objects.get(id=self.past.id)
+        self.assertEqual(archived_flight.crewmates, [self.crewmate.id])
+        self.assertEqual(
+            archived_flight.departure_time.isoformat(),
+            "2024-01-10T10:00:00+00:00",
+        )
+        ticket = ArchivedTicket.objects.get()
+        self.assertEqual(ticket.order_id, self.past_order.id)
+        self.assertEqual(ticket.flight_id, self.past.id)
+        self.assertEqual(ArchivedOrder.objects.get().user, self.user)
+
+    def test_keeps_orders_with_future_flights(self):
+        self.archive()
+
+        self.assertTrue(Order.objects.filter(id=self.round_trip.id).exists())
+        self.assertTrue(Flight.objects.filter(id=self.past_return.id).exists())
+        self.assertEqual(Ticket.objects.count(), 2)
+
+        self.archive(before="2024-04-01")
+
+        self.assertFalse(Flight.objects.exists())
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(ArchivedTicket.objects.count(), 3)
+
+    def test_analytics_keep_archived_flights(self):
+        self.archive()
+
+        self.assertFalse(
+            FlightOccupancy.objects.filter(flight_id=self.past.id).exists()
+        )
+        self.assertEqual(
+            RouteDailyOccupancy.objects.get(date="2024-01-10").tickets_sold, 1
+        )
+
+    def test_analytics_rebuild_keeps_archived_flights(self):
+        # Archived while the return flight stays live for the round trip
+        self.order((self.past_return, 2))
+        self.archive()
+        expected = snapshot()
+
+        call_command("rebuild_analytics", stdout=StringIO())
+
+        self.assertEqual(snapshot(), expected)
+        self.assertEqual(
+            RouteDailyOccupancy.objects.get(date="2024-01-10").tickets_sold, 1
+        )
+        self.assertEqual(
+            FlightOccupancy.objects.get(flight=self.past_return).tickets_sold,
+            2,
+        )
+
+    def test_archived_tickets_of_live_flights_update_searches(self):
+        self.order((self.past_return, 2))
+
+        def tickets_available():
+            res = self.client.get(FLIGHT_URL)
+            return {
+                flight["id"]: flight["tickets_available"]
+                for flight in res.data["results"]
+            }[self.past_return.id]
+
+        before = tickets_available()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.archive()
+
+        self.assertEqual(tickets_available(), before + 1)
+        self.assertEqual(
+            Change.objects.filter(
+                model="seats", object_id=self.past_return.id
+            ).latest("id").data,
+            {"tickets_sold": 1},
+        )
+
+    def test_invalid_before(self):
+        with self.assertRaises(CommandError):
+            self.archive(before="last year")
+
+    def test_flights_are_read_from_archive_on_request(self):
+        self.archive()
+
+        live = self.client.get(FLIGHT_URL)
+        archived = self.client.get(FLIGHT_URL, {"archived": "true"})
+        detail = self.client.get(
+            reverse("airport:flight-detail", args=[self.past.id]),
+            {"archived": "true"},
+        )
+
+        self.assertNotIn(
+            self.past.id, [flight["id"] for flight in live.data["results"]]
+        )
+        self.assertEqual(
+            [flight["id"] for flight in archived.data["results"]],
+            [self.past.id],
+        )
+        self.assertEqual(archived.data["results"][0]["tickets_sold"], 1)
+        self.assertEqual(detail.data["airplane"], "Test")
+
+    def test_orders_are_read_from_archive_on_request(self):
+        self.archive()
+
+        live = self.client.get(ORDER_URL)
+        archived = self.client.get(ORDER_URL, {"archived": "true"})
+
+        self.assertEqual(
+            [order["id"] for order in live.data["results"]],
+            [self.round_trip.id],
+        )
+        self.assertEqual(archived.data["results"][0]["id"], self.past_order.id)
+        self.assertEqual(
+            archived.data["results"][0]["tickets"][0]["flight"], self.past.id
+        )
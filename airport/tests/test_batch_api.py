@@ -0,0 +1,149 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Order
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from airport_api.batch import BatchView
+
+BATCH_URL = reverse("batch")
+
+
+def flight_url(flight_id):
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class UnauthenticatedBatchApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.post(BATCH_URL, {"requests": []}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedBatchApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        self.airplane = sample_airplane()
+        self.flight = sample_flight(route=self.route, airplane=self.airplane)
+
+    def post_batch(self, *requests):
+        return self.client.post(
+            BATCH_URL, {"requests": list(requests)}, format="json"
+        )
+
+    def test_batch_returns_responses_in_order(self):
+        res = self.post_batch(
+            {"path": flight_url(self.flight.id)},
+            {"path": reverse("airport:order-list")},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        flight_res, order_res = res.data["responses"]
+        self.assertEqual(flight_res["status"], status.HTTP_200_OK)
+        self.assertEqual(flight_res["body"]["id"], self.flight.id)
+        self.assertEqual(order_res["body"]["count"], 0)
+
+    def test_query_string_passed_to_sub_request(self):
+        res = self.post_batch(
+            {"path": reverse("airport:flight-list") + "?routes=0"}
+        )
+
+        self.assertEqual(res.data["responses"][0]["body"]["count"], 0)
+
+    def test_duplicate_reads_executed_once(self):
+        with mock.patch.object(
+            BatchView, "execute", wraps=BatchView().execute
+        ) as execute:
+            res = self.post_batch(
+                {"path": flight_url(self.flight.id)},
+                {"path": flight_url(self.flight.id)},
+            )
+
+        self.assertEqual(execute.call_count, 1)
+        self.assertEqual(len(res.data["responses"]), 2)
+
+    def test_writes_use_batch_user(self):
+        ticket = {"row": 1, "seat": 1, "flight": self.flight.id}
+        res = self.post_batch(
+            {
+                "method": "POST",
+                "path": reverse("airport:order-list"),
+                "body": {"tickets": [ticket]},
+            }
+        )
+
+        self.assertEqual(
+            res.data["responses"][0]["status"], status.HTTP_201_CREATED
+        )
+        self.assertEqual(Order.objects.get().user, self.user)
+
+    def test_headers_given_per_sub_request(self):
+        orders = [
+            {
+                "method": "POST",
+                "path": reverse("airport:order-list"),
+                "headers": headers,
+                "body": {
+                    "tickets": [
+                        {"row": 1, "seat": seat, "flight": self.flight.id}
+                    ]
+                },
+            }
+            for seat, headers in ((1, {"Idempotency-Key": "first"}), (2, {}))
+        ]
+        res = self.client.post(
+            BATCH_URL,
+            {"requests": orders},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="batch",
+        )
+
+        self.assertEqual(
+            [response["status"] for response in res.data["responses"]],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED],
+        )
+        self.assertEqual(Order.objects.count(), 2)
+        first_id = res.data["responses"][0]["body"]["id"]
+
+        res = self.post_batch(orders[0])
+        self.assertEqual(res.data["responses"][0]["body"]["id"], first_id)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_sub_request_permissions_applied(self):
+        res = self.post_batch(
+            {"method": "DELETE", "path": flight_url(self.flight.id)}
+        )
+
+        self.assertEqual(
+            res.data["responses"][0]["status"], status.HTTP_403_FORBIDDEN
+        )
+
+    def test_paths_outside_airport_api_not_found(self):
+        res = self.post_batch(
+            {"path": reverse("user:manage")},
+            {"path": "/missing/"},
+        )
+
+        for sub_response in res.data["responses"]:
+            self.assertEqual(
+                sub_response["status"], status.HTTP_404_NOT_FOUND
+            )
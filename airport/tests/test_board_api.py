@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport import board
+from airport.models import Flight
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+
+def departures_url(airport_id):
+    return reverse("airport:airport-departures", args=[airport_id])
+
+
+def arrivals_url(airport_id):
+    return reverse("airport:airport-arrivals", args=[airport_id])
+
+
+class FlightBoardApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.kyiv = sample_source(name="Kyiv")
+        self.lviv = sample_destination(name="Lviv")
+        self.outbound = sample_route(source=self.kyiv, destination=self.lviv)
+        self.inbound = sample_route(source=self.lviv, destination=self.kyiv)
+        self.airplane = sample_airplane()
+        self.now = timezone.now().replace(microsecond=0)
+        self.flights = [
+            self.flight(self.outbound, hours)
+            for hours in (-2, -0.25, 1, 3, 30)
+        ]
+        self.returning = self.flight(self.inbound, 1.5)
+        board.invalidate()
+
+    def flight(self, route, hours):
+        departure_time = self.now + timedelta(hours=hours)
+        return sample_flight(
+            route=route,
+            airplane=self.airplane,
+            departure_time=departure_time,
+            arrival_time=departure_time + timedelta(hours=1),
+        )
+
+    def get_board(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [flight["id"] for flight in res.data]
+
+    def test_departures_include_recent_and_later_flights(self):
+        self.assertEqual(
+            self.get_board(departures_url(self.kyiv.id)),
+            [flight.id for flight in self.flights[1:]],
+        )
+
+    def test_arrivals(self):
+        self.assertEqual(
+            self.get_board(arrivals_url(self.kyiv.id)), [self.returning.id]
+        )
+        self.assertEqual(
+            self.get_board(arrivals_url(self.lviv.id)),
+            [flight.id for flight in self.flights[1:]],
+        )
+
+    def test_limit(self):
+        self.assertEqual(
+            self.get_board(departures_url(self.kyiv.id), limit=2),
+            [self.flights[1].id, self.flights[2].id],
+        )
+
+    def test_invalid_limit(self):
+        for limit in (0, -1, 101, "ten"):
+            for fallback in (False, True):
+                with override_settings(FLIGHT_BOARD_IN_MEMORY=not fallback):
+                    res = self.client.get(
+                        departures_url(self.kyiv.id), {"limit": limit}
+                    )
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("limit", res.data)
+
+    def test_matches_database_fallback(self):
+        for url in (departures_url(self.kyiv.id), arrivals_url(self.lviv.id)):
+            in_memory = self.client.get(url).data
+            with override_settings(FLIGHT_BOARD_IN_MEMORY=False):
+                self.assertEqual(self.client.get(url).data, in_memory)
+
+    def test_full_board_served_from_memory(self):
+        self.get_board(departures_url(self.kyiv.id))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_board(departures_url(self.kyiv.id), limit=3)
+
+        self.assertFalse(
+            any(
+                '"airport_flight"' in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_follows_flight_changes(self):
+        self.get_board(departures_url(self.kyiv.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flights[2].delete()
+            Flight.objects.filter(pk=self.flights[3].pk).update(
+                departure_time=self.now + timedelta(minutes=30)
+            )
+            board.flights_changed([self.flights[3].pk])
+            added = self.flight(self.outbound, 2)
+
+        self.assertEqual(
+            self.get_board(departures_url(self.kyiv.id)),
+            [self.flights[1].id, self.flights[3].id, added.id,
+             self.flights[4].id],
+        )
+
+    def test_rebuilt_on_airport_rename(self):
+        self.get_board(departures_url(self.kyiv.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lviv.name = "Lviv Danylo Halytskyi"
+            self.lviv.save()
+
+        res = self.client.get(departures_url(self.kyiv.id))
+        self.assertEqual(res.data[0]["destination"], "Lviv Danylo Halytskyi")
+
+    def test_unknown_airport(self):
+        res = self.client.get(departures_url(self.lviv.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,190 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport import changes
+from airport.disruption import shift_flights
+from airport.models import Change, Flight, Order, Ticket
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+CHANGES_URL = reverse("airport:changes")
+
+
+class ChangeFeedApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.source = sample_source()
+        self.destination = sample_destination()
+        self.route = sample_route(
+            source=self.source, destination=self.destination
+        )
+        self.airplane = sample_airplane(rows=2, seats_in_row=2)
+        self.flight = sample_flight(route=self.route, airplane=self.airplane)
+
+    def feed(self, since=0, **params):
+        res = self.client.get(CHANGES_URL, {"since": since, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def summary(self, since=0):
+        return [
+            (change["model"], change["action"], change["object_id"])
+            for change in self.feed(since)["changes"]
+        ]
+
+    def test_records_writes_in_order(self):
+        self.assertEqual(
+            self.summary(),
+            [
+                ("airport", "insert", self.source.id),
+                ("airport", "insert", self.destination.id),
+                ("route", "insert", self.route.id),
+                ("airplane", "insert", self.airplane.id),
+                ("flight", "insert", self.flight.id),
+            ],
+        )
+        flight = self.feed()["changes"][-1]
+        self.assertEqual(flight["sequence"], 5)
+        self.assertEqual(
+            flight["data"]["departure_time"], "2024-11-11T11:00:00Z"
+        )
+
+    def test_only_changes_after_since(self):
+        since = self.feed()["next"]
+        self.route.distance = 80
+        self.route.save()
+        self.flight.delete()
+
+        data = self.feed(since)
+
+        self.assertEqual(
+            [(c["model"], c["action"]) for c in data["changes"]],
+            [("route", "update"), ("flight", "delete")],
+        )
+        self.assertEqual(data["changes"][0]["data"]["distance"], 80)
+        self.assertIsNone(data["changes"][1]["data"])
+        self.assertEqual(self.feed(data["next"])["changes"], [])
+
+    def test_keyset_pages(self):
+        first = self.feed(limit=3)
+        second = self.feed(first["next"], limit=3)
+
+        self.assertTrue(first["more"])
+        self.assertFalse(second["more"])
+        self.assertEqual(
+            [c["sequence"] for c in first["changes"] + second["changes"]],
+            [1, 2, 3, 4, 5],
+        )
+        self.assertEqual(second["next"], 5)
+
+    def test_seat_counts(self):
+        since = self.feed()["next"]
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=order
+        )
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=order)
+        ticket.delete()
+
+        self.assertEqual(
+            [
+                (c["model"], c["object_id"], c["data"]["tickets_sold"])
+                for c in self.feed(since)["changes"]
+            ],
+            [("seats", self.flight.id, count) for count in (1, 2, 1)],
+        )
+
+    def test_deleted_flight_tickets_not_recorded_one_by_one(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=order)
+        since = self.feed()["next"]
+
+        Flight.objects.filter(pk=self.flight.pk).delete()
+
+        self.assertEqual(
+            self.summary(since), [("flight", "delete", self.flight.id)]
+        )
+
+    def test_records_set_based_reschedules(self):
+        since = self.feed()["next"]
+
+        shift_flights(Flight.objects.all(), timedelta(hours=2), Exception)
+
+        changed = self.feed(since)["changes"]
+        self.assertEqual(len(changed), 1)
+        self.assertEqual(
+            changed[0]["data"]["departure_time"], "2024-11-11T13:00:00Z"
+        )
+
+    def test_sequence_continues_in_id_order(self):
+        self.feed()
+        unsequenced = [
+            Change.objects.create(
+                model="airport", object_id=self.source.id, action="update"
+            )
+            for _ in range(3)
+        ]
+
+        self.assertEqual(changes.assign_sequence(2), 2)
+        self.assertEqual(changes.assign_sequence(2), 1)
+        self.assertEqual(
+            [
+                Change.objects.get(pk=change.pk).sequence
+                for change in unsequenced
+            ],
+            [6, 7, 8],
+        )
+
+    def test_pruned_changes(self):
+        self.feed()
+        Change.objects.update(created_at=timezone.now() - timedelta(days=60))
+
+        self.assertEqual(changes.prune(timezone.now() - timedelta(days=1)), 4)
+
+        res = self.client.get(CHANGES_URL, {"since": 0})
+        self.assertEqual(res.status_code, status.HTTP_410_GONE)
+        self.assertEqual(res.data["latest"], 5)
+        self.assertEqual(
+            self.summary(4), [("flight", "insert", self.flight.id)]
+        )
+
+    def test_resync_after_pruning(self):
+        self.feed()
+        Change.objects.update(created_at=timezone.now() - timedelta(days=60))
+        changes.prune(timezone.now() - timedelta(days=1))
+
+        latest = self.client.get(CHANGES_URL, {"since": 0}).data["latest"]
+        # Written while the client downloads everything again
+        with self.captureOnCommitCallbacks(execute=True):
+            self.airplane.name = "Renamed"
+            self.airplane.save()
+
+        data = self.feed(latest)
+        self.assertEqual(
+            [
+                (change["model"], change["object_id"])
+                for change in data["changes"]
+            ],
+            [("airplane", self.airplane.id)],
+        )
+        self.assertEqual(data["next"], latest + 1)
+
+    def test_since_required(self):
+        res = self.client.get(CHANGES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
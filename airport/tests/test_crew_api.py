@@ -0,0 +1,148 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Crew, Flight
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+AVAILABLE_URL = reverse("airport:crew-available")
+FLIGHT_URL = reverse("airport:flight-list")
+IMPORT_URL = reverse("airport:flight-import-schedule")
+
+
+def roster_url(crew_id):
+    return reverse("airport:crew-roster", args=[crew_id])
+
+
+class CrewScheduleApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!", is_staff=False
+        )
+        self.client.force_authenticate(self.user)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        cls.airplane = sample_airplane()
+        cls.crewmate_1 = Crew.objects.create(first_name="Busy", last_name="A")
+        cls.crewmate_2 = Crew.objects.create(first_name="Free", last_name="B")
+        cls.flight_1 = sample_flight(
+            route=cls.route, airplane=cls.airplane,
+            departure_time="2024-12-12 12:00:00",
+            arrival_time="2024-12-12 14:00:00"
+        )
+        cls.flight_2 = sample_flight(
+            route=cls.route, airplane=cls.airplane,
+            departure_time="2024-12-14 12:00:00",
+            arrival_time="2024-12-14 14:00:00"
+        )
+        cls.flight_1.crewmates.add(cls.crewmate_1)
+        cls.flight_2.crewmates.add(cls.crewmate_1)
+
+    def test_roster_in_time_window(self):
+        res = self.client.get(
+            roster_url(self.crewmate_1.id),
+            {"from": "2024-12-12T13:00", "to": "2024-12-13"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [flight["id"] for flight in res.data["results"]],
+            [self.flight_1.id]
+        )
+
+    def test_roster_requires_time_window(self):
+        res = self.client.get(roster_url(self.crewmate_1.id))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("from", res.data)
+
+    def test_available_crew(self):
+        res = self.client.get(
+            AVAILABLE_URL, {"from": "2024-12-14T13:00", "to": "2024-12-15"}
+        )
+        all_free_res = self.client.get(
+            AVAILABLE_URL, {"from": "2024-12-15", "to": "2024-12-16"}
+        )
+
+        self.assertEqual(
+            [crew["id"] for crew in res.data["results"]],
+            [self.crewmate_2.id]
+        )
+        self.assertEqual(all_free_res.data["count"], 2)
+
+
+class CrewAssignmentApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.admin", password="Test1234!", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        self.airplane_1 = sample_airplane(name="Test_1")
+        self.airplane_2 = sample_airplane(name="Test_2")
+        self.crewmate = Crew.objects.create(first_name="Test", last_name="A")
+        flight = sample_flight(
+            route=self.route, airplane=self.airplane_1,
+            departure_time="2024-12-12 12:00:00",
+            arrival_time="2024-12-12 14:00:00"
+        )
+        flight.crewmates.add(self.crewmate)
+
+    def flight_payload(self, departure_time, arrival_time):
+        return {
+            "route": self.route.id,
+            "airplane": self.airplane_2.id,
+            "crewmates": [self.crewmate.id],
+            "departure_time": departure_time,
+            "arrival_time": arrival_time,
+        }
+
+    def test_assign_crew_without_rest(self):
+        res = self.client.post(
+            FLIGHT_URL,
+            self.flight_payload("2024-12-12 18:00:00", "2024-12-12 19:00:00")
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("crewmates", res.data)
+
+    def test_assign_crew_after_rest(self):
+        res = self.client.post(
+            FLIGHT_URL,
+            self.flight_payload("2024-12-13 00:00:00", "2024-12-13 01:00:00")
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_import_schedule_with_crew_conflicts(self):
+        payload = [
+            self.flight_payload("2024-12-20 10:00:00", "2024-12-20 12:00:00"),
+            self.flight_payload("2024-12-20 15:00:00", "2024-12-20 16:00:00"),
+            self.flight_payload("2024-12-12 02:00:00", "2024-12-12 03:00:00"),
+        ]
+        payload[1]["airplane"] = self.airplane_1.id
+
+        res = self.client.post(IMPORT_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            ["crewmates" in errors for errors in res.data],
+            [False, True, True]
+        )
+        self.assertEqual(Flight.objects.count(), 1)
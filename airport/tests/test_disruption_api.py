@@ -0,0 +1,299 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Crew, Flight, Order, Ticket
+from airport.tests.test_airplane_api import (
+    sample_airplane,
+    sample_airplane_type,
+)
+from airport.tests.test_flight_api import (
+    sample_flight,
+    skip_without_overlap_constraint,
+)
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from analytics.models import FlightOccupancy
+
+SHIFT_URL = reverse("airport:flight-shift")
+SWAP_URL = reverse("airport:flight-swap-airplane")
+
+
+def at(hour, day=11):
+    return datetime(2024, 11, day, hour, tzinfo=timezone.utc)
+
+
+class DisruptionApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@admin.admin", password="Test1234!", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        airplane_type = sample_airplane_type()
+        self.airplane = sample_airplane(
+            name="Main", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.spare = sample_airplane(
+            name="Spare", rows=2, seats_in_row=4, airplane_type=airplane_type
+        )
+        # Hourly rotation: each flight departs when the previous arrives
+        self.flights = [
+            sample_flight(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=at(hour),
+                arrival_time=at(hour + 1),
+            )
+            for hour in (8, 9, 10, 11)
+        ]
+
+    def departures(self):
+        return list(
+            Flight.objects.filter(airplane=self.airplane)
+            .order_by("departure_time")
+            .values_list("departure_time", flat=True)
+        )
+
+    def test_shift_moves_chain_into_each_others_slots(self):
+        res = self.client.post(
+            SHIFT_URL,
+            {
+                "airplane": self.airplane.id,
+                "after": "2024-11-11T09:00:00Z",
+                "delta": "01:00:00",
+            },
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["flights"], [flight.id for flight in self.flights[1:]]
+        )
+        self.assertEqual(
+            self.departures(), [at(8), at(10), at(11), at(12)]
+        )
+
+    def test_shift_is_a_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(
+                SHIFT_URL,
+                {
+                    "route": self.route.id,
+                    "after": "2024-11-11T09:00:00Z",
+                    "delta": "00:30:00",
+                },
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sum(
+                query["sql"].startswith('UPDATE "airport_flight"')
+                for query in queries.captured_queries
+            ),
+            1,
+        )
+
+    def test_shift_into_stored_flight_is_rejected(self):
+        sample_flight(
+            route=sample_route(
+                source=sample_source(name="Lviv"),
+                destination=sample_destination(name="Odesa"),
+            ),
+            airplane=self.airplane,
+            departure_time=at(14),
+            arrival_time=at(15),
+        )
+
+        res = self.client.post(
+            SHIFT_URL,
+            {
+                "route": self.route.id,
+                "after": "2024-11-11T11:00:00Z",
+                "delta": "02:30:00",
+            },
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(self.flights[3].id, res.data["flights"])
+        self.assertEqual(
+            self.departures(), [at(8), at(9), at(10), at(11), at(14)]
+        )
+
+    def test_shift_racing_another_writer_is_rejected(self):
+        skip_without_overlap_constraint(self)
+        sample_flight(
+            route=sample_route(
+                source=sample_source(name="Lviv"),
+                destination=sample_destination(name="Odesa"),
+            ),
+            airplane=self.airplane,
+            departure_time=at(14),
+            arrival_time=at(15),
+        )
+
+        # As if the flight was stored after the check
+        with mock.patch(
+            "airport.disruption.airplane_conflicts", return_value=[]
+        ):
+            res = self.client.post(
+                SHIFT_URL,
+                {
+                    "route": self.route.id,
+                    "after": "2024-11-11T11:00:00Z",
+                    "delta": "02:30:00",
+                },
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("flights", res.data)
+        self.assertEqual(
+            self.departures(), [at(8), at(9), at(10), at(11), at(14)]
+        )
+
+    def test_shift_checks_crew_rest(self):
+        crew = Crew.objects.create(first_name="Anna", last_name="Pilot")
+        self.flights[3].crewmates.add(crew)
+        other = sample_flight(
+            route=self.route,
+            airplane=self.spare,
+            departure_time=at(20),
+            arrival_time=at(21),
+        )
+        other.crewmates.add(crew)
+
+        res = self.client.post(
+            SHIFT_URL,
+            {
+                "airplane": self.airplane.id,
+                "after": "2024-11-11T11:00:00Z",
+                "delta": "07:00:00",
+            },
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_shift_requires_airplane_or_route(self):
+        res = self.client.post(
+            SHIFT_URL,
+            {"after": "2024-11-11T09:00:00Z", "delta": "01:00:00"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_shift_updates_occupancy(self):
+        self.client.post(
+            SHIFT_URL,
+            {
+                "airplane": self.airplane.id,
+                "after": "2024-11-11T11:00:00Z",
+                "delta": "1 00:00:00",
+            },
+        )
+
+        self.assertEqual(
+            FlightOccupancy.objects.get(
+                flight=self.flights[3]
+            ).departure_date.day,
+            12,
+        )
+
+    def test_swap_airplane(self):
+        flights = [self.flights[0].id, self.flights[2].id]
+
+        res = self.client.post(
+            SWAP_URL,
+            {"flights": flights, "airplane": self.spare.id},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(
+                Flight.objects.filter(airplane=self.spare)
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+            flights,
+        )
+        self.assertEqual(
+            FlightOccupancy.objects.get(flight=self.flights[0]).capacity, 8
+        )
+
+    def test_swap_rejects_tickets_outside_new_layout(self):
+        order = Order.objects.create(user=self.admin)
+        Ticket.objects.create(
+            row=5, seat=1, flight=self.flights[0], order=order
+        )
+
+        res = self.client.post(
+            SWAP_URL,
+            {"flights": [self.flights[0].id], "airplane": self.spare.id},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            Flight.objects.get(id=self.flights[0].id).airplane, self.airplane
+        )
+
+    def test_swap_rejects_overlapping_flights(self):
+        res = self.client.post(
+            SWAP_URL,
+            {
+                "flights": [self.flights[0].id],
+                "airplane": self.spare.id,
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        sample_flight(
+            route=self.route,
+            airplane=self.spare,
+            departure_time=at(9) + timedelta(minutes=30),
+            arrival_time=at(10) + timedelta(minutes=30),
+        )
+        res = self.client.post(
+            SWAP_URL,
+            {"flights": [self.flights[1].id], "airplane": self.spare.id},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_swap_unknown_flights(self):
+        res = self.client.post(
+            SWAP_URL,
+            {"flights": [self.flights[3].id + 1], "airplane": self.spare.id},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_only(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.test", password="Test1234!"
+            )
+        )
+
+        res = self.client.post(
+            SWAP_URL,
+            {"flights": [self.flights[0].id], "airplane": self.spare.id},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
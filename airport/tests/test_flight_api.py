@@ -1,4 +1,9 @@
+from types import SimpleNamespace
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, connection
 from django.test import TestCase
 from rest_framework.reverse import reverse
 from rest_framework import status
@@ -8,9 +13,11 @@ from rest_framework.test import APIClient
 from .test_airplane_api import sample_airplane
 from .test_route_api import sample_route, sample_destination, sample_source
 from ..models import Flight, Crew
+from ..schedule import AIRPLANE_OVERLAP_CONSTRAINT, airplane_overlap_as
 from ..serializers import FlightListSerializer, FlightDetailSerializer
 
 FLIGHT_URL = reverse("airport:flight-list")
+IMPORT_URL = reverse("airport:flight-import-schedule")
 
 
 def detail_url(flight_id):
@@ -26,6 +33,25 @@ def sample_flight(**params):
     return Flight.objects.create(**defaults)
 
 
+def skip_without_overlap_constraint(test):
+    """Migration 0002 adds the constraint only where btree_gist exists"""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_constraint WHERE conname = %s",
+                [AIRPLANE_OVERLAP_CONSTRAINT],
+            )
+            if cursor.fetchone():
+                return
+    test.skipTest("No airplane overlap constraint without btree_gist")
+
+
+def constraint_violation(name):
+    cause = Exception()
+    cause.diag = SimpleNamespace(constraint_name=name)
+    raise IntegrityError("violation") from cause
+
+
 class UnauthenticatedFlightApiTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -37,6 +63,7 @@ class UnauthenticatedFlightApiTests(TestCase):
 
 class AuthenticatedFlightApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.test", password="Test1234!", is_staff=False
@@ -164,3 +191,147 @@ class AdminFlightApiTests(TestCase):
         url = detail_url(flight.id)
         res = self.client.delete(url)
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_create_flight_with_overlapping_airplane(self):
+        sample_flight(
+            route=self.route_1, airplane=self.airplane_1,
+            departure_time="2024-12-12 12:00:00", arrival_time="2024-12-12 14:00:00"
+        )
+        payload = {
+            "route": self.route_1.id,
+            "airplane": self.airplane_1.id,
+            "departure_time": "2024-12-12 13:00:00",
+            "arrival_time": "2024-12-12 15:00:00"
+        }
+        res = self.client.post(FLIGHT_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("airplane", res.data)
+
+    def test_create_flight_racing_another_writer(self):
+        skip_without_overlap_constraint(self)
+        sample_flight(
+            route=self.route_1, airplane=self.airplane_1,
+            departure_time="2024-12-12 12:00:00",
+            arrival_time="2024-12-12 14:00:00",
+        )
+        payload = {
+            "route": self.route_1.id,
+            "airplane": self.airplane_1.id,
+            "departure_time": "2024-12-12 13:00:00",
+            "arrival_time": "2024-12-12 15:00:00"
+        }
+        # As if the stored flight was saved after the check
+        with mock.patch.object(Flight, "validate_airplane_schedule"):
+            res = self.client.post(FLIGHT_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("airplane", res.data)
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_airplane_overlap_violation_becomes_validation_error(self):
+        with self.assertRaises(ValidationError) as raised:
+            with airplane_overlap_as(ValidationError):
+                constraint_violation(AIRPLANE_OVERLAP_CONSTRAINT)
+        self.assertIn("airplane", raised.exception.detail)
+
+        with self.assertRaises(IntegrityError):
+            with airplane_overlap_as(ValidationError):
+                constraint_violation("flight_route_airplane_departure_uniq")
+
+    def test_create_flight_right_after_previous(self):
+        sample_flight(
+            route=self.route_1, airplane=self.airplane_1,
+            departure_time="2024-12-12 12:00:00", arrival_time="2024-12-12 14:00:00"
+        )
+        payload = {
+            "route": self.route_1.id,
+            "airplane": self.airplane_1.id,
+            "departure_time": "2024-12-12 14:00:00",
+            "arrival_time": "2024-12-12 15:00:00"
+        }
+        res = self.client.post(FLIGHT_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_update_flight_does_not_conflict_with_itself(self):
+        flight = sample_flight(route=self.route_1, airplane=self.airplane_1)
+        res = self.client.patch(
+            detail_url(flight.id), {"arrival_time": "2024-11-11 12:30:00"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_import_schedule(self):
+        payload = [
+            {
+                "route": self.route_1.id,
+                "airplane": self.airplane_1.id,
+                "departure_time": f"2024-12-{day} 12:00:00",
+                "arrival_time": f"2024-12-{day} 13:00:00"
+            }
+            for day in range(10, 15)
+        ]
+        res = self.client.post(IMPORT_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Flight.objects.count(), 5)
+
+    def test_import_schedule_with_overlaps(self):
+        sample_flight(route=self.route_1, airplane=self.airplane_1)
+        payload = [
+            {
+                "route": self.route_1.id,
+                "airplane": self.airplane_1.id,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time
+            }
+            for departure_time, arrival_time in [
+                ("2024-12-12 12:00:00", "2024-12-12 14:00:00"),
+                ("2024-12-12 13:00:00", "2024-12-12 15:00:00"),
+                ("2024-11-11 11:30:00", "2024-11-11 12:30:00"),
+                ("2024-12-13 12:00:00", "2024-12-13 14:00:00"),
+            ]
+        ]
+        res = self.client.post(IMPORT_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            ["airplane" in errors for errors in res.data],
+            [False, True, True, False]
+        )
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_import_schedule_overlapping_later_stored_flight(self):
+        sample_flight(route=self.route_1, airplane=self.airplane_1)
+        payload = [
+            {
+                "route": self.route_1.id,
+                "airplane": self.airplane_1.id,
+                "departure_time": "2024-11-11 10:30:00",
+                "arrival_time": "2024-11-11 11:30:00",
+            }
+        ]
+        res = self.client.post(IMPORT_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("airplane", res.data[0])
+
+    def test_import_schedule_racing_another_writer(self):
+        skip_without_overlap_constraint(self)
+        sample_flight(route=self.route_1, airplane=self.airplane_1)
+        payload = [
+            {
+                "route": self.route_1.id,
+                "airplane": self.airplane_1.id,
+                "departure_time": "2024-11-12 10:00:00",
+                "arrival_time": "2024-11-12 11:00:00",
+            },
+            {
+                "route": self.route_1.id,
+                "airplane": self.airplane_1.id,
+                "departure_time": "2024-11-11 10:30:00",
+                "arrival_time": "2024-11-11 11:30:00",
+            },
+        ]
+        with mock.patch(
+            "airport.serializers.airplane_conflicts", return_value=[]
+        ):
+            res = self.client.post(IMPORT_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("airplane", res.data[1])
+        self.assertEqual(Flight.objects.count(), 1)
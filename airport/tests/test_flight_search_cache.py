@@ -0,0 +1,220 @@
+import json
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport import flight_search
+from airport.disruption import shift_flights
+from airport.models import Crew, Flight, Order, Ticket
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class FlightSearchCacheApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.kyiv = sample_source()
+        self.lviv = sample_destination()
+        self.outbound = sample_route(source=self.kyiv, destination=self.lviv)
+        self.inbound = sample_route(source=self.lviv, destination=self.kyiv)
+        self.airplane = sample_airplane(rows=2, seats_in_row=2)
+        self.flight = sample_flight(
+            route=self.outbound, airplane=self.airplane
+        )
+
+    def search(self, **params):
+        res = self.client.get(FLIGHT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return json.loads(res.content)
+
+    def assert_cached(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.search(**params)
+        self.assertFalse(
+            any(
+                '"airport_flight"' in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+        return data
+
+    def test_equivalent_searches_share_the_response(self):
+        routes = f"{self.outbound.id},{self.inbound.id}"
+        data = self.search(routes=routes)
+
+        self.assertEqual(
+            self.assert_cached(routes=f"{self.inbound.id},{self.outbound.id}"),
+            data,
+        )
+        self.assertEqual(data["results"][0]["tickets_available"], 4)
+
+    def test_ticket_sold(self):
+        self.search(routes=self.outbound.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=1,
+                seat=1,
+                flight=self.flight,
+                order=Order.objects.create(user=self.user),
+            )
+
+        self.assertEqual(
+            self.search(routes=self.outbound.id)["results"][0][
+                "tickets_available"
+            ],
+            3,
+        )
+
+    def test_flight_moved_to_another_route(self):
+        self.search(routes=self.outbound.id)
+        self.search(routes=self.inbound.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.route = self.inbound
+            self.flight.save()
+
+        self.assertEqual(self.search(routes=self.outbound.id)["count"], 0)
+        self.assertEqual(self.search(routes=self.inbound.id)["count"], 1)
+
+    def test_flight_rescheduled_to_another_date(self):
+        self.search(**{"departure-date": "2024-11-11"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            shift_flights(Flight.objects.all(), timedelta(days=1), Exception)
+
+        self.assertEqual(
+            self.search(**{"departure-date": "2024-11-11"})["count"], 0
+        )
+        self.assertEqual(
+            self.search(**{"departure-date": "2024-11-12"})["count"], 1
+        )
+
+    def test_other_routes_stay_cached(self):
+        self.search(routes=self.inbound.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_flight(
+                route=self.outbound,
+                airplane=self.airplane,
+                departure_time="2024-11-12 11:00:00",
+                arrival_time="2024-11-12 12:00:00",
+            )
+
+        self.assert_cached(routes=self.inbound.id)
+        self.assertEqual(self.search()["count"], 2)
+
+    def test_airport_renamed(self):
+        self.search()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lviv.name = "Lviv"
+            self.lviv.save()
+
+        self.assertIn("Lviv", self.search()["results"][0]["route"])
+
+    def test_crew_removed_in_admin(self):
+        self.flight.crewmates.add(
+            Crew.objects.create(first_name="A", last_name="B")
+        )
+        self.search()
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@admin.admin", password="Test1234!"
+        )
+        self.client.force_login(admin_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("admin:airport_flight_changelist"),
+                {"action": "remove_crew", "_selected_action": [self.flight.id]},
+            )
+
+        self.assertEqual(self.search()["results"][0]["crewmates"], [])
+
+    def test_cached_response_in_batch(self):
+        self.search(routes=self.outbound.id)
+
+        path = f"{FLIGHT_URL}?routes={self.outbound.id}"
+        res = self.client.post(
+            reverse("batch"), {"requests": [{"path": path}]}, format="json"
+        )
+
+        self.assertEqual(res.data["responses"][0]["body"]["count"], 1)
+
+    def test_archived_not_cached(self):
+        self.search(archived="true")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.search(archived="true")
+
+        self.assertTrue(queries.captured_queries)
+
+
+@override_settings(
+    FLIGHT_SEARCH_WAIT_TIMEOUT=2, FLIGHT_SEARCH_POLL_INTERVAL=0.01
+)
+class CoalescingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_burst_of_misses_computes_once(self):
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"count": 1}
+
+        def search():
+            data, content = flight_search.fetch("flight-search:test", compute)
+            results.append(data if data is not None else json.loads(content))
+
+        threads = [threading.Thread(target=search) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"count": 1}] * 10)
+
+    @override_settings(FLIGHT_SEARCH_WAIT_TIMEOUT=0.05)
+    def test_computes_itself_when_first_request_is_stuck(self):
+        cache.add("flight-search:test:lock", True)
+
+        data, _ = flight_search.fetch("flight-search:test", lambda: [1])
+
+        self.assertEqual(data, [1])
+
+    def test_failures_are_not_cached(self):
+        def fail():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            flight_search.fetch("flight-search:test", fail)
+
+        self.assertEqual(
+            flight_search.fetch("flight-search:test", lambda: [2]), ([2], None)
+        )
@@ -0,0 +1,242 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport import geo
+from airport.models import Airport, Route
+from airport.serializers import RouteSerializer
+
+NEARBY_URL = reverse("airport:airport-nearby")
+ROUTE_IMPORT_URL = reverse("airport:route-import-routes")
+ROUTE_URL = reverse("airport:route-list")
+
+
+class GreatCircleTests(SimpleTestCase):
+    def test_known_distances(self):
+        # Kyiv Boryspil - London Heathrow, and a quarter of the equator
+        self.assertEqual(
+            [
+                round(distance)
+                for distance in geo.great_circle_km(
+                    [50.345, 0.0], [30.895, 0.0], [51.470, 0.0], [-0.454, 90.0]
+                )
+            ],
+            [2185, 10008],
+        )
+
+    def test_kd_tree_matches_brute_force(self):
+        generator = random.Random(44)
+        airports = [
+            (
+                airport_id,
+                f"Airport {airport_id}",
+                "City",
+                generator.uniform(-90, 90),
+                generator.uniform(-180, 180),
+            )
+            for airport_id in range(500)
+        ]
+        tree = geo.AirportKDTree(airports)
+
+        for _ in range(20):
+            latitude = generator.uniform(-90, 90)
+            longitude = generator.uniform(-180, 180)
+            distances = sorted(
+                (distance, airport[0])
+                for distance, airport in zip(
+                    geo.great_circle_km(
+                        [latitude] * len(airports),
+                        [longitude] * len(airports),
+                        [airport[3] for airport in airports],
+                        [airport[4] for airport in airports],
+                    ),
+                    airports,
+                )
+            )
+
+            self.assertEqual(
+                [airport["id"] for airport in tree.search(
+                    latitude, longitude, 5
+                )],
+                [airport_id for _, airport_id in distances[:5]],
+            )
+            self.assertEqual(
+                [airport["id"] for airport in tree.search(
+                    latitude, longitude, 500, radius_km=2000
+                )],
+                [
+                    airport_id for distance, airport_id in distances
+                    if distance <= 2000
+                ],
+            )
+
+
+class NearbyAirportApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.boryspil = Airport.objects.create(
+            name="Boryspil",
+            closest_big_city="Kyiv",
+            latitude=50.345,
+            longitude=30.895,
+        )
+        self.zhuliany = Airport.objects.create(
+            name="Zhuliany",
+            closest_big_city="Kyiv",
+            latitude=50.402,
+            longitude=30.452,
+        )
+        self.lviv = Airport.objects.create(
+            name="Lviv",
+            closest_big_city="Lviv",
+            latitude=49.813,
+            longitude=23.956,
+        )
+        Airport.objects.create(name="Unknown", closest_big_city="Nowhere")
+        geo.invalidate()
+
+    def nearby(self, **params):
+        res = self.client.get(NEARBY_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [(airport["name"], airport["distance"]) for airport in res.data]
+
+    def test_nearest_first(self):
+        self.assertEqual(
+            [name for name, _ in self.nearby(lat=50.45, lon=30.52)],
+            ["Zhuliany", "Boryspil", "Lviv"],
+        )
+
+    def test_radius_and_limit(self):
+        found = self.nearby(lat=50.45, lon=30.52, radius=100)
+        self.assertEqual([name for name, _ in found], ["Zhuliany", "Boryspil"])
+        self.assertLess(found[1][1], 100)
+
+        self.assertEqual(
+            self.nearby(lat=50.45, lon=30.52, limit=1)[0][0], "Zhuliany"
+        )
+
+    def test_tree_rebuilt_on_change(self):
+        self.nearby(lat=50.45, lon=30.52)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.zhuliany.delete()
+
+        self.assertEqual(
+            [name for name, _ in self.nearby(lat=50.45, lon=30.52)],
+            ["Boryspil", "Lviv"],
+        )
+
+    def test_invalid_coordinates(self):
+        res = self.client.get(NEARBY_URL, {"lat": 91, "lon": "east"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data), {"lat", "lon"})
+
+
+class RouteDistanceApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@admin.admin", password="Test1234!", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.kyiv = Airport.objects.create(
+            name="Boryspil",
+            closest_big_city="Kyiv",
+            latitude=50.345,
+            longitude=30.895,
+        )
+        self.london = Airport.objects.create(
+            name="Heathrow",
+            closest_big_city="London",
+            latitude=51.470,
+            longitude=-0.454,
+        )
+        self.unknown = Airport.objects.create(
+            name="Unknown", closest_big_city="Nowhere"
+        )
+
+    def test_import_fills_missing_distances(self):
+        res = self.client.post(
+            ROUTE_IMPORT_URL,
+            [
+                {"source": self.kyiv.id, "destination": self.london.id},
+                {"source": self.london.id, "destination": self.kyiv.id},
+                {
+                    "source": self.kyiv.id,
+                    "destination": self.unknown.id,
+                    "distance": 500,
+                },
+            ],
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            list(Route.objects.order_by("id").values_list(
+                "distance", flat=True
+            )),
+            [2185, 2185, 500],
+        )
+
+    def test_import_without_distance_or_coordinates(self):
+        res = self.client.post(
+            ROUTE_IMPORT_URL,
+            [
+                {"source": self.kyiv.id, "destination": self.london.id},
+                {"source": self.kyiv.id, "destination": self.unknown.id},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("distance", res.data[1])
+        self.assertFalse(Route.objects.exists())
+
+    def test_create_single_route_without_distance(self):
+        res = self.client.post(
+            ROUTE_URL,
+            {"source": self.london.id, "destination": self.kyiv.id},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["distance"], 2185)
+
+    def patch(self, route, data):
+        serializer = RouteSerializer(route, data=data, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save().distance
+
+    def test_partial_update_keeps_distance(self):
+        unlocated = Route.objects.create(
+            source=self.kyiv, destination=self.unknown, distance=500
+        )
+        located = Route.objects.create(
+            source=self.kyiv, destination=self.london, distance=2200
+        )
+
+        self.assertEqual(self.patch(unlocated, {}), 500)
+        self.assertEqual(
+            self.patch(unlocated, {"source": self.london.id}), 500
+        )
+        self.assertEqual(
+            self.patch(located, {"destination": self.london.id}), 2200
+        )
+
+    def test_partial_update_to_located_airports(self):
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.unknown, distance=500
+        )
+
+        self.assertEqual(
+            self.patch(route, {"destination": self.london.id}), 2185
+        )
@@ -0,0 +1,159 @@
+import zlib
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from airport_api.idempotency import (
+    idempotency_cache_key,
+    request_fingerprint,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class IdempotentOrderCreateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+
+        route = sample_route(
+            source=sample_source(name="Source", closest_big_city="Test"),
+            destination=sample_destination(
+                name="Destination", closest_big_city="Test"
+            ),
+        )
+        self.flight = sample_flight(
+            route=route,
+            airplane=sample_airplane(name="Test"),
+            departure_time="2024-12-12 12:00:00",
+            arrival_time="2024-12-12 13:00:00",
+        )
+        self.data = {"tickets": [{"row": 2, "seat": 2, "flight": self.flight.id}]}
+
+    def post(self, key, data=None):
+        return self.client.post(
+            ORDER_URL,
+            data or self.data,
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self.post("order-1")
+        retry = self.post("order-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_replay_does_not_query_database(self):
+        self.post("order-1")
+
+        with self.assertNumQueries(0):
+            self.post("order-1")
+
+    def test_keys_are_scoped_to_user(self):
+        self.post("order-1")
+        other = get_user_model().objects.create_user(
+            email="other@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(other)
+
+        res = self.post(
+            "order-1",
+            {"tickets": [{"row": 3, "seat": 3, "flight": self.flight.id}]},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_key_reused_with_different_body(self):
+        self.post("order-1")
+
+        res = self.post(
+            "order-1",
+            {"tickets": [{"row": 3, "seat": 3, "flight": self.flight.id}]},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_releases_key(self):
+        invalid = {"tickets": [{"row": 99, "seat": 99, "flight": self.flight.id}]}
+        self.assertEqual(
+            self.post("order-1", invalid).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+        res = self.post("order-1")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_without_key_creates_every_time(self):
+        self.client.post(ORDER_URL, self.data, format="json")
+        self.data["tickets"][0]["seat"] = 3
+        self.client.post(ORDER_URL, self.data, format="json")
+
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_too_long_key(self):
+        res = self.post("k" * 256)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def claim(self, key):
+        """Marks the key as taken by a request that is still running"""
+        request = mock.Mock(
+            body=self.client._encode_data(self.data, "json")[0]
+        )
+        cache_key = idempotency_cache_key(self.user.pk, ORDER_URL, key)
+        fingerprint = request_fingerprint(request)
+        cache.set(cache_key, (fingerprint, None, None))
+        return cache_key, fingerprint
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0)
+    def test_concurrent_duplicate_times_out(self):
+        self.claim("order-1")
+
+        res = self.post("order-1")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_concurrent_duplicate_waits_for_response(self):
+        cache_key, fingerprint = self.claim("order-1")
+
+        def finish_first_request(seconds):
+            cache.set(
+                cache_key, (fingerprint, 201, zlib.compress(b'{"id": 1}'))
+            )
+
+        with mock.patch(
+            "airport_api.idempotency.time.sleep",
+            side_effect=finish_first_request,
+        ):
+            res = self.post("order-1")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.json(), {"id": 1})
+        self.assertEqual(Order.objects.count(), 0)
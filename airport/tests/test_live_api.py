@@ -0,0 +1,160 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.live import broker, format_event
+from airport.models import Order, Ticket
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from user.serializers import TokenObtainPairSerializer
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def live_url(flight_id):
+    return reverse("airport:flight-live", args=[flight_id])
+
+
+class LiveSeatsMixin:
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+
+        route = sample_route(
+            source=sample_source(name="Source", closest_big_city="Test"),
+            destination=sample_destination(
+                name="Destination", closest_big_city="Test"
+            ),
+        )
+        self.flight = sample_flight(
+            route=route,
+            airplane=sample_airplane(name="Test", rows=2, seats_in_row=4),
+        )
+
+    def tearDown(self):
+        # The listener connection would keep the test database in use
+        broker.stop()
+
+    def async_get(self, url):
+        """Request through the ASGI handler, which streams asynchronously"""
+        token = TokenObtainPairSerializer.get_token(self.user).access_token
+        return self.async_client.get(
+            url,
+            headers={
+                "Accept": "text/event-stream",
+                "Authorization": f"Bearer {token}",
+            },
+        )
+
+
+@override_settings(LIVE_SEATS_STREAM_TIMEOUT=0)
+class LiveSeatsApiTests(LiveSeatsMixin, TestCase):
+    def test_auth_required(self):
+        self.client.force_authenticate(None)
+
+        res = self.client.get(live_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_missing_flight(self):
+        res = self.client.get(live_url(self.flight.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stream_starts_with_seatmap(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=order)
+
+        res = self.client.get(
+            live_url(self.flight.id), HTTP_ACCEPT="text/event-stream"
+        )
+        body = b"".join(res.streaming_content).decode()
+
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        self.assertEqual(res["Cache-Control"], "no-cache")
+        self.assertIn("retry: ", body)
+        self.assertIn("event: seatmap\n", body)
+        self.assertIn('"bitmap": "QA=="', body)
+        self.assertNotIn(self.flight.id, broker.subscribers)
+
+    async def test_asgi_stream_starts_with_seatmap(self):
+        res = await self.async_get(live_url(self.flight.id))
+        body = b"".join(
+            [chunk async for chunk in res.streaming_content]
+        ).decode()
+
+        self.assertTrue(res.is_async)
+        self.assertIn("event: seatmap\n", body)
+        self.assertIn('"bitmap": "AA=="', body)
+        self.assertNotIn(self.flight.id, broker.subscribers)
+
+
+@override_settings(
+    LIVE_SEATS_STREAM_TIMEOUT=10, LIVE_SEATS_KEEPALIVE_INTERVAL=10
+)
+class LiveSeatsNotificationTests(LiveSeatsMixin, TransactionTestCase):
+    def test_order_pushes_taken_seats(self):
+        res = self.client.get(live_url(self.flight.id))
+        stream = iter(res.streaming_content)
+        next(stream)
+        next(stream)
+
+        self.client.post(
+            ORDER_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "flight": self.flight.id},
+                    {"row": 2, "seat": 3, "flight": self.flight.id},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            next(stream).decode(), format_event("taken", [[1, 1], [2, 3]])
+        )
+        res.close()
+        self.assertNotIn(self.flight.id, broker.subscribers)
+
+    def test_deleted_order_pushes_released_seats(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=2, seat=1, flight=self.flight, order=order)
+        res = self.client.get(live_url(self.flight.id))
+        stream = iter(res.streaming_content)
+        next(stream)
+        next(stream)
+
+        order.delete()
+
+        self.assertEqual(
+            next(stream).decode(), format_event("released", [[2, 1]])
+        )
+        res.close()
+
+    async def test_asgi_stream_pushes_taken_seats(self):
+        res = await self.async_get(live_url(self.flight.id))
+        stream = aiter(res.streaming_content)
+        await anext(stream)
+        await anext(stream)
+
+        await sync_to_async(self.client.post)(
+            ORDER_URL,
+            {"tickets": [{"row": 1, "seat": 4, "flight": self.flight.id}]},
+            format="json",
+        )
+
+        self.assertEqual(
+            (await anext(stream)).decode(), format_event("taken", [[1, 4]])
+        )
+        await stream.aclose()
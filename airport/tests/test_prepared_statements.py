@@ -0,0 +1,55 @@
+from unittest import skipIf
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+
+def prepared_statements():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT statement FROM pg_prepared_statements")
+        return [statement for (statement,) in cursor.fetchall()]
+
+
+@skipIf(
+    settings.POSTGRES_TRANSACTION_POOLING,
+    "Prepared statements are off behind a transaction-pooling proxy",
+)
+class PreparedStatementTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(
+            route=sample_route(
+                source=sample_source(), destination=sample_destination()
+            ),
+            airplane=sample_airplane(),
+        )
+
+    def test_repeated_queries_are_prepared(self):
+        url = reverse("airport:flight-detail", args=[self.flight.id])
+        for _ in range(settings.POSTGRES_PREPARE_THRESHOLD + 1):
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertTrue(
+            any(
+                '"airport_flight"."id" = $1' in statement
+                for statement in prepared_statements()
+            )
+        )
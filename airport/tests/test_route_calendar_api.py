@@ -0,0 +1,146 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.test_airplane_api import (
+    sample_airplane,
+    sample_airplane_type,
+)
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from analytics.models import RouteDailyOccupancy
+
+
+def calendar_url(route_id):
+    return reverse("airport:route-calendar", args=[route_id])
+
+
+class RouteCalendarApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        airplane_type = sample_airplane_type()
+        self.small = sample_airplane(
+            name="Small", rows=1, seats_in_row=4, airplane_type=airplane_type
+        )
+        self.large = sample_airplane(
+            name="Large", rows=2, seats_in_row=5, airplane_type=airplane_type
+        )
+        self.morning = sample_flight(route=self.route, airplane=self.large)
+        self.evening = sample_flight(
+            route=self.route,
+            airplane=self.small,
+            departure_time="2024-11-11 18:00:00",
+            arrival_time="2024-11-11 19:00:00",
+        )
+        self.next_day = sample_flight(
+            route=self.route,
+            airplane=self.small,
+            departure_time="2024-11-20 08:00:00",
+            arrival_time="2024-11-20 09:00:00",
+        )
+        self.order = Order.objects.create(user=self.user)
+
+    def get_calendar(self, month="2024-11"):
+        res = self.client.get(
+            calendar_url(self.route.id), {"month": month}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_days_with_flights_and_fewest_seats_left(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.evening, order=self.order
+        )
+
+        self.assertEqual(
+            self.get_calendar(),
+            [
+                {
+                    "date": "2024-11-11",
+                    "flights": 2,
+                    "min_seats_remaining": 3,
+                },
+                {
+                    "date": "2024-11-20",
+                    "flights": 1,
+                    "min_seats_remaining": 4,
+                },
+            ],
+        )
+
+    def test_other_months_are_empty(self):
+        self.assertEqual(self.get_calendar("2024-12"), [])
+
+    def test_follows_flight_writes(self):
+        self.evening.departure_time = "2024-11-20 18:00:00"
+        self.evening.arrival_time = "2024-11-20 19:00:00"
+        self.evening.save()
+        self.next_day.delete()
+
+        self.assertEqual(
+            self.get_calendar(),
+            [
+                {
+                    "date": "2024-11-11",
+                    "flights": 1,
+                    "min_seats_remaining": 10,
+                },
+                {
+                    "date": "2024-11-20",
+                    "flights": 1,
+                    "min_seats_remaining": 4,
+                },
+            ],
+        )
+
+    def test_follows_ticket_writes(self):
+        tickets = [
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.next_day, order=self.order
+            )
+            for seat in (1, 2)
+        ]
+        self.assertEqual(self.get_calendar()[1]["min_seats_remaining"], 2)
+
+        tickets[0].delete()
+        self.assertEqual(self.get_calendar()[1]["min_seats_remaining"], 3)
+
+    def test_rebuild_matches_incremental_updates(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.morning, order=self.order
+        )
+        expected = self.get_calendar()
+
+        RouteDailyOccupancy.objects.update(min_seats_remaining=None)
+        call_command("rebuild_analytics", stdout=StringIO())
+
+        self.assertEqual(self.get_calendar(), expected)
+
+    def test_invalid_month(self):
+        res = self.client.get(
+            calendar_url(self.route.id), {"month": "November"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_route(self):
+        res = self.client.get(calendar_url(self.route.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,142 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport import snapshot
+from airport.models import Order, Ticket
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+SNAPSHOT_URL = reverse("airport:schedule-snapshot")
+
+
+class ScheduleSnapshotTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "schedule.snap"
+        settings_override = override_settings(
+            SCHEDULE_SNAPSHOT_FILE=self.path
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route(
+            source=sample_source(name="Zürich", closest_big_city="Zürich"),
+            destination=sample_destination(),
+        )
+        self.airplane = sample_airplane(rows=2, seats_in_row=3)
+        self.now = timezone.now().replace(microsecond=0)
+        self.flights = [self.flight(hours) for hours in (-5, 2, 7, 1)]
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 2):
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.flights[2], order=order
+            )
+
+    def flight(self, hours):
+        departure_time = self.now + timedelta(hours=hours)
+        return sample_flight(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=departure_time,
+            arrival_time=departure_time + timedelta(hours=2),
+        )
+
+    def build(self):
+        output = StringIO()
+        call_command(
+            "build_schedule_snapshot", "--chunk-size=2", stdout=output
+        )
+        return output.getvalue()
+
+    def test_future_flights_written_in_id_order(self):
+        self.assertIn("Wrote 3 flights", self.build())
+
+        with snapshot.ScheduleSnapshot(self.path) as schedule:
+            self.assertEqual(
+                list(schedule.columns["flight_id"]),
+                [flight.id for flight in self.flights[1:]],
+            )
+            self.assertEqual(
+                list(schedule.columns["seats_remaining"]), [6, 4, 6]
+            )
+            self.assertEqual(
+                schedule.find(self.flights[2].id),
+                {
+                    "flight_id": self.flights[2].id,
+                    "route_id": self.route.id,
+                    "source_id": self.route.source_id,
+                    "destination_id": self.route.destination_id,
+                    "airplane_id": self.airplane.id,
+                    "departure_time": self.flights[2].departure_time,
+                    "arrival_time": self.flights[2].arrival_time,
+                    "capacity": 6,
+                    "seats_remaining": 4,
+                    "source": "Zürich",
+                    "source_city": "Zürich",
+                    "destination": self.route.destination.name,
+                    "destination_city": (
+                        self.route.destination.closest_big_city
+                    ),
+                    "airplane": self.airplane.name,
+                },
+            )
+            self.assertIsNone(schedule.find(self.flights[0].id))
+            self.assertEqual(len(list(schedule)), 3)
+
+    def test_rejects_other_files(self):
+        self.path.write_bytes(b"not a snapshot" * 10)
+
+        with self.assertRaises(snapshot.SnapshotError):
+            snapshot.ScheduleSnapshot(self.path)
+
+    def test_download_with_etag(self):
+        self.build()
+
+        res = self.client.get(SNAPSHOT_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            b"".join(res.streaming_content), self.path.read_bytes()
+        )
+        etag = res["ETag"]
+
+        res = self.client.get(SNAPSHOT_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.flight(3)
+        self.build()
+        res = self.client.get(
+            SNAPSHOT_URL,
+            HTTP_IF_NONE_MATCH=etag,
+            HTTP_ACCEPT="application/octet-stream",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(
+            b"".join(res.streaming_content), self.path.read_bytes()
+        )
+
+    def test_missing_snapshot(self):
+        res = self.client.get(SNAPSHOT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,38 @@
+import gzip
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+SCHEMA_URL = reverse("schema")
+
+
+class SchemaTests(TestCase):
+    def test_committed_schema_up_to_date(self):
+        # Fails when the API changed without `manage.py generate_schema`
+        call_command("generate_schema", "--check", stdout=StringIO())
+
+    def test_schema_served_with_etag(self):
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(b"openapi:", res.content)
+        self.assertTrue(res["ETag"])
+
+    def test_schema_not_modified(self):
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+    def test_schema_gzipped(self):
+        plain = self.client.get(SCHEMA_URL).content
+
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(res.content), plain)
@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport import autocomplete
+from airport.models import Airport, Crew
+from airport.tests.test_airplane_api import sample_airplane
+
+AIRPLANE_URL = reverse("airport:airplane-list")
+AIRPORT_URL = reverse("airport:airport-list")
+CREW_URL = reverse("airport:crew-list")
+AUTOCOMPLETE_URL = reverse("airport:airport-autocomplete")
+
+
+class SearchApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!", is_staff=False
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_search_airplanes_ranks_prefix_matches_first(self):
+        sample_airplane(name="Airbus Boeing livery")
+        sample_airplane(name="Boeing 737")
+        sample_airplane(name="Cessna")
+
+        res = self.client.get(AIRPLANE_URL, {"name": "boeing"})
+
+        self.assertEqual(
+            [airplane["name"] for airplane in res.data["results"]],
+            ["Boeing 737", "Airbus Boeing livery"]
+        )
+
+    def test_search_airports_by_city(self):
+        Airport.objects.create(name="Boryspil", closest_big_city="Kyiv")
+        Airport.objects.create(name="Heathrow", closest_big_city="London")
+
+        res = self.client.get(AIRPORT_URL, {"search": "kyi"})
+
+        self.assertEqual(
+            [airport["name"] for airport in res.data["results"]],
+            ["Boryspil"]
+        )
+
+    def test_search_crew(self):
+        Crew.objects.create(first_name="John", last_name="Smith")
+        Crew.objects.create(first_name="Anna", last_name="Johnson")
+        Crew.objects.create(first_name="Olga", last_name="Petrenko")
+
+        res = self.client.get(CREW_URL, {"search": "john"})
+
+        self.assertEqual(
+            [crew["full_name"] for crew in res.data["results"]],
+            ["John Smith", "Anna Johnson"]
+        )
+
+
+class AutocompleteApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!", is_staff=False
+        )
+        self.client.force_authenticate(self.user)
+        Airport.objects.create(name="Boryspil", closest_big_city="Kyiv")
+        Airport.objects.create(name="Kyiv Zhuliany", closest_big_city="Kyiv")
+        Airport.objects.create(name="Zürich", closest_big_city="Zürich")
+        autocomplete.invalidate()
+
+    def autocomplete(self, query, **params):
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": query, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [airport["name"] for airport in res.data]
+
+    def test_name_prefix_ranked_before_city(self):
+        self.assertEqual(
+            self.autocomplete("ky"), ["Kyiv Zhuliany", "Boryspil"]
+        )
+
+    def test_matches_words_and_ignores_accents(self):
+        self.assertEqual(self.autocomplete("zhu"), ["Kyiv Zhuliany"])
+        self.assertEqual(self.autocomplete("zur"), ["Zürich"])
+
+    def test_limit(self):
+        self.assertEqual(self.autocomplete("k", limit=1), ["Kyiv Zhuliany"])
+
+    def test_invalid_limit(self):
+        for limit in (0, -1, 51, "ten"):
+            res = self.client.get(AUTOCOMPLETE_URL, {"q": "k", "limit": limit})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("limit", res.data)
+
+    def test_empty_query(self):
+        self.assertEqual(self.autocomplete(" "), [])
+
+    def test_index_reloaded_on_change(self):
+        self.autocomplete("bor")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Airport.objects.create(name="Borispol", closest_big_city="Kyiv")
+
+        self.assertEqual(self.autocomplete("bor"), ["Borispol", "Boryspil"])
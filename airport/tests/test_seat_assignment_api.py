@@ -0,0 +1,185 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.disruption import swap_airplane
+from airport.models import FreeSeat, Order, Ticket
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from analytics.models import FlightOccupancy
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def free_seats(flight):
+    return list(
+        FreeSeat.objects.filter(flight=flight).values_list("row", "seat")
+    )
+
+
+class SeatAssignmentApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+        self.airplane = sample_airplane(rows=3, seats_in_row=4)
+        self.flight = sample_flight(
+            route=sample_route(
+                source=sample_source(), destination=sample_destination()
+            ),
+            airplane=self.airplane,
+        )
+
+    def order(self, tickets=(), **seat_request):
+        payload = {}
+        if tickets:
+            payload["tickets"] = [
+                {"row": row, "seat": seat, "flight": self.flight.id}
+                for row, seat in tickets
+            ]
+        if seat_request:
+            payload["seat_requests"] = [
+                {"flight": self.flight.id, **seat_request}
+            ]
+        return self.client.post(ORDER_URL, payload, format="json")
+
+    def assigned(self, res):
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return [
+            (ticket["row"], ticket["seat"]) for ticket in res.data["tickets"]
+        ]
+
+    def test_free_seats_follow_tickets(self):
+        self.assertEqual(len(free_seats(self.flight)), 12)
+
+        self.order(tickets=[(2, 3)])
+        self.assertNotIn((2, 3), free_seats(self.flight))
+
+        Order.objects.all().delete()
+        self.assertEqual(len(free_seats(self.flight)), 12)
+
+    def test_any_seats(self):
+        self.order(tickets=[(1, 2)])
+
+        self.assertEqual(
+            self.assigned(self.order(count=3)), [(1, 1), (1, 3), (1, 4)]
+        )
+        self.assertEqual(
+            FlightOccupancy.objects.get(flight=self.flight).tickets_sold, 4
+        )
+
+    def test_seats_together(self):
+        self.order(tickets=[(1, 2), (2, 4)])
+
+        self.assertEqual(
+            self.assigned(self.order(count=3, together=True)),
+            [(2, 1), (2, 2), (2, 3)],
+        )
+        self.assertEqual(
+            self.assigned(self.order(count=2, together=True)),
+            [(1, 3), (1, 4)],
+        )
+
+    def test_not_enough_seats(self):
+        self.order(tickets=[(1, 2), (2, 2), (3, 2)])
+
+        res = self.order(count=3, together=True)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat_requests", res.data)
+
+        res = self.order(count=10)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 3)
+        self.assertEqual(len(free_seats(self.flight)), 9)
+
+    def test_more_together_than_in_a_row(self):
+        res = self.order(count=5, together=True)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tickets_or_seat_requests_required(self):
+        res = self.client.post(ORDER_URL, {}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_free_seats_follow_airplane_swap(self):
+        self.order(tickets=[(1, 1)])
+
+        swap_airplane(
+            [self.flight.id],
+            sample_airplane(rows=1, seats_in_row=2),
+            Exception,
+        )
+
+        self.assertEqual(free_seats(self.flight), [(1, 2)])
+
+
+@mock.patch.object(connection, "vendor", "sqlite")
+class ORMSeatAssignmentApiTests(SeatAssignmentApiTests):
+    """The same assignments through the fallback for other databases"""
+
+
+class ConcurrentSeatAssignmentTests(TransactionTestCase):
+    def test_simultaneous_orders_get_different_seats(self):
+        users = [
+            get_user_model().objects.create_user(
+                email=f"user{number}@test.test", password="Test1234!"
+            )
+            for number in range(8)
+        ]
+        flight = sample_flight(
+            route=sample_route(
+                source=sample_source(), destination=sample_destination()
+            ),
+            airplane=sample_airplane(rows=8, seats_in_row=4),
+        )
+        start = threading.Barrier(len(users))
+        statuses = []
+
+        def book(user, together):
+            client = APIClient()
+            client.force_authenticate(user)
+            start.wait()
+            try:
+                res = client.post(
+                    ORDER_URL,
+                    {
+                        "seat_requests": [
+                            {
+                                "flight": flight.id,
+                                "count": 2,
+                                "together": together,
+                            }
+                        ]
+                    },
+                    format="json",
+                )
+                statuses.append(res.status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=book, args=(user, number % 2 == 0))
+            for number, user in enumerate(users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(statuses, [status.HTTP_201_CREATED] * len(users))
+        self.assertEqual(Ticket.objects.filter(flight=flight).count(), 16)
+        self.assertEqual(FreeSeat.objects.filter(flight=flight).count(), 16)
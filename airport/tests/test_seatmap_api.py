@@ -0,0 +1,203 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.seatmap import adjacent_blocks, bitmap, block_starts, runs
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+
+
+ADJACENT_SEATS_URL = reverse("airport:flight-search-adjacent-seats")
+
+
+def seatmap_url(flight_id):
+    return reverse("airport:flight-seatmap", args=[flight_id])
+
+
+def adjacent_seats_url(flight_id):
+    return reverse("airport:flight-adjacent-seats", args=[flight_id])
+
+
+class SeatMapEncodingTests(TestCase):
+    def test_bitmap(self):
+        encoded = bitmap(2, 5, [(1, 1), (1, 5), (2, 3)])
+
+        self.assertEqual(
+            base64.b64decode(encoded), bytes([0b10001001, 0b00000000])
+        )
+
+    def test_bitmap_ignores_seats_outside_airplane(self):
+        self.assertEqual(bitmap(1, 4, [(2, 1), (1, 5)]), bitmap(1, 4, []))
+
+    def test_runs(self):
+        self.assertEqual(
+            runs(3, 6, [(1, 1), (1, 2), (2, 3), (2, 6)]),
+            [[0, 2, 4], [2, 1, 2, 1], [6]],
+        )
+
+    def test_block_starts(self):
+        self.assertEqual(block_starts(0b1110111, 3), 0b0010001)
+        self.assertEqual(block_starts(0b1111111, 7), 0b0000001)
+        self.assertEqual(block_starts(0b1111, 5), 0)
+
+    def test_adjacent_blocks(self):
+        self.assertEqual(
+            adjacent_blocks(3, 6, [(1, 3), (2, 2), (2, 5)], 3),
+            [(1, 4), (3, 1), (3, 2), (3, 3), (3, 4)],
+        )
+
+
+class SeatMapApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+
+        route = sample_route(
+            source=sample_source(name="Source", closest_big_city="Test"),
+            destination=sample_destination(
+                name="Destination", closest_big_city="Test"
+            ),
+        )
+        self.flight = sample_flight(
+            route=route,
+            airplane=sample_airplane(name="Test", rows=3, seats_in_row=4),
+        )
+        order = Order.objects.create(user=self.user)
+        for row, seat in [(1, 1), (2, 4), (3, 2)]:
+            Ticket.objects.create(
+                row=row, seat=seat, flight=self.flight, order=order
+            )
+
+    def test_auth_required(self):
+        self.client.force_authenticate(None)
+
+        res = self.client.get(seatmap_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bitmap_seatmap(self):
+        with self.assertNumQueries(2):
+            res = self.client.get(seatmap_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "flight": self.flight.id,
+                "rows": 3,
+                "seats_in_row": 4,
+                "tickets_sold": 3,
+                "encoding": "bitmap",
+                "bitmap": base64.b64encode(
+                    bytes([0b10000001, 0b0100_0000])
+                ).decode(),
+            },
+        )
+
+    def test_runs_seatmap(self):
+        res = self.client.get(
+            seatmap_url(self.flight.id), {"encoding": "runs"}
+        )
+
+        self.assertEqual(res.data["runs"], [[0, 1, 3], [3, 1], [1, 1, 2]])
+        self.assertNotIn("bitmap", res.data)
+
+    def test_invalid_encoding(self):
+        res = self.client.get(
+            seatmap_url(self.flight.id), {"encoding": "png"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_flight(self):
+        res = self.client.get(seatmap_url(self.flight.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AdjacentSeatsApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(self.user)
+
+        route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        airplane = sample_airplane(rows=2, seats_in_row=4)
+        self.flight = sample_flight(route=route, airplane=airplane)
+        self.other_flight = sample_flight(
+            route=route,
+            airplane=airplane,
+            departure_time="2024-11-12 11:00:00",
+            arrival_time="2024-11-12 12:00:00",
+        )
+        order = Order.objects.create(user=self.user)
+        for row, seat in [(1, 2), (2, 4)]:
+            Ticket.objects.create(
+                row=row, seat=seat, flight=self.flight, order=order
+            )
+
+    def test_adjacent_seats(self):
+        res = self.client.get(adjacent_seats_url(self.flight.id), {"count": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "flight": self.flight.id,
+                "count": 2,
+                "blocks": [
+                    {"row": 1, "seats": [3, 4]},
+                    {"row": 2, "seats": [1, 2]},
+                    {"row": 2, "seats": [2, 3]},
+                ],
+            },
+        )
+
+    def test_invalid_count(self):
+        for count in ("", "0", "10", "two"):
+            res = self.client.get(
+                adjacent_seats_url(self.flight.id), {"count": count}
+            )
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_many_flights(self):
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                ADJACENT_SEATS_URL,
+                {
+                    "flights": f"{self.other_flight.id},{self.flight.id},0",
+                    "count": 4,
+                },
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["flight"], len(item["blocks"])) for item in res.data],
+            [(self.other_flight.id, 2), (self.flight.id, 0)],
+        )
+
+    def test_invalid_flights(self):
+        res = self.client.get(
+            ADJACENT_SEATS_URL, {"flights": "1,a", "count": 2}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("flights", res.data)
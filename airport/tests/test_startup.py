@@ -0,0 +1,42 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class StartupProfileTests(SimpleTestCase):
+    def profile(self, *env):
+        out = StringIO()
+        args = ["startup_profile", "--json"]
+        for variable in env:
+            args += ["--env", variable]
+        call_command(*args, stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_disabled_parts_are_not_imported(self):
+        result = self.profile(
+            "DEBUG=0",
+            "ENABLE_ADMIN=0",
+            "ENABLE_API_DOCS=0",
+            "ENABLE_DEBUG_TOOLBAR=0",
+            "ALLOWED_HOSTS=localhost",
+        )
+        modules = set(result["modules"])
+
+        self.assertEqual(result["status"], "401 Unauthorized")
+        for module in (
+            "debug_toolbar",
+            "drf_spectacular.openapi",
+            "drf_spectacular.views",
+            "airport.admin",
+            "user.admin",
+        ):
+            self.assertNotIn(module, modules)
+
+    def test_report_lists_slowest_packages(self):
+        out = StringIO()
+        call_command("startup_profile", "--limit", "3", stdout=out)
+
+        self.assertIn("Boot total:", out.getvalue())
+        self.assertIn("django", out.getvalue())
@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from airport_api.throttling import (
+    SlidingWindowRateThrottle,
+    ScopedRateThrottle,
+)
+
+
+class FakeTimer:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class SampleThrottle(SlidingWindowRateThrottle):
+    rate = "3/min"
+
+    def get_cache_key(self, request, view):
+        return "throttle_test"
+
+
+class SampleView:
+    action = "create"
+    throttle_scope = {"create": "order_create"}
+
+
+class SlidingWindowRateThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get("/")
+        self.timer = FakeTimer(6000)
+
+    def check(self):
+        throttle = SampleThrottle()
+        throttle.timer = self.timer
+        return throttle.allow_request(self.request, None), throttle
+
+    def test_requests_over_rate_throttled(self):
+        results = [self.check()[0] for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_rejected_requests_not_counted(self):
+        for _ in range(10):
+            self.check()
+
+        self.assertEqual(cache.get("throttle_test:100"), 3)
+
+    def test_previous_window_weighted(self):
+        for _ in range(3):
+            self.check()
+
+        # A third of the next window passed: 2/3 of 3 requests still count
+        self.timer.now = 6080
+        allowed, _ = self.check()
+        self.assertTrue(allowed)
+        allowed, throttle = self.check()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 20)
+
+    def test_counters_reset_after_two_windows(self):
+        for _ in range(4):
+            self.check()
+
+        self.timer.now = 6120
+        allowed, _ = self.check()
+
+        self.assertTrue(allowed)
+
+
+class ScopedRateThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().post("/")
+        self.request.user = None
+
+    def test_scope_resolved_by_action(self):
+        throttle = ScopedRateThrottle()
+
+        self.assertTrue(throttle.allow_request(self.request, SampleView()))
+        self.assertEqual(throttle.scope, "order_create")
+        self.assertEqual(throttle.num_requests, 60)
+
+    def test_action_without_scope_not_throttled(self):
+        view = SampleView()
+        view.action = "list"
+        throttle = ScopedRateThrottle()
+
+        self.assertTrue(throttle.allow_request(self.request, view))
+        self.assertFalse(hasattr(throttle, "key"))
@@ -5,7 +5,10 @@ from airport.views import (
     AirplaneViewSet,
     AirplaneTypeViewSet,
     AirportViewSet,
+    AirportAutocompleteView,
+    ChangeFeedView,
     RouteViewSet,
+    ScheduleSnapshotView,
     CrewViewSet,
     FlightViewSet,
     OrderViewSet,
@@ -21,6 +24,17 @@ router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
 
 urlpatterns = [
+    path(
+        "autocomplete/",
+        AirportAutocompleteView.as_view(),
+        name="airport-autocomplete"
+    ),
+    path("changes/", ChangeFeedView.as_view(), name="changes"),
+    path(
+        "schedule-snapshot/",
+        ScheduleSnapshotView.as_view(),
+        name="schedule-snapshot"
+    ),
     path("", include(router.urls))
 ]
 
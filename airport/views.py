@@ -1,25 +1,60 @@
+import json
+from collections import defaultdict
 from datetime import datetime
 
-from django.db.models import Count
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags
 from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
-    OpenApiParameter
+    OpenApiParameter,
+    OpenApiTypes,
 )
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from airport.models import (
+    ArchivedFlight,
+    ArchivedOrder,
     Airplane,
     AirplaneType,
     Airport,
     Route,
     Crew,
     Flight,
-    Order
+    Order,
+    Ticket,
+)
+from airport import (
+    board,
+    changes,
+    disruption,
+    flight_search,
+    geo,
+    snapshot,
 )
+from airport.autocomplete import get_index
+from airport.live import async_event_stream, event_stream
+from airport.seatmap import ENCODINGS, adjacent_blocks
+from airport.schedule import overlapping
+from airport.search import search
 from airport.serializers import (
     AirplaneSerializer,
     AirplaneTypeSerializer,
@@ -31,12 +66,34 @@ from airport.serializers import (
     RouteListSerializer,
     RouteDetailSerializer,
     CrewSerializer,
+    CrewFlightSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
     FlightSerializer,
     OrderSerializer,
     OrderListSerializer,
+    SeatMapSerializer,
+    AdjacentSeatsSerializer,
+    AdjacentSeatsQuerySerializer,
+    FlightsAdjacentSeatsQuerySerializer,
+    ArchivedFlightSerializer,
+    ArchivedOrderSerializer,
+    ChangeFeedSerializer,
+    ChangeFeedQuerySerializer,
+    ChangeFeedPrunedSerializer,
+    FlightBoardSerializer,
+    FlightBoardQuerySerializer,
+    NearbyAirportSerializer,
+    NearbyAirportQuerySerializer,
+    AirportAutocompleteQuerySerializer,
+    FlightShiftSerializer,
+    AirplaneSwapSerializer,
+    RescheduledFlightsSerializer,
 )
+from analytics.models import RouteDailyOccupancy
+from analytics.serializers import RouteCalendarDaySerializer
+from airport_api.idempotency import IDEMPOTENCY_HEADER, IdempotentCreateMixin
+from airport_api.renderers import EventStreamRenderer, OctetStreamRenderer
 
 
 def _params_to_ints(qs):
@@ -44,6 +101,34 @@ def _params_to_ints(qs):
     return [int(str_id) for str_id in qs.split(",")]
 
 
+def _param_to_bool(request, name):
+    """Interprets a flag query parameter like ?archived=true"""
+    return request.query_params.get(name, "").lower() in ("1", "true", "yes")
+
+
+ARCHIVED_PARAMETER = OpenApiParameter(
+    name="archived",
+    type=bool,
+    description="Read departed flights and orders from the archive "
+                "instead (e.g., ?archived=true)",
+)
+
+
+def _param_to_datetime(request, name):
+    """Converts a date or datetime query parameter to an aware datetime"""
+    value = request.query_params.get(name, "")
+    date_time = parse_datetime(value)
+    if date_time is None and parse_date(value):
+        date_time = datetime.combine(parse_date(value), datetime.min.time())
+    if date_time is None:
+        raise ValidationError(
+            {name: "Provide a date or datetime in ISO 8601 format."}
+        )
+    if timezone.is_naive(date_time):
+        date_time = timezone.make_aware(date_time)
+    return date_time
+
+
 class AirplaneTypeViewSet(
     viewsets.GenericViewSet,
     mixins.CreateModelMixin,
@@ -59,7 +144,8 @@ class AirplaneTypeViewSet(
             OpenApiParameter(
                 name="name",
                 type=str,
-                description="Filter by name (e.g., ?name=Boeing)",
+                description="Search by name, best matches first "
+                            "(e.g., ?name=Boeing)",
             ),
             OpenApiParameter(
                 name="airplane-type",
@@ -95,7 +181,7 @@ class AirplaneViewSet(
         queryset = self.queryset
 
         if name:
-            queryset = queryset.filter(name__icontains=name)
+            queryset = search(queryset, ["name"], name)
 
         if airplane_type:
             airplane_type_ids = _params_to_ints(airplane_type)
@@ -126,6 +212,18 @@ class AirplaneViewSet(
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                type=str,
+                description="Search by name or closest big city, "
+                            "best matches first (e.g., ?search=Kyiv)",
+            ),
+        ]
+    )
+)
 class AirportViewSet(
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
@@ -134,6 +232,169 @@ class AirportViewSet(
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
 
+    def get_queryset(self):
+        """Retrieve the airports with search"""
+        query = self.request.query_params.get("search")
+
+        queryset = self.queryset
+
+        if query:
+            queryset = search(queryset, ["name", "closest_big_city"], query)
+
+        return queryset
+
+    @extend_schema(
+        parameters=[NearbyAirportQuerySerializer],
+        responses=NearbyAirportSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, pagination_class=None)
+    def nearby(self, request):
+        """Airports closest to a point, nearest first"""
+        query = NearbyAirportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        airports = geo.get_tree().search(
+            query.validated_data["lat"],
+            query.validated_data["lon"],
+            query.validated_data["limit"],
+            radius_km=query.validated_data.get("radius"),
+        )
+        return Response(NearbyAirportSerializer(airports, many=True).data)
+
+    def board(self, request, pk, name):
+        query = FlightBoardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        airport = get_object_or_404(Airport.objects.only("id"), pk=pk)
+
+        flights = board.upcoming(
+            name, airport.pk, query.validated_data["limit"]
+        )
+        return Response(FlightBoardSerializer(flights, many=True).data)
+
+    @extend_schema(
+        parameters=[FlightBoardQuerySerializer],
+        responses=FlightBoardSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=True)
+    def departures(self, request, pk=None):
+        """Next flights leaving the airport, with the ones just gone"""
+        return self.board(request, pk, board.DEPARTURES)
+
+    @extend_schema(
+        parameters=[FlightBoardQuerySerializer],
+        responses=FlightBoardSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=True)
+    def arrivals(self, request, pk=None):
+        """Next flights landing at the airport, with the ones just landed"""
+        return self.board(request, pk, board.ARRIVALS)
+
+
+class ChangeFeedView(APIView):
+    """
+    Writes to airports, airplanes, routes, flights and seat counts after
+    the sequence number `since`, oldest first. Clients store the returned
+    `next` and pass it as `since` on their next call.
+
+    Once the changes after `since` are pruned, the response is a 410 with
+    the `latest` sequence number. Clients then store `latest`, download
+    everything again from the other endpoints and continue with
+    `since=latest`. Changes made during the download are read again,
+    which is harmless as every change carries the whole stored values.
+    """
+
+    @extend_schema(
+        parameters=[ChangeFeedQuerySerializer],
+        responses={
+            200: ChangeFeedSerializer,
+            410: ChangeFeedPrunedSerializer,
+        },
+    )
+    def get(self, request):
+        query = ChangeFeedQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since, limit = (
+            query.validated_data["since"], query.validated_data["limit"]
+        )
+
+        try:
+            found = changes.changes_since(since, limit)
+        except changes.ChangesPruned as pruned:
+            return Response(
+                ChangeFeedPrunedSerializer(
+                    {"detail": pruned.detail, "latest": pruned.latest}
+                ).data,
+                status=pruned.status_code,
+            )
+        return Response(
+            ChangeFeedSerializer(
+                {
+                    "changes": found,
+                    "next": found[-1].sequence if found else since,
+                    "more": len(found) == limit,
+                }
+            ).data
+        )
+
+
+class ScheduleSnapshotView(APIView):
+    """
+    The latest binary snapshot of flights that have not departed yet, see
+    `airport.snapshot` for its layout. Send the ETag back in
+    If-None-Match to skip downloading an unchanged snapshot.
+    """
+
+    renderer_classes = [JSONRenderer, OctetStreamRenderer]
+
+    @extend_schema(
+        responses={(200, "application/octet-stream"): OpenApiTypes.BINARY}
+    )
+    def get(self, request):
+        try:
+            file = open(settings.SCHEDULE_SNAPSHOT_FILE, "rb")
+        except FileNotFoundError:
+            raise NotFound("No schedule snapshot has been built yet.")
+        # The header is read from the opened file, so it matches the
+        # content sent even if a new snapshot replaces the file meanwhile
+        try:
+            etag = snapshot.read_header(file)["etag"]
+        except snapshot.SnapshotError:
+            file.close()
+            raise
+        file.seek(0)
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            file.close()
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                file,
+                as_attachment=True,
+                filename=settings.SCHEDULE_SNAPSHOT_FILE.name,
+                content_type="application/octet-stream",
+            )
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class AirportAutocompleteView(APIView):
+    """Airports whose name or city starts with ?q=, for search boxes"""
+
+    @extend_schema(
+        parameters=[AirportAutocompleteQuerySerializer],
+        responses=AirportSerializer(many=True),
+    )
+    def get(self, request):
+        query = AirportAutocompleteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        return Response(
+            get_index().search(
+                query.validated_data["q"], query.validated_data["limit"]
+            )
+        )
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -167,6 +428,26 @@ class RouteViewSet(
             return RouteDetailSerializer
         return RouteSerializer
 
+    @extend_schema(request=RouteSerializer(many=True))
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="import",
+        permission_classes=[IsAdminUser],
+    )
+    def import_routes(self, request):
+        """
+        Endpoint for creating many routes at once, with the distances left
+        out computed from the coordinates of their airports
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     def get_queryset(self):
         """Retrieve the routes with filters"""
         source = self.request.query_params.get("source")
@@ -186,14 +467,140 @@ class RouteViewSet(
             queryset = queryset.select_related("source", "destination")
         return queryset.distinct()
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="month",
+                type=str,
+                description="Month in YYYY-MM format, the current one "
+                            "by default (e.g., ?month=2024-10)",
+            ),
+        ],
+        responses=RouteCalendarDaySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=True)
+    def calendar(self, request, pk=None):
+        """Days of the month with flights on the route and seats left"""
+        month = request.query_params.get("month")
+        try:
+            first_day = (
+                datetime.strptime(month, "%Y-%m").date() if month
+                else timezone.localdate().replace(day=1)
+            )
+        except ValueError:
+            raise ValidationError({"month": "Use the YYYY-MM format."})
+
+        if not Route.objects.filter(pk=pk).exists():
+            raise NotFound()
+
+        days = RouteDailyOccupancy.objects.filter(
+            route_id=pk,
+            date__year=first_day.year,
+            date__month=first_day.month,
+            flights__gt=0,
+        ).order_by("date")
+        return Response(RouteCalendarDaySerializer(days, many=True).data)
+
+
+TIME_WINDOW_PARAMETERS = [
+    OpenApiParameter(
+        name="from",
+        type=str,
+        required=True,
+        description="Start of the time window "
+                    "(e.g., ?from=2024-10-08 or ?from=2024-10-08T10:00)",
+    ),
+    OpenApiParameter(
+        name="to",
+        type=str,
+        required=True,
+        description="End of the time window "
+                    "(e.g., ?to=2024-10-09 or ?to=2024-10-08T18:00)",
+    ),
+]
+
 
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                type=str,
+                description="Search by first or last name, "
+                            "best matches first (e.g., ?search=John)",
+            ),
+        ]
+    ),
+    roster=extend_schema(parameters=TIME_WINDOW_PARAMETERS),
+    available=extend_schema(parameters=TIME_WINDOW_PARAMETERS),
+)
 class CrewViewSet(
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
 ):
     queryset = Crew.objects.all()
-    serializer_class = CrewSerializer
+
+    def get_queryset(self):
+        """Retrieve the crew with search"""
+        query = self.request.query_params.get("search")
+
+        queryset = self.queryset
+
+        if query and self.action == "list":
+            queryset = search(queryset, ["first_name", "last_name"], query)
+
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "roster":
+            return CrewFlightSerializer
+        return CrewSerializer
+
+    @action(methods=["GET"], detail=True)
+    def roster(self, request, pk=None):
+        """Flights of the crewmate overlapping the time window"""
+        crew = self.get_object()
+        flights = overlapping(
+            crew.flights.select_related(
+                "route__source", "route__destination", "airplane"
+            ),
+            _param_to_datetime(request, "from"),
+            _param_to_datetime(request, "to"),
+        ).order_by("departure_time")
+
+        page = self.paginate_queryset(flights)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def available(self, request):
+        """Crewmates without flights in the time window"""
+        busy = overlapping(
+            Flight.crewmates.through.objects.filter(crew_id=OuterRef("pk")),
+            _param_to_datetime(request, "from"),
+            _param_to_datetime(request, "to"),
+            prefix="flight__",
+        )
+        crew = self.get_queryset().filter(~Exists(busy)).order_by("id")
+
+        page = self.paginate_queryset(crew)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+# Outside FlightViewSet, whose `list` action shadows the builtin in the
+# class body
+ENCODING_PARAMETER = OpenApiParameter(
+    "encoding",
+    type=str,
+    enum=list(ENCODINGS),
+    description=(
+        "bitmap: base64 of one bit per seat, row by row; "
+        "runs: alternating free/taken run lengths of every row "
+        "(ex. ?encoding=runs)"
+    ),
+)
 
 
 @extend_schema_view(
@@ -215,14 +622,28 @@ class CrewViewSet(
                 description="Filter by departure date in "
                             "YYYY-MM-DD format "
                             "(e.g., ?departure-date=2024-10-08)",
-            )
+            ),
+            ARCHIVED_PARAMETER,
         ]
-    )
+    ),
+    retrieve=extend_schema(parameters=[ARCHIVED_PARAMETER]),
 )
 class FlightViewSet(viewsets.ModelViewSet):
     queryset = Flight.objects.all()
+    throttle_scope = {
+        "list": "flight_search",
+        "search_adjacent_seats": "flight_search",
+    }
+
+    @property
+    def archived(self):
+        return self.action in ("list", "retrieve") and _param_to_bool(
+            self.request, "archived"
+        )
 
     def get_serializer_class(self):
+        if self.archived:
+            return ArchivedFlightSerializer
         if self.action == "list":
             return FlightListSerializer
         if self.action in ("retrieve",):
@@ -235,13 +656,20 @@ class FlightViewSet(viewsets.ModelViewSet):
         airplane = self.request.query_params.get("airplanes")
         departure_date = self.request.query_params.get("departure-date")
 
-        queryset = self.queryset.select_related(
-            "route__source",
-            "route__destination",
-            "airplane__airplane_type",
-        ).prefetch_related(
-            "crewmates",
-        )
+        if self.archived:
+            queryset = ArchivedFlight.objects.select_related(
+                "route__source",
+                "route__destination",
+                "airplane",
+            ).annotate(tickets_sold=Count("tickets"))
+        else:
+            queryset = self.queryset.select_related(
+                "route__source",
+                "route__destination",
+                "airplane__airplane_type",
+            ).prefetch_related(
+                "crewmates",
+            )
 
         if route:
             route_ids = _params_to_ints(route)
@@ -255,31 +683,290 @@ class FlightViewSet(viewsets.ModelViewSet):
             date = datetime.strptime(departure_date, "%Y-%m-%d").date()
             queryset = queryset.filter(departure_time__date=date)
 
-        if self.action == "list":
+        if self.action == "list" and not self.archived:
             queryset = queryset.annotate(occupied_seats=Count("tickets"))
 
         return queryset.distinct()
 
+    def list(self, request, *args, **kwargs):
+        """
+        Search results are the same for every user, so they are cached
+        until a flight or ticket of the searched routes or date changes
+        """
+        key = None if self.archived else flight_search.search_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+
+        list_flights = super().list
+        data, content = flight_search.fetch(
+            key, lambda: list_flights(request, *args, **kwargs).data
+        )
+        if data is not None:
+            return Response(data)
+        if request.accepted_renderer.format == "json":
+            return HttpResponse(content, content_type="application/json")
+        return Response(json.loads(content))
+
+    @extend_schema(request=FlightSerializer(many=True))
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="import",
+        permission_classes=[IsAdminUser],
+    )
+    def import_schedule(self, request):
+        """Endpoint for creating a whole schedule of flights at once"""
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        request=FlightShiftSerializer,
+        responses=RescheduledFlightsSerializer,
+    )
+    @action(methods=["POST"], detail=False, permission_classes=[IsAdminUser])
+    def shift(self, request):
+        """
+        Delay or bring forward all flights of an airplane and/or route
+        departing after a moment, validated and updated as one set
+        """
+        serializer = FlightShiftSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        flights = Flight.objects.filter(departure_time__gte=data["after"])
+        for field in ("airplane", "route"):
+            if field in data:
+                flights = flights.filter(**{field: data[field]})
+
+        flight_ids = disruption.shift_flights(
+            flights, data["delta"], ValidationError
+        )
+        return Response({"flights": flight_ids})
+
+    @extend_schema(
+        request=AirplaneSwapSerializer,
+        responses=RescheduledFlightsSerializer,
+    )
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="swap-airplane",
+        permission_classes=[IsAdminUser],
+    )
+    def swap_airplane(self, request):
+        """Assign another airplane to a set of flights at once"""
+        serializer = AirplaneSwapSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        flight_ids = disruption.swap_airplane(
+            serializer.validated_data["flights"],
+            serializer.validated_data["airplane"],
+            ValidationError,
+        )
+        return Response({"flights": flight_ids})
+
+    def get_seat_layout(self):
+        return get_object_or_404(
+            Flight.objects.values_list(
+                "id", "airplane__rows", "airplane__seats_in_row"
+            ),
+            pk=self.kwargs["pk"],
+        )
+
+    @staticmethod
+    def build_seatmap(layout, encoding):
+        flight_id, rows, seats_in_row = layout
+        taken = list(
+            Ticket.objects.filter(flight_id=flight_id)
+            .values_list("row", "seat")
+        )
+        return {
+            "flight": flight_id,
+            "rows": rows,
+            "seats_in_row": seats_in_row,
+            "tickets_sold": len(taken),
+            "encoding": encoding,
+            encoding: ENCODINGS[encoding](rows, seats_in_row, taken),
+        }
+
+    @extend_schema(
+        parameters=[
+            ENCODING_PARAMETER,
+        ],
+        responses=SeatMapSerializer,
+    )
+    @action(methods=["GET"], detail=True, url_path="seatmap")
+    def seatmap(self, request, pk=None):
+        """Endpoint for the occupied seats of a flight in a compact form"""
+        encoding = request.query_params.get("encoding", "bitmap")
+        if encoding not in ENCODINGS:
+            raise ValidationError(
+                {"encoding": f"Choose one of: {', '.join(ENCODINGS)}."}
+            )
+
+        serializer = SeatMapSerializer(
+            self.build_seatmap(self.get_seat_layout(), encoding)
+        )
+        return Response(serializer.data)
+
+    @staticmethod
+    def find_adjacent_seats(layouts, count):
+        """
+        Blocks of `count` free seats next to each other on every flight
+        of the (id, rows, seats in row) layouts, with one tickets query
+        """
+        taken = defaultdict(list)
+        for flight_id, row, seat in Ticket.objects.filter(
+            flight_id__in=[flight_id for flight_id, _, _ in layouts]
+        ).values_list("flight_id", "row", "seat"):
+            taken[flight_id].append((row, seat))
+
+        return [
+            {
+                "flight": flight_id,
+                "count": count,
+                "blocks": [
+                    {"row": row, "seats": list(range(first, first + count))}
+                    for row, first in adjacent_blocks(
+                        rows, seats_in_row, taken[flight_id], count
+                    )
+                ],
+            }
+            for flight_id, rows, seats_in_row in layouts
+        ]
+
+    @extend_schema(
+        parameters=[AdjacentSeatsQuerySerializer],
+        responses=AdjacentSeatsSerializer,
+    )
+    @action(methods=["GET"], detail=True, url_path="seats/adjacent")
+    def adjacent_seats(self, request, pk=None):
+        """Where a group can sit together: blocks of free seats in a row"""
+        query = AdjacentSeatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        (adjacent,) = self.find_adjacent_seats(
+            [self.get_seat_layout()], query.validated_data["count"]
+        )
+        return Response(AdjacentSeatsSerializer(adjacent).data)
+
+    @extend_schema(
+        parameters=[FlightsAdjacentSeatsQuerySerializer],
+        responses=AdjacentSeatsSerializer(many=True),
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="seats/adjacent",
+        pagination_class=None,
+    )
+    def search_adjacent_seats(self, request):
+        """
+        Blocks of free seats in a row on many flights at once, e.g. of
+        search results, in the order of the flights given
+        """
+        query = FlightsAdjacentSeatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        flight_ids = query.validated_data["flights"]
+
+        layouts = {
+            layout[0]: layout
+            for layout in Flight.objects.filter(
+                pk__in=flight_ids
+            ).values_list("id", "airplane__rows", "airplane__seats_in_row")
+        }
+        adjacent = self.find_adjacent_seats(
+            [layouts[pk] for pk in flight_ids if pk in layouts],
+            query.validated_data["count"],
+        )
+        return Response(AdjacentSeatsSerializer(adjacent, many=True).data)
+
+    @extend_schema(responses={(200, "text/event-stream"): OpenApiTypes.STR})
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="live",
+        renderer_classes=[EventStreamRenderer, JSONRenderer],
+    )
+    def live(self, request, pk=None):
+        """
+        Server-sent events with the seat map of the flight, then the seats
+        taken and released since, as `seatmap`, `taken` and `released`
+        events
+        """
+        layout = self.get_seat_layout()
+        # Django sends synchronous streams only once they end under ASGI
+        if isinstance(request._request, ASGIRequest):
+            stream = async_event_stream
+        else:
+            stream = event_stream
+        response = StreamingHttpResponse(
+            stream(
+                layout[0],
+                lambda: SeatMapSerializer(
+                    self.build_seatmap(layout, "bitmap")
+                ).data,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+@extend_schema_view(
+    create=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                location=OpenApiParameter.HEADER,
+                description=(
+                    "Unique key of the order, retries with the same key "
+                    "replay the first response "
+                    "(ex. Idempotency-Key: 8e03978e-40d5-43e8)"
+                ),
+                type=str,
+            ),
+        ]
+    ),
+    list=extend_schema(parameters=[ARCHIVED_PARAMETER]),
+)
 class OrderViewSet(
+    IdempotentCreateMixin,
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
 ):
     permission_classes = [IsAuthenticated]
+    throttle_scope = {"create": "order_create"}
     queryset = Order.objects.prefetch_related(
         "tickets__flight__airplane",
         "tickets__flight__route",
         "tickets__flight__crewmates",
     )
 
+    @property
+    def archived(self):
+        return self.action == "list" and _param_to_bool(
+            self.request, "archived"
+        )
+
     def get_serializer_class(self):
+        if self.archived:
+            return ArchivedOrderSerializer
         if self.action == "list":
             return OrderListSerializer
         return OrderSerializer
 
     def get_queryset(self):
         queryset = self.queryset
+        if self.archived:
+            queryset = ArchivedOrder.objects.prefetch_related("tickets")
         return queryset.filter(user=self.request.user)
 
     def perform_create(self, serializer):
@@ -0,0 +1,147 @@
+import io
+import json
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+BATCH_NAMESPACE = "airport"
+DEDUPLICATED_METHODS = ("GET", "HEAD", "OPTIONS")
+# Keys of the batch request's environ passed on to every sub-request,
+# other headers are only those given for each sub-request
+SHARED_ENVIRON_KEYS = (
+    "HTTP_AUTHORIZATION",
+    "HTTP_ACCEPT_LANGUAGE",
+    "HTTP_HOST",
+    "REMOTE_ADDR",
+    "SCRIPT_NAME",
+)
+
+
+class BatchSubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
+        default="GET",
+    )
+    path = serializers.CharField()
+    headers = serializers.DictField(
+        child=serializers.CharField(),
+        required=False,
+        help_text="Headers of this request only, e.g. Idempotency-Key",
+    )
+    body = serializers.JSONField(required=False)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = BatchSubRequestSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.BATCH_MAX_REQUESTS,
+    )
+
+
+class BatchSubResponseSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    body = serializers.JSONField()
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = BatchSubResponseSerializer(many=True)
+
+
+class BatchView(APIView):
+    """
+    Execute several requests against the airport API in one round trip.
+
+    Sub-requests run in-process with the user of the batch request,
+    skipping the middleware stack and repeated authentication. They share
+    only the authorization, language and server details of the batch
+    request, other headers are given for each sub-request.
+    Identical read-only sub-requests are executed once.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        request=BatchRequestSerializer,
+        responses=BatchResponseSerializer,
+    )
+    def post(self, request):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        executed = {}
+        responses = []
+        for sub_request in serializer.validated_data["requests"]:
+            key = (
+                sub_request["method"],
+                sub_request["path"],
+                json.dumps(sub_request.get("headers"), sort_keys=True),
+                json.dumps(sub_request.get("body"), sort_keys=True),
+            )
+            if sub_request["method"] not in DEDUPLICATED_METHODS:
+                responses.append(self.execute(request, sub_request))
+                continue
+            if key not in executed:
+                executed[key] = self.execute(request, sub_request)
+            responses.append(executed[key])
+
+        return Response({"responses": responses}, status=status.HTTP_200_OK)
+
+    def execute(self, request, sub_request):
+        url = urlsplit(sub_request["path"])
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            match = None
+
+        if match is None or BATCH_NAMESPACE not in match.namespaces:
+            return {
+                "status": status.HTTP_404_NOT_FOUND,
+                "body": {"detail": "Not found."},
+            }
+
+        body = b""
+        if "body" in sub_request:
+            body = json.dumps(sub_request["body"]).encode()
+
+        environ = {
+            key: value for key, value in request.META.items()
+            if key in SHARED_ENVIRON_KEYS or key.startswith("SERVER_")
+        }
+        environ.update(
+            {
+                f"HTTP_{name.upper().replace('-', '_')}": value
+                for name, value in sub_request.get("headers", {}).items()
+            }
+        )
+        environ.update(
+            {
+                "REQUEST_METHOD": sub_request["method"],
+                "PATH_INFO": url.path,
+                "QUERY_STRING": url.query,
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(body)),
+                "wsgi.input": io.BytesIO(body),
+                "wsgi.url_scheme": request.scheme,
+            }
+        )
+        http_request = WSGIRequest(environ)
+        # Picked up by DRF instead of running the authenticators again
+        http_request._force_auth_user = request.user
+        http_request._force_auth_token = request.auth
+
+        response = match.func(http_request, *match.args, **match.kwargs)
+        body = getattr(response, "data", None)
+        if body is None and not response.streaming and response.content and (
+            response.get("Content-Type", "").startswith("application/json")
+        ):
+            # Responses served from a cache are sent as rendered JSON
+            body = json.loads(response.content)
+        return {"status": response.status_code, "body": body}
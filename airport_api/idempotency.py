@@ -0,0 +1,119 @@
+import hashlib
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.renderers import JSONRenderer
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _(
+        "A request with this idempotency key is still being processed."
+    )
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _(
+        "This idempotency key was already used with a different request."
+    )
+    default_code = "idempotency_key_reused"
+
+
+def idempotency_cache_key(user_id, path, key):
+    digest = hashlib.blake2b(
+        f"{path}\n{key}".encode(), digest_size=16
+    ).hexdigest()
+    return f"idempotency:{user_id}:{digest}"
+
+
+def request_fingerprint(request):
+    return hashlib.blake2b(request.body, digest_size=16).digest()
+
+
+# The first request with a key claims it in the cache, runs and stores its
+# response as (fingerprint, status, compressed JSON body). Retries with the
+# same key and body are answered from the cache without touching the
+# database, retries arriving while the first request is still running wait
+# for its response, and failed requests release the key so they can be
+# retried. Keys are scoped to the user and the path.
+class IdempotentCreateMixin:
+    def create(self, request, *args, **kwargs):
+        """
+        Retries sent with the same `Idempotency-Key` header and body replay
+        the first successful response instead of creating again.
+        """
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({
+                IDEMPOTENCY_HEADER: _(
+                    "Must be between 1 and %(max)d characters."
+                ) % {"max": MAX_KEY_LENGTH}
+            })
+
+        cache_key = idempotency_cache_key(request.user.pk, request.path, key)
+        fingerprint = request_fingerprint(request)
+
+        if not cache.add(
+            cache_key,
+            (fingerprint, None, None),
+            settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        ):
+            return self.replay(cache_key, fingerprint)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        cache.set(
+            cache_key,
+            (
+                fingerprint,
+                response.status_code,
+                zlib.compress(JSONRenderer().render(response.data)),
+            ),
+            settings.IDEMPOTENCY_KEY_TTL,
+        )
+        return response
+
+    @staticmethod
+    def replay(cache_key, fingerprint):
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        stored = cache.get(cache_key)
+        while stored is not None and stored[1] is None:
+            if stored[0] != fingerprint:
+                raise IdempotencyKeyReused()
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInUse()
+            time.sleep(settings.IDEMPOTENCY_POLL_INTERVAL)
+            stored = cache.get(cache_key)
+
+        if stored is None:
+            # The first request failed and released the key meanwhile
+            raise IdempotencyKeyInUse()
+
+        stored_fingerprint, status_code, body = stored
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReused()
+
+        response = HttpResponse(
+            zlib.decompress(body),
+            status=status_code,
+            content_type="application/json",
+        )
+        response["Idempotent-Replayed"] = "true"
+        return response
@@ -0,0 +1,17 @@
+from django.utils.module_loading import import_string
+
+
+def lazy_view(view_path, **initkwargs):
+    """
+    Route to a class-based view that is imported on its first request
+    instead of when the URLconf loads, for rarely used heavy views.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
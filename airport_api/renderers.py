@@ -0,0 +1,32 @@
+import json
+
+from rest_framework import renderers
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """
+    Lets views stream `text/event-stream` responses. Anything DRF renders
+    itself, like authentication errors, becomes a single `error` event.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f"event: error\ndata: {json.dumps(data)}\n\n".encode()
+
+
+class OctetStreamRenderer(renderers.BaseRenderer):
+    """
+    Lets views send files to clients accepting only
+    `application/octet-stream`. Anything DRF renders itself, like
+    authentication errors, is sent as JSON.
+    """
+
+    media_type = "application/octet-stream"
+    format = "bin"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode()
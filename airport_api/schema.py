@@ -0,0 +1,60 @@
+import gzip
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
+
+SCHEMA_CONTENT_TYPE = "application/vnd.oai.openapi; charset=utf-8"
+
+
+def generate_schema():
+    """Introspect the API and render its OpenAPI schema as YAML"""
+    # Imported here, so workers serving the pre-generated schema never
+    # load the generator
+    from drf_spectacular.renderers import OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    import user.schema  # noqa: F401
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiYamlRenderer().render(schema, renderer_context={})
+
+
+@lru_cache
+def load_schema():
+    """
+    Read the schema written by `manage.py generate_schema` once per
+    worker, falling back to generating it when the file is missing.
+    Returns the plain and gzipped content with its ETag.
+    """
+    try:
+        content = Path(settings.OPENAPI_SCHEMA_FILE).read_bytes()
+    except FileNotFoundError:
+        content = generate_schema()
+
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    return content, gzip.compress(content, mtime=0), etag
+
+
+@require_safe
+def schema_view(request):
+    content, compressed, etag = load_schema()
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    elif "gzip" in request.headers.get("Accept-Encoding", ""):
+        response = HttpResponse(compressed, content_type=SCHEMA_CONTENT_TYPE)
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(content, content_type=SCHEMA_CONTENT_TYPE)
+
+    response["ETag"] = etag
+    patch_cache_control(response, no_cache=True)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -20,6 +20,14 @@ from dotenv import load_dotenv
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv()
 
+
+def env_flag(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
@@ -29,9 +37,18 @@ SECRET_KEY = os.getenv(
 )
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_flag("DEBUG", True)
 
-ALLOWED_HOSTS = []
+# Optional parts of the project. Disabled parts are neither installed nor
+# imported, which keeps worker start-up fast (see `manage.py startup_profile`)
+ENABLE_ADMIN = env_flag("ENABLE_ADMIN", True)
+ENABLE_API_DOCS = env_flag("ENABLE_API_DOCS", True)
+ENABLE_DEBUG_TOOLBAR = env_flag("ENABLE_DEBUG_TOOLBAR", DEBUG)
+ENABLE_BROWSABLE_API = env_flag("ENABLE_BROWSABLE_API", DEBUG)
+
+ALLOWED_HOSTS = [
+    host for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host
+]
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -40,25 +57,24 @@ INTERNAL_IPS = [
 # Application definition
 
 INSTALLED_APPS = [
-    "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
-    "debug_toolbar",
     "airport",
     "user",
+    "analytics",
+    "tasks",
     "rest_framework.authtoken",
-    "drf_spectacular",
 ]
 
 AUTH_USER_MODEL = "user.User"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -67,6 +83,16 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if ENABLE_ADMIN:
+    INSTALLED_APPS.insert(0, "django.contrib.admin")
+
+if ENABLE_API_DOCS:
+    INSTALLED_APPS.append("drf_spectacular")
+
+if ENABLE_DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(1, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "airport_api.urls"
 
 TEMPLATES = [
@@ -91,6 +117,17 @@ WSGI_APPLICATION = "airport_api.wsgi.application"
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
 
+# Queries run POSTGRES_PREPARE_THRESHOLD times on a connection are
+# prepared server-side, so PostgreSQL parses and plans the hottest query
+# shapes once per connection, and connections are kept between requests
+# to reuse them. Behind a transaction-pooling proxy such as PgBouncer,
+# consecutive transactions may run on different server connections, so
+# POSTGRES_TRANSACTION_POOLING turns off everything that outlives a
+# transaction: prepared statements, server-side cursors of
+# QuerySet.iterator() and persistent connections.
+POSTGRES_TRANSACTION_POOLING = env_flag("POSTGRES_TRANSACTION_POOLING", False)
+POSTGRES_PREPARE_THRESHOLD = 5
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -99,8 +136,37 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        "CONN_MAX_AGE": 0 if POSTGRES_TRANSACTION_POOLING else 60,
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": POSTGRES_TRANSACTION_POOLING,
+        "OPTIONS": {
+            "server_side_binding": True,
+            "prepare_threshold": (
+                None if POSTGRES_TRANSACTION_POOLING
+                else POSTGRES_PREPARE_THRESHOLD
+            ),
+        },
     }
 }
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Throttling counters must be shared by every worker, so production
+# deployments point REDIS_URL at a shared Redis instance.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -145,24 +211,144 @@ MEDIA_URL = "/media/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+    ] + (
+        ["rest_framework.renderers.BrowsableAPIRenderer"]
+        if ENABLE_BROWSABLE_API else []
+    ),
     "DEFAULT_PERMISSION_CLASSES": [
         "airport_api.permissions.IsAdminOrIsAuthenticatedReadOnly"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle"
+        "airport_api.throttling.AnonRateThrottle",
+        "airport_api.throttling.UserRateThrottle",
+        "airport_api.throttling.ScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
-        "user": "1000/hour"
+        "user": "1000/hour",
+        "order_create": "60/hour",
+        "flight_search": "600/hour",
     },
     "DEFAULT_PAGINATION_CLASS": "airport_api.pagination.Pagination",
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # extend_schema loads the schema class when views are imported
+    "DEFAULT_SCHEMA_CLASS": (
+        "drf_spectacular.openapi.AutoSchema" if ENABLE_API_DOCS
+        else "rest_framework.schemas.openapi.AutoSchema"
+    ),
 }
 
+# Minimum time between the arrival of a crewmate's flight and their next
+# departure
+CREW_MIN_REST = timedelta(hours=10)
+
+# How often workers check whether their airport autocomplete index is stale
+AUTOCOMPLETE_VERSION_CHECK_INTERVAL = 1
+
+# How often workers check whether their nearby-airport KD-tree is stale
+AIRPORT_GEO_VERSION_CHECK_INTERVAL = 1
+
+# Maximum number of sub-requests accepted by /api/batch/
+BATCH_MAX_REQUESTS = 50
+
+# Idempotency-Key support on order creation: how long responses are
+# replayed, how long a key stays claimed by a request that is still
+# running, and how long (and how often) duplicates wait for it
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+IDEMPOTENCY_WAIT_TIMEOUT = 10
+IDEMPOTENCY_POLL_INTERVAL = 0.05
+
+# Background tasks, see `manage.py run_worker`. Failed tasks are retried
+# after TASKS_RETRY_BACKOFF seconds, doubled on every further attempt, and
+# tasks whose worker stopped renewing their lease for TASKS_LEASE_TIMEOUT
+# are taken over by another worker. Running tasks renew it every
+# TASKS_HEARTBEAT_INTERVAL, so it only expires when their worker died.
+TASKS_WORKER_CONCURRENCY = 4
+TASKS_POLL_INTERVAL = 1
+TASKS_MAX_ATTEMPTS = 3
+TASKS_RETRY_BACKOFF = 10
+TASKS_RETRY_BACKOFF_MAX = 60 * 60
+TASKS_LEASE_TIMEOUT = timedelta(minutes=30)
+TASKS_HEARTBEAT_INTERVAL = timedelta(minutes=5)
+
+# Live seat streams at /api/airport/flights/<id>/live/: seconds before a
+# stream ends and the client reconnects, between keep-alive comments, and
+# to wait for the notification listener when the first watcher connects
+LIVE_SEATS_STREAM_TIMEOUT = 5 * 60
+LIVE_SEATS_KEEPALIVE_INTERVAL = 15
+LIVE_SEATS_CONNECT_TIMEOUT = 5
+LIVE_SEATS_RETRY_MS = 3000
+
+# Unfiltered admin changelists of tables estimated to hold at least this
+# many rows show the estimate instead of counting them
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100_000
+
+# `manage.py archive_flights` moves flights arrived more than
+# ARCHIVE_FLIGHTS_AFTER ago, and their orders, to the archive tables,
+# ARCHIVE_BATCH_SIZE rows per transaction
+ARCHIVE_FLIGHTS_AFTER = timedelta(days=90)
+ARCHIVE_BATCH_SIZE = 1000
+
+# Departure and arrival boards at /api/airport/airports/<id>/departures/
+# and /arrivals/ list FLIGHT_BOARD_SIZE flights, including those that left
+# or landed within FLIGHT_BOARD_RECENT. Each worker keeps the flights of
+# the next FLIGHT_BOARD_WINDOW in memory, applies the changes announced
+# through the cache every FLIGHT_BOARD_CHECK_INTERVAL seconds and rebuilds
+# them every FLIGHT_BOARD_REBUILD_INTERVAL, or after more than
+# FLIGHT_BOARD_MAX_CHANGES changes. Disabled, boards are read from the
+# database.
+FLIGHT_BOARD_IN_MEMORY = env_flag("FLIGHT_BOARD_IN_MEMORY", True)
+FLIGHT_BOARD_SIZE = 20
+FLIGHT_BOARD_MAX_SIZE = 100
+FLIGHT_BOARD_RECENT = timedelta(minutes=30)
+FLIGHT_BOARD_WINDOW = timedelta(hours=24)
+FLIGHT_BOARD_CHECK_INTERVAL = 1
+FLIGHT_BOARD_REBUILD_INTERVAL = timedelta(hours=1)
+FLIGHT_BOARD_MAX_CHANGES = 1000
+FLIGHT_BOARD_CHANGE_TTL = 10 * 60
+
+# Change feed at /api/airport/changes/: changes per page by default and
+# at most, how many changes each read numbers at once, and how long
+# `manage.py archive_flights` keeps them
+CHANGE_FEED_PAGE_SIZE = 500
+CHANGE_FEED_MAX_PAGE_SIZE = 5000
+CHANGE_FEED_SEQUENCE_BATCH = 10_000
+CHANGE_FEED_RETENTION = timedelta(days=30)
+
+# Flight search responses are shared by all users: how long they are
+# cached, how long the first of a burst of identical misses may take to
+# compute the response, and how long (and how often) the others wait for it
+FLIGHT_SEARCH_CACHE_TTL = 5 * 60
+FLIGHT_SEARCH_LOCK_TIMEOUT = 30
+FLIGHT_SEARCH_WAIT_TIMEOUT = 5
+FLIGHT_SEARCH_POLL_INTERVAL = 0.02
+
+# Automatic seat assignment in orders: most seats per request, and how
+# many times the blocks of free seats next to each other are read for a
+# request of seats together while concurrent orders hold all of them
+SEAT_ASSIGNMENT_MAX_SEATS = 9
+SEAT_ASSIGNMENT_ATTEMPTS = 3
+
+# Most flights whose blocks of free seats next to each other are found in
+# one request, as many as on the largest page of search results
+ADJACENT_SEATS_MAX_FLIGHTS = 100
+
+# Binary schedule snapshot written by `manage.py build_schedule_snapshot`
+# and served at /api/airport/schedule-snapshot/, and how many flights
+# its server-side cursor fetches at a time
+SCHEDULE_SNAPSHOT_FILE = Path(
+    os.getenv("SCHEDULE_SNAPSHOT_FILE", "/files/snapshots/schedule.snap")
+)
+SCHEDULE_SNAPSHOT_CHUNK_SIZE = 2000
+
+# Pre-generated schema served at /api/doc/, see `manage.py generate_schema`
+OPENAPI_SCHEMA_FILE = BASE_DIR / "openapi.yaml"
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport API",
     "DESCRIPTION": "Order flight tickets",
@@ -180,4 +366,8 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
 }
+
+# How long the user state checked by StatelessJWTAuthentication is cached
+JWT_USER_STATE_CACHE_TIMEOUT = 60
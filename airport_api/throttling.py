@@ -0,0 +1,101 @@
+from rest_framework import throttling
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """
+    Sliding-window counter throttle.
+
+    Instead of a list of request timestamps, every client has one integer
+    counter per fixed window, incremented atomically in the cache.
+    The request rate is estimated as the current window counter plus
+    the previous window counter weighted by the part of it that still
+    overlaps the sliding window, so each check costs a constant amount
+    of memory and a few cache round trips.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, position = divmod(self.now, self.duration)
+        self.elapsed = position / self.duration
+        current_key = f"{self.key}:{int(window)}"
+
+        # Counters outlive their window by one duration, so the next
+        # window can still read them as the previous one.
+        self.cache.add(current_key, 0, self.duration * 2)
+        self.current = self.cache.incr(current_key)
+        self.previous = self.cache.get(f"{self.key}:{int(window) - 1}", 0)
+
+        if self.estimate() > self.num_requests:
+            # Rejected requests do not count towards the limit
+            self.cache.decr(current_key)
+            self.current -= 1
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def estimate(self):
+        return self.previous * (1 - self.elapsed) + self.current
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until the estimated rate drops below the limit again"""
+        remaining_in_window = (1 - self.elapsed) * self.duration
+        if self.current >= self.num_requests or not self.previous:
+            return remaining_in_window
+
+        # Fraction of the window after which the weighted previous
+        # counter leaves room for one more request.
+        fraction = 1 - (self.num_requests - self.current - 1) / self.previous
+        return max(fraction - self.elapsed, 0) * self.duration
+
+
+class AnonRateThrottle(SlidingWindowRateThrottle, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SlidingWindowRateThrottle, throttling.UserRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(SlidingWindowRateThrottle):
+    """
+    Limits views with a `throttle_scope` attribute using the rate of
+    that scope. `throttle_scope` can be a dict mapping viewset actions
+    to scopes, so only expensive actions get a separate limit.
+    """
+
+    scope_attr = "throttle_scope"
+
+    def __init__(self):
+        # Rate is determined by the view in allow_request
+        pass
+
+    def allow_request(self, request, view):
+        scope = getattr(view, self.scope_attr, None)
+        if isinstance(scope, dict):
+            scope = scope.get(getattr(view, "action", None))
+
+        if not scope:
+            return True
+
+        self.scope = scope
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
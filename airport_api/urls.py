@@ -16,28 +16,48 @@ Including another URLconf
 """
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView
-)
+
+from airport_api.batch import BatchView
+from airport_api.lazy import lazy_view
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
-    path("__debug__/", include("debug_toolbar.urls")),
     path("api/airport/", include("airport.urls", namespace="airport")),
     path("api/user/", include("user.urls", namespace="user")),
-    path("api/doc/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/doc/swagger/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui"
-    ),
     path(
-        "api/doc/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
-        name="redoc"
+        "api/analytics/",
+        include("analytics.urls", namespace="analytics")
     ),
+    path("api/batch/", BatchView.as_view(), name="batch"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.ENABLE_ADMIN:
+    from django.contrib import admin
+
+    urlpatterns.append(path("admin/", admin.site.urls))
+
+if settings.ENABLE_DEBUG_TOOLBAR:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
+
+if settings.ENABLE_API_DOCS:
+    from airport_api.schema import schema_view
+
+    urlpatterns += [
+        path("api/doc/", schema_view, name="schema"),
+        path(
+            "api/doc/swagger/",
+            lazy_view(
+                "drf_spectacular.views.SpectacularSwaggerView",
+                url_name="schema",
+            ),
+            name="swagger-ui"
+        ),
+        path(
+            "api/doc/redoc/",
+            lazy_view(
+                "drf_spectacular.views.SpectacularRedocView",
+                url_name="schema",
+            ),
+            name="redoc"
+        ),
+    ]
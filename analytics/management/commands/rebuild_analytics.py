@@ -0,0 +1,29 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from analytics import occupancy
+from analytics.models import (
+    FlightOccupancy,
+    RouteDailyOccupancy,
+    AirplaneTypeMonthlyOccupancy,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the occupancy aggregates from live and archived "
+        "flights and tickets"
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            occupancy.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt occupancy of {FlightOccupancy.objects.count()} "
+                f"flights, {RouteDailyOccupancy.objects.count()} route days "
+                f"and {AirplaneTypeMonthlyOccupancy.objects.count()} "
+                f"airplane type months"
+            )
+        )
@@ -0,0 +1,117 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("airport", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightOccupancy",
+            fields=[
+                ("capacity", models.IntegerField(default=0)),
+                ("tickets_sold", models.IntegerField(default=0)),
+                (
+                    "flight",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="occupancy",
+                        serialize=False,
+                        to="airport.flight",
+                    ),
+                ),
+                ("departure_date", models.DateField()),
+                (
+                    "airplane_type",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="airport.airplanetype",
+                    ),
+                ),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="airport.route",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "flight occupancies",
+                "ordering": ["departure_date", "flight"],
+            },
+        ),
+        migrations.CreateModel(
+            name="AirplaneTypeMonthlyOccupancy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("capacity", models.IntegerField(default=0)),
+                ("tickets_sold", models.IntegerField(default=0)),
+                ("month", models.DateField(help_text="First day of the month")),
+                ("flights", models.IntegerField(default=0)),
+                (
+                    "airplane_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_occupancy",
+                        to="airport.airplanetype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "airplane type monthly occupancies",
+                "ordering": ["month", "airplane_type"],
+                "unique_together": {("airplane_type", "month")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RouteDailyOccupancy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("capacity", models.IntegerField(default=0)),
+                ("tickets_sold", models.IntegerField(default=0)),
+                ("date", models.DateField()),
+                ("flights", models.IntegerField(default=0)),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_occupancy",
+                        to="airport.route",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "route daily occupancies",
+                "ordering": ["date", "route"],
+                "unique_together": {("route", "date")},
+            },
+        ),
+    ]
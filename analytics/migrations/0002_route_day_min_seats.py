@@ -0,0 +1,43 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:44
+
+from django.db import migrations, models
+from django.db.models import F, Min, OuterRef, Subquery
+
+
+def fill_min_seats(apps, schema_editor):
+    FlightOccupancy = apps.get_model("analytics", "FlightOccupancy")
+    RouteDailyOccupancy = apps.get_model("analytics", "RouteDailyOccupancy")
+    RouteDailyOccupancy.objects.update(
+        min_seats_remaining=Subquery(
+            FlightOccupancy.objects.filter(
+                route_id=OuterRef("route_id"),
+                departure_date=OuterRef("date"),
+            )
+            .values("route_id")
+            .annotate(seats=Min(F("capacity") - F("tickets_sold")))
+            .values("seats")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="routedailyoccupancy",
+            name="min_seats_remaining",
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name="flightoccupancy",
+            index=models.Index(
+                fields=["route", "departure_date"],
+                name="flight_occupancy_route_day_idx",
+            ),
+        ),
+        migrations.RunPython(fill_min_seats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+from django.db import models
+
+from airport.models import AirplaneType, Flight, Route
+
+
+class OccupancyMixin(models.Model):
+    capacity = models.IntegerField(default=0)
+    tickets_sold = models.IntegerField(default=0)
+
+    @property
+    def load_factor(self):
+        if not self.capacity:
+            return 0
+        return self.tickets_sold / self.capacity
+
+    class Meta:
+        abstract = True
+
+
+class FlightOccupancy(OccupancyMixin):
+    """
+    Seats sold on a flight. Also remembers the route, day and airplane
+    type the flight was counted in, so the coarser aggregates can be
+    corrected when the flight changes.
+    """
+
+    flight = models.OneToOneField(
+        Flight,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="occupancy",
+    )
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="+"
+    )
+    departure_date = models.DateField()
+    airplane_type = models.ForeignKey(
+        AirplaneType, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+
+    class Meta:
+        ordering = ["departure_date", "flight"]
+        verbose_name_plural = "flight occupancies"
+        indexes = [
+            models.Index(
+                fields=["route", "departure_date"],
+                name="flight_occupancy_route_day_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.flight}: {self.tickets_sold}/{self.capacity}"
+
+
+class RouteDailyOccupancy(OccupancyMixin):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="daily_occupancy"
+    )
+    date = models.DateField()
+    flights = models.IntegerField(default=0)
+    # Fewest seats left on one of the day's flights, for the calendar
+    min_seats_remaining = models.IntegerField(null=True)
+
+    class Meta:
+        unique_together = ("route", "date")
+        ordering = ["date", "route"]
+        verbose_name_plural = "route daily occupancies"
+
+    def __str__(self):
+        return f"{self.route} {self.date}: {self.tickets_sold}/{self.capacity}"
+
+
+class AirplaneTypeMonthlyOccupancy(OccupancyMixin):
+    airplane_type = models.ForeignKey(
+        AirplaneType,
+        on_delete=models.CASCADE,
+        related_name="monthly_occupancy",
+    )
+    month = models.DateField(help_text="First day of the month")
+    flights = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("airplane_type", "month")
+        ordering = ["month", "airplane_type"]
+        verbose_name_plural = "airplane type monthly occupancies"
+
+    def __str__(self):
+        return (
+            f"{self.airplane_type} {self.month:%Y-%m}: "
+            f"{self.tickets_sold}/{self.capacity}"
+        )
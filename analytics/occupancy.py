@@ -0,0 +1,248 @@
+from django.db.models import Count, F, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+
+from airport.models import ArchivedFlight, ArchivedTicket, Flight, Ticket
+from analytics.models import (
+    FlightOccupancy,
+    RouteDailyOccupancy,
+    AirplaneTypeMonthlyOccupancy,
+)
+
+FLIGHT_FIELDS = ("route_id", "departure_date", "airplane_type_id", "capacity")
+
+
+def flight_occupancy_values(queryset, *fields):
+    return queryset.values(
+        "route_id",
+        *fields,
+        departure_date=TruncDate("departure_time"),
+        airplane_type_id=F("airplane__airplane_type_id"),
+        capacity=F("airplane__rows") * F("airplane__seats_in_row"),
+    )
+
+
+def increment(model, keys, **deltas):
+    """
+    Atomically add deltas to the aggregate row identified by keys.
+    Missing rows are only created for non-negative deltas, since
+    removals may run while the related rows are being deleted.
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**keys).update(**updates):
+        return
+    if any(delta < 0 for delta in deltas.values()):
+        return
+    model.objects.get_or_create(**keys)
+    model.objects.filter(**keys).update(**updates)
+
+
+def update_aggregates(occupancy, **deltas):
+    """Apply deltas to the route/day and airplane type/month aggregates"""
+    increment(
+        RouteDailyOccupancy,
+        {"route_id": occupancy.route_id, "date": occupancy.departure_date},
+        **deltas,
+    )
+    if occupancy.airplane_type_id:
+        increment(
+            AirplaneTypeMonthlyOccupancy,
+            {
+                "airplane_type_id": occupancy.airplane_type_id,
+                "month": occupancy.departure_date.replace(day=1),
+            },
+            **deltas,
+        )
+
+
+def refresh_min_seats(route_id, date):
+    """Recompute the fewest seats left on a flight of the route that day"""
+    RouteDailyOccupancy.objects.filter(route_id=route_id, date=date).update(
+        min_seats_remaining=Subquery(
+            FlightOccupancy.objects.filter(
+                route_id=route_id, departure_date=date
+            )
+            .values("route_id")
+            .annotate(seats=Min(F("capacity") - F("tickets_sold")))
+            .values("seats")
+        )
+    )
+
+
+def flight_contribution(occupancy, sign=1):
+    return {
+        "flights": sign,
+        "capacity": sign * occupancy.capacity,
+        "tickets_sold": sign * occupancy.tickets_sold,
+    }
+
+
+def sync_flight(flight_id):
+    """Create or move the occupancy of a created or changed flight"""
+    values = flight_occupancy_values(
+        Flight.objects.filter(pk=flight_id)
+    ).first()
+    occupancy = FlightOccupancy.objects.filter(flight_id=flight_id).first()
+
+    if occupancy is None:
+        occupancy = FlightOccupancy.objects.create(
+            flight_id=flight_id,
+            tickets_sold=Ticket.objects.filter(flight_id=flight_id).count(),
+            **values,
+        )
+        update_aggregates(occupancy, **flight_contribution(occupancy))
+        refresh_min_seats(occupancy.route_id, occupancy.departure_date)
+        return
+
+    if all(getattr(occupancy, key) == values[key] for key in FLIGHT_FIELDS):
+        return
+
+    update_aggregates(occupancy, **flight_contribution(occupancy, sign=-1))
+    old_day = (occupancy.route_id, occupancy.departure_date)
+    for key in FLIGHT_FIELDS:
+        setattr(occupancy, key, values[key])
+    occupancy.save(update_fields=FLIGHT_FIELDS)
+    update_aggregates(occupancy, **flight_contribution(occupancy))
+    refresh_min_seats(*old_day)
+    refresh_min_seats(occupancy.route_id, occupancy.departure_date)
+
+
+def remove_flight(flight_id):
+    occupancy = FlightOccupancy.objects.filter(flight_id=flight_id).first()
+    if occupancy is not None:
+        update_aggregates(
+            occupancy, **flight_contribution(occupancy, sign=-1)
+        )
+        occupancy.delete()
+        refresh_min_seats(occupancy.route_id, occupancy.departure_date)
+
+
+def add_tickets(flight_id, count):
+    occupancy = FlightOccupancy.objects.filter(flight_id=flight_id).first()
+    if occupancy is None:
+        # Flights removed in the same cascade have no occupancy left
+        if count > 0:
+            sync_flight(flight_id)
+        return
+
+    FlightOccupancy.objects.filter(pk=flight_id).update(
+        tickets_sold=F("tickets_sold") + count
+    )
+    update_aggregates(occupancy, tickets_sold=count)
+    refresh_min_seats(occupancy.route_id, occupancy.departure_date)
+
+
+def archived_tickets(flight):
+    """Number of archived tickets of the flight referenced by `flight`"""
+    return Coalesce(
+        Subquery(
+            ArchivedTicket.objects.filter(flight_id=flight)
+            .order_by()
+            .values("flight_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def add_archived_flight(totals, keys, values, min_seats=False):
+    """Count an archived flight in the aggregate row identified by keys"""
+    row = totals.setdefault(
+        keys, {"flights": 0, "capacity": 0, "tickets_sold": 0}
+    )
+    row["flights"] += 1
+    row["capacity"] += values["capacity"]
+    row["tickets_sold"] += values["tickets_sold"]
+    if min_seats:
+        seats = values["capacity"] - values["tickets_sold"]
+        row["min_seats_remaining"] = min(
+            row.get("min_seats_remaining", seats), seats
+        )
+
+
+def rebuild():
+    """
+    Recompute every aggregate from the flights and tickets tables.
+    Archived flights keep counting in the route and airplane type
+    aggregates, as they do when `archive_flights` moves them, and
+    archived tickets in the flights they were sold for.
+    """
+    FlightOccupancy.objects.all().delete()
+    RouteDailyOccupancy.objects.all().delete()
+    AirplaneTypeMonthlyOccupancy.objects.all().delete()
+
+    # Orders are archived before their flights, so live flights may
+    # have archived tickets too
+    flights = flight_occupancy_values(
+        Flight.objects.annotate(
+            tickets_sold=Count("tickets") + archived_tickets(OuterRef("pk"))
+        ).order_by(),
+        "id",
+        "tickets_sold",
+    )
+    FlightOccupancy.objects.bulk_create(
+        (
+            FlightOccupancy(flight_id=values.pop("id"), **values)
+            for values in flights.iterator()
+        ),
+        batch_size=1000,
+    )
+
+    totals = {
+        "flights": Count("flight"),
+        "capacity": Sum("capacity"),
+        "tickets_sold": Sum("tickets_sold"),
+    }
+    route_days = {
+        (values.pop("route_id"), values.pop("date")): values
+        for values in FlightOccupancy.objects.values(
+            "route_id", date=F("departure_date")
+        ).annotate(
+            # Before `totals`, whose names would shadow the columns
+            min_seats_remaining=Min(F("capacity") - F("tickets_sold")),
+            **totals,
+        ).order_by()
+    }
+    type_months = {
+        (values.pop("airplane_type_id"), values.pop("month")): values
+        for values in FlightOccupancy.objects.filter(
+            airplane_type__isnull=False
+        ).values(
+            "airplane_type_id", month=TruncMonth("departure_date")
+        ).annotate(**totals).order_by()
+    }
+
+    archived_flights = flight_occupancy_values(
+        ArchivedFlight.objects.annotate(
+            tickets_sold=archived_tickets(OuterRef("pk"))
+        ).order_by(),
+        "tickets_sold",
+    )
+    for values in archived_flights.iterator():
+        date = values["departure_date"]
+        add_archived_flight(
+            route_days, (values["route_id"], date), values, min_seats=True
+        )
+        if values["airplane_type_id"]:
+            add_archived_flight(
+                type_months,
+                (values["airplane_type_id"], date.replace(day=1)),
+                values,
+            )
+
+    RouteDailyOccupancy.objects.bulk_create(
+        (
+            RouteDailyOccupancy(route_id=route_id, date=date, **values)
+            for (route_id, date), values in route_days.items()
+        ),
+        batch_size=1000,
+    )
+    AirplaneTypeMonthlyOccupancy.objects.bulk_create(
+        (
+            AirplaneTypeMonthlyOccupancy(
+                airplane_type_id=airplane_type_id, month=month, **values
+            )
+            for (airplane_type_id, month), values in type_months.items()
+        ),
+        batch_size=1000,
+    )
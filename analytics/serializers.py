@@ -0,0 +1,60 @@
+from rest_framework import serializers
+
+from analytics.models import (
+    FlightOccupancy,
+    RouteDailyOccupancy,
+    AirplaneTypeMonthlyOccupancy,
+)
+
+
+class FlightOccupancySerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = FlightOccupancy
+        fields = [
+            "flight",
+            "route",
+            "departure_date",
+            "airplane_type",
+            "capacity",
+            "tickets_sold",
+            "load_factor",
+        ]
+
+
+class RouteDailyOccupancySerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RouteDailyOccupancy
+        fields = [
+            "route",
+            "date",
+            "flights",
+            "capacity",
+            "tickets_sold",
+            "load_factor",
+        ]
+
+
+class AirplaneTypeMonthlyOccupancySerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+    month = serializers.DateField(format="%Y-%m")
+
+    class Meta:
+        model = AirplaneTypeMonthlyOccupancy
+        fields = [
+            "airplane_type",
+            "month",
+            "flights",
+            "capacity",
+            "tickets_sold",
+            "load_factor",
+        ]
+
+
+class RouteCalendarDaySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RouteDailyOccupancy
+        fields = ["date", "flights", "min_seats_remaining"]
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from airport.archive import flights_archived
+from airport.disruption import flights_rescheduled
+from airport.seating import tickets_assigned
+from airport.models import Airplane, Flight, Ticket
+from analytics import occupancy
+from analytics.models import FlightOccupancy
+
+
+@receiver(post_save, sender=Flight)
+def flight_saved(sender, instance, **kwargs):
+    occupancy.sync_flight(instance.pk)
+
+
+@receiver(post_save, sender=Airplane)
+def airplane_saved(sender, instance, created, **kwargs):
+    # Capacity and airplane type are copied to the occupancy of its flights
+    if not created:
+        for flight_id in instance.flights.values_list("id", flat=True):
+            occupancy.sync_flight(flight_id)
+
+
+@receiver(pre_delete, sender=Flight)
+def flight_deleted(sender, instance, **kwargs):
+    # Runs before the cascade, so the flight's tickets are removed from
+    # the aggregates together with its capacity.
+    occupancy.remove_flight(instance.pk)
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, **kwargs):
+    if created:
+        occupancy.add_tickets(instance.flight_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    occupancy.add_tickets(instance.flight_id, -1)
+
+
+@receiver(tickets_assigned)
+def tickets_assigned_in_bulk(sender, flight_id, seats, **kwargs):
+    occupancy.add_tickets(flight_id, len(seats))
+
+
+@receiver(flights_archived)
+def flights_moved_to_archive(sender, flight_ids, **kwargs):
+    # Route and airplane type aggregates keep counting archived flights
+    FlightOccupancy.objects.filter(flight_id__in=flight_ids).delete()
+
+
+@receiver(flights_rescheduled)
+def flights_updated_in_bulk(sender, flight_ids, **kwargs):
+    for flight_id in flight_ids:
+        occupancy.sync_flight(flight_id)
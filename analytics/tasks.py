@@ -0,0 +1,10 @@
+from django.db import transaction
+
+from analytics import occupancy
+from tasks.queue import task
+
+
+@task
+def rebuild_occupancy():
+    with transaction.atomic():
+        occupancy.rebuild()
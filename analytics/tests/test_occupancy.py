@@ -0,0 +1,175 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.test_airplane_api import (
+    sample_airplane,
+    sample_airplane_type,
+)
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_source,
+    sample_destination,
+    sample_route,
+)
+from analytics.models import (
+    FlightOccupancy,
+    RouteDailyOccupancy,
+    AirplaneTypeMonthlyOccupancy,
+)
+
+ROUTE_OCCUPANCY_URL = reverse("analytics:routedailyoccupancy-list")
+
+
+def snapshot():
+    return [
+        list(model.objects.values_list(
+            "capacity", "tickets_sold", *extra
+        ).order_by(*extra))
+        for model, extra in (
+            (FlightOccupancy, ("flight",)),
+            (
+                RouteDailyOccupancy,
+                ("route", "date", "flights", "min_seats_remaining"),
+            ),
+            (AirplaneTypeMonthlyOccupancy, ("month", "flights")),
+        )
+    ]
+
+
+class OccupancyMaintenanceTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        self.airplane = sample_airplane(
+            rows=2, seats_in_row=5, airplane_type=sample_airplane_type()
+        )
+        self.flight_1 = sample_flight(route=self.route, airplane=self.airplane)
+        self.flight_2 = sample_flight(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time="2024-11-11 18:00:00",
+            arrival_time="2024-11-11 19:00:00",
+        )
+        self.order = Order.objects.create(user=self.user)
+
+    def sell(self, flight, *seats):
+        return [
+            Ticket.objects.create(
+                row=1, seat=seat, flight=flight, order=self.order
+            )
+            for seat in seats
+        ]
+
+    def test_flight_creation_adds_capacity(self):
+        route_day = RouteDailyOccupancy.objects.get()
+
+        self.assertEqual(route_day.date, date(2024, 11, 11))
+        self.assertEqual(route_day.flights, 2)
+        self.assertEqual(route_day.capacity, 20)
+        self.assertEqual(
+            AirplaneTypeMonthlyOccupancy.objects.get().month,
+            date(2024, 11, 1),
+        )
+
+    def test_ticket_creation_and_deletion_counted(self):
+        tickets = self.sell(self.flight_1, 1, 2, 3)
+        tickets[0].delete()
+
+        self.assertEqual(self.flight_1.occupancy.tickets_sold, 2)
+        self.assertEqual(self.flight_1.occupancy.load_factor, 0.2)
+        self.assertEqual(RouteDailyOccupancy.objects.get().tickets_sold, 2)
+        self.assertEqual(
+            AirplaneTypeMonthlyOccupancy.objects.get().tickets_sold, 2
+        )
+
+    def test_moved_flight_moves_aggregates(self):
+        self.sell(self.flight_1, 1, 2)
+        self.flight_1.departure_time = "2024-12-01 10:00:00"
+        self.flight_1.arrival_time = "2024-12-01 11:00:00"
+        self.flight_1.save()
+
+        november, december = RouteDailyOccupancy.objects.all()
+        self.assertEqual((november.flights, november.tickets_sold), (1, 0))
+        self.assertEqual((december.flights, december.tickets_sold), (1, 2))
+        self.assertEqual(AirplaneTypeMonthlyOccupancy.objects.count(), 2)
+
+    def test_deleted_flight_removed_with_tickets(self):
+        self.sell(self.flight_1, 1, 2)
+        self.sell(self.flight_2, 1)
+        self.flight_1.delete()
+
+        route_day = RouteDailyOccupancy.objects.get()
+        self.assertEqual(route_day.flights, 1)
+        self.assertEqual(route_day.capacity, 10)
+        self.assertEqual(route_day.tickets_sold, 1)
+
+    def test_airplane_layout_change_updates_capacity(self):
+        self.sell(self.flight_1, 1, 2)
+        self.airplane.rows = 3
+        self.airplane.save()
+
+        self.assertEqual(
+            FlightOccupancy.objects.get(flight=self.flight_1).capacity, 15
+        )
+        route_day = RouteDailyOccupancy.objects.get()
+        self.assertEqual(route_day.capacity, 30)
+        self.assertEqual(route_day.min_seats_remaining, 13)
+        expected = snapshot()
+
+        call_command("rebuild_analytics", stdout=StringIO())
+
+        self.assertEqual(snapshot(), expected)
+
+    def test_rebuild_matches_incremental_aggregates(self):
+        self.sell(self.flight_1, 1, 2, 3)
+        self.sell(self.flight_2, 4)
+        expected = snapshot()
+
+        call_command("rebuild_analytics", stdout=StringIO())
+
+        self.assertEqual(snapshot(), expected)
+
+
+class OccupancyApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.route = sample_route(
+            source=sample_source(), destination=sample_destination()
+        )
+        sample_flight(route=self.route, airplane=sample_airplane())
+
+    def test_staff_required(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(ROUTE_OCCUPANCY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_route_occupancy_filtered_by_date(self):
+        admin = get_user_model().objects.create_user(
+            email="admin@admin.admin", password="Test1234!", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(ROUTE_OCCUPANCY_URL, {"from": "2024-11-11"})
+        empty_res = self.client.get(ROUTE_OCCUPANCY_URL, {"to": "2024-11-10"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["route"], self.route.id)
+        self.assertEqual(res.data["results"][0]["capacity"], 630)
+        self.assertEqual(empty_res.data["count"], 0)
@@ -0,0 +1,19 @@
+from django.urls import path, include
+from rest_framework import routers
+
+from analytics.views import (
+    FlightOccupancyViewSet,
+    RouteDailyOccupancyViewSet,
+    AirplaneTypeMonthlyOccupancyViewSet,
+)
+
+router = routers.DefaultRouter()
+router.register("flights", FlightOccupancyViewSet)
+router.register("routes", RouteDailyOccupancyViewSet)
+router.register("airplane-types", AirplaneTypeMonthlyOccupancyViewSet)
+
+urlpatterns = [
+    path("", include(router.urls))
+]
+
+app_name = "analytics"
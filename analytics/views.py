@@ -0,0 +1,126 @@
+from datetime import datetime
+
+from drf_spectacular.utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter
+)
+from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
+
+from airport.views import _params_to_ints
+from analytics.models import (
+    FlightOccupancy,
+    RouteDailyOccupancy,
+    AirplaneTypeMonthlyOccupancy,
+)
+from analytics.serializers import (
+    FlightOccupancySerializer,
+    RouteDailyOccupancySerializer,
+    AirplaneTypeMonthlyOccupancySerializer,
+)
+
+DATE_RANGE_PARAMETERS = [
+    OpenApiParameter(
+        name="from",
+        type=str,
+        description="Include dates from YYYY-MM-DD (e.g., ?from=2024-10-01)",
+    ),
+    OpenApiParameter(
+        name="to",
+        type=str,
+        description="Include dates up to YYYY-MM-DD (e.g., ?to=2024-10-31)",
+    ),
+]
+
+
+class OccupancyViewSet(viewsets.ReadOnlyModelViewSet):
+    """Staff-only occupancy aggregates, filtered by ids and date range"""
+
+    permission_classes = [IsAdminUser]
+    ids_param = None
+    ids_field = None
+    date_field = None
+
+    def get_queryset(self):
+        ids = self.request.query_params.get(self.ids_param)
+        date_from = self.request.query_params.get("from")
+        date_to = self.request.query_params.get("to")
+
+        queryset = self.queryset
+
+        if ids:
+            queryset = queryset.filter(
+                **{f"{self.ids_field}__in": _params_to_ints(ids)}
+            )
+
+        if date_from:
+            date = datetime.strptime(date_from, "%Y-%m-%d").date()
+            queryset = queryset.filter(**{f"{self.date_field}__gte": date})
+
+        if date_to:
+            date = datetime.strptime(date_to, "%Y-%m-%d").date()
+            queryset = queryset.filter(**{f"{self.date_field}__lte": date})
+
+        return queryset
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="routes",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by route IDs (e.g., ?routes=1,3)",
+            ),
+            *DATE_RANGE_PARAMETERS,
+        ]
+    )
+)
+class FlightOccupancyViewSet(OccupancyViewSet):
+    queryset = FlightOccupancy.objects.all()
+    serializer_class = FlightOccupancySerializer
+    ids_param = "routes"
+    ids_field = "route_id"
+    date_field = "departure_date"
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="routes",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by route IDs (e.g., ?routes=1,3)",
+            ),
+            *DATE_RANGE_PARAMETERS,
+        ]
+    )
+)
+class RouteDailyOccupancyViewSet(OccupancyViewSet):
+    queryset = RouteDailyOccupancy.objects.all()
+    serializer_class = RouteDailyOccupancySerializer
+    ids_param = "routes"
+    ids_field = "route_id"
+    date_field = "date"
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="airplane-types",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by airplane type IDs "
+                            "(e.g., ?airplane-types=1,3)",
+            ),
+            *DATE_RANGE_PARAMETERS,
+        ]
+    )
+)
+class AirplaneTypeMonthlyOccupancyViewSet(OccupancyViewSet):
+    queryset = AirplaneTypeMonthlyOccupancy.objects.all()
+    serializer_class = AirplaneTypeMonthlyOccupancySerializer
+    ids_param = "airplane-types"
+    ids_field = "airplane_type_id"
+    date_field = "month"
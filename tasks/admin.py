@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from tasks.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "status",
+        "attempts",
+        "run_after",
+        "started_at",
+        "duration",
+    )
+    list_filter = ("status", "name")
+    readonly_fields = ("created_at", "started_at", "finished_at", "duration")
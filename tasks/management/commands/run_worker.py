@@ -0,0 +1,134 @@
+import multiprocessing
+import signal
+import threading
+from collections import defaultdict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import django
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from tasks import queue
+
+
+def run_task(task_id):
+    """Pool entry point, handles the connections like a request would"""
+    close_old_connections()
+    try:
+        task = queue.execute(task_id)
+        return task.name, task.status, task.duration.total_seconds()
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued tasks in a pool of threads or processes until stopped "
+        "with SIGINT/SIGTERM"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default="thread",
+            help="Process pools suit CPU-bound tasks",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.TASKS_WORKER_CONCURRENCY,
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.TASKS_POLL_INTERVAL,
+            help="Seconds to wait before polling an empty queue again",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no task is due instead of waiting for more",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        handlers = {
+            signum: signal.signal(signum, self.stop)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.work(options)
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def work(self, options):
+        concurrency = options["concurrency"]
+        if options["pool"] == "process":
+            # Forked children would share the parent's database sockets
+            executor = ProcessPoolExecutor(
+                concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        else:
+            executor = ThreadPoolExecutor(
+                concurrency, thread_name_prefix="task"
+            )
+
+        self.stats = defaultdict(lambda: [0, 0.0, 0.0])
+        running = set()
+        with executor:
+            while not self.stopping.is_set():
+                claimed = []
+                if len(running) < concurrency:
+                    claimed = queue.claim(concurrency - len(running))
+                    running.update(
+                        executor.submit(run_task, task_id)
+                        for task_id in claimed
+                    )
+                if not running:
+                    if options["burst"]:
+                        break
+                    self.stopping.wait(options["poll_interval"])
+                    continue
+                done, running = wait(
+                    running,
+                    timeout=0 if claimed else options["poll_interval"],
+                    return_when=FIRST_COMPLETED,
+                )
+                self.collect(done)
+            self.collect(wait(running).done)
+
+        close_old_connections()
+        self.report()
+
+    def stop(self, signum, frame):
+        self.stdout.write("Finishing running tasks...")
+        self.stopping.set()
+
+    def collect(self, futures):
+        for future in futures:
+            name, status, seconds = future.result()
+            self.stdout.write(f"{name} {status} in {seconds * 1000:.1f} ms")
+            stats = self.stats[name, status]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def report(self):
+        for (name, status), (count, total, worst) in sorted(
+            self.stats.items()
+        ):
+            self.stdout.write(
+                f"{name} {status}: {count} tasks, "
+                f"mean {total / count * 1000:.1f} ms, "
+                f"max {worst * 1000:.1f} ms"
+            )
@@ -0,0 +1,51 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    A call of a registered task function, waiting for or done by a worker
+    (see `manage.py run_worker`).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=15, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.DurationField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["run_after"]
+        indexes = [
+            # Workers only ever look for due pending and expired running
+            # tasks, so finished ones do not grow the index
+            models.Index(
+                fields=["run_after"],
+                condition=Q(status="pending"),
+                name="task_pending_idx",
+            ),
+            models.Index(
+                fields=["started_at"],
+                condition=Q(status="running"),
+                name="task_running_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
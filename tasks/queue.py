@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.utils import timezone
+
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """
+    Registers a function as a task. `func.delay(*args, **kwargs)` then
+    queues a call of it, with JSON-serializable arguments, that a worker
+    runs later. Queued inside a transaction, the call only becomes
+    visible to workers when the transaction commits.
+    """
+
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        registry[task_name] = func
+
+        def delay(*args, **kwargs):
+            return enqueue(
+                task_name, args, kwargs, max_attempts=max_attempts
+            )
+
+        func.task_name = task_name
+        func.delay = delay
+        return func
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def enqueue(name, args=(), kwargs=None, run_after=None, max_attempts=None):
+    if name not in registry:
+        raise KeyError(f"Task {name!r} is not registered")
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs or {},
+        run_after=run_after or timezone.now(),
+        max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS,
+    )
+
+
+def claim(limit):
+    """
+    Marks up to `limit` due tasks as running and returns their ids.
+
+    Rows locked by other workers are skipped instead of waited for, so any
+    number of workers can poll the table without handing out a task twice.
+    Running tasks whose worker died, and so stopped renewing their lease
+    (see `lease`), are claimed again after TASKS_LEASE_TIMEOUT.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Task.Status.PENDING, run_after__lte=now)
+                | Q(
+                    status=Task.Status.RUNNING,
+                    started_at__lt=now - settings.TASKS_LEASE_TIMEOUT,
+                )
+            )
+            .order_by("run_after")
+            .values_list("id", flat=True)[:limit]
+        )
+        Task.objects.filter(id__in=ids).update(
+            status=Task.Status.RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+    return ids
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the given number of failed attempts"""
+    return min(
+        settings.TASKS_RETRY_BACKOFF * 2 ** (attempts - 1),
+        settings.TASKS_RETRY_BACKOFF_MAX,
+    )
+
+
+def claimed(task_):
+    """The task, as long as no other worker claimed it since `task_`"""
+    return Task.objects.filter(
+        id=task_.id, status=Task.Status.RUNNING, attempts=task_.attempts
+    )
+
+
+@contextmanager
+def lease(task_):
+    """
+    Renews the claim of a running task every TASKS_HEARTBEAT_INTERVAL
+    from a separate thread, so tasks running for longer than
+    TASKS_LEASE_TIMEOUT are not claimed again while their worker lives
+    """
+    done = threading.Event()
+
+    def heartbeat():
+        try:
+            interval = settings.TASKS_HEARTBEAT_INTERVAL.total_seconds()
+            while not done.wait(interval):
+                if not claimed(task_).update(started_at=timezone.now()):
+                    break
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=heartbeat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def execute(task_id):
+    """
+    Runs a claimed task and records its outcome and duration, unless
+    another worker claimed it in the meantime and so owns the outcome.
+    Returns the task, for the worker to report.
+    """
+    task_ = Task.objects.get(id=task_id)
+    started = time.perf_counter()
+    try:
+        func = registry[task_.name]
+        with lease(task_):
+            func(*task_.args, **task_.kwargs)
+    except Exception:
+        task_.last_error = traceback.format_exc()
+        if task_.attempts < task_.max_attempts:
+            task_.status = Task.Status.PENDING
+            task_.run_after = timezone.now() + timedelta(
+                seconds=retry_delay(task_.attempts)
+            )
+        else:
+            task_.status = Task.Status.FAILED
+        logger.warning(
+            "Task %s #%s failed (attempt %s of %s)",
+            task_.name,
+            task_.id,
+            task_.attempts,
+            task_.max_attempts,
+            exc_info=True,
+        )
+    else:
+        task_.status = Task.Status.SUCCEEDED
+
+    task_.duration = timedelta(seconds=time.perf_counter() - started)
+    task_.finished_at = timezone.now()
+    if not claimed(task_).update(
+        status=task_.status,
+        run_after=task_.run_after,
+        last_error=task_.last_error,
+        duration=task_.duration,
+        finished_at=task_.finished_at,
+    ):
+        logger.warning(
+            "Task %s #%s was claimed again during attempt %s, "
+            "its outcome is left to the new attempt",
+            task_.name,
+            task_.id,
+            task_.attempts,
+        )
+    return task_
+
+
+def metrics(since=None):
+    """Count, mean and worst duration of finished tasks by name and status"""
+    queryset = Task.objects.filter(
+        status__in=[Task.Status.SUCCEEDED, Task.Status.FAILED]
+    )
+    if since:
+        queryset = queryset.filter(finished_at__gte=since)
+    return (
+        queryset.values("name", "status")
+        .annotate(
+            count=Count("id"),
+            avg_duration=Avg("duration"),
+            max_duration=Max("duration"),
+        )
+        .order_by("name", "status")
+    )
@@ -0,0 +1,206 @@
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from tasks import queue
+from tasks.models import Task
+
+calls = []
+
+
+@queue.task(name="tests.record")
+def record(value):
+    calls.append(value)
+
+
+@queue.task(name="tests.fail", max_attempts=2)
+def fail():
+    raise ValueError("boom")
+
+
+@queue.task(name="tests.reclaimed")
+def reclaimed():
+    # As if the lease expired and another worker claimed the task
+    Task.objects.filter(name="tests.reclaimed").update(
+        attempts=F("attempts") + 1
+    )
+
+
+@queue.task(name="tests.sleep")
+def sleep(seconds):
+    time.sleep(seconds)
+
+
+class QueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_queues_task(self):
+        task = record.delay(5)
+
+        self.assertEqual(task.name, "tests.record")
+        self.assertEqual(task.args, [5])
+        self.assertEqual(task.status, Task.Status.PENDING)
+
+    def test_enqueue_unregistered_task(self):
+        with self.assertRaises(KeyError):
+            queue.enqueue("tests.unknown")
+
+    def test_claim_due_tasks(self):
+        due = record.delay(1)
+        queue.enqueue(
+            "tests.record", [2], run_after=timezone.now() + timedelta(hours=1)
+        )
+
+        self.assertEqual(queue.claim(10), [due.id])
+        due.refresh_from_db()
+        self.assertEqual(due.status, Task.Status.RUNNING)
+        self.assertEqual(due.attempts, 1)
+        self.assertEqual(queue.claim(10), [])
+
+    def test_claim_expired_running_task(self):
+        task = record.delay(1)
+        queue.claim(1)
+        Task.objects.filter(id=task.id).update(
+            started_at=timezone.now() - timedelta(days=1)
+        )
+
+        self.assertEqual(queue.claim(1), [task.id])
+
+    def test_execute_records_success(self):
+        task = record.delay(7)
+        queue.claim(1)
+
+        task = queue.execute(task.id)
+
+        self.assertEqual(calls, [7])
+        self.assertEqual(task.status, Task.Status.SUCCEEDED)
+        self.assertIsNotNone(task.duration)
+        self.assertIsNotNone(task.finished_at)
+
+    @override_settings(TASKS_RETRY_BACKOFF=10)
+    def test_failed_task_is_retried_with_backoff(self):
+        task = fail.delay()
+        queue.claim(1)
+
+        before = timezone.now()
+        with self.assertLogs("tasks.queue", "WARNING"):
+            task = queue.execute(task.id)
+
+        self.assertEqual(task.status, Task.Status.PENDING)
+        self.assertIn("ValueError: boom", task.last_error)
+        self.assertGreaterEqual(task.run_after, before + timedelta(seconds=10))
+
+        Task.objects.filter(id=task.id).update(run_after=timezone.now())
+        queue.claim(1)
+        with self.assertLogs("tasks.queue", "WARNING"):
+            task = queue.execute(task.id)
+        self.assertEqual(task.status, Task.Status.FAILED)
+        self.assertEqual(task.attempts, 2)
+
+    def test_reclaimed_attempt_does_not_record_outcome(self):
+        task = reclaimed.delay()
+        queue.claim(1)
+
+        with self.assertLogs("tasks.queue", "WARNING"):
+            queue.execute(task.id)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.RUNNING)
+        self.assertEqual(task.attempts, 2)
+        self.assertIsNone(task.finished_at)
+
+    @override_settings(TASKS_RETRY_BACKOFF=10, TASKS_RETRY_BACKOFF_MAX=60)
+    def test_retry_delay(self):
+        self.assertEqual(
+            [queue.retry_delay(attempts) for attempts in range(1, 6)],
+            [10, 20, 40, 60, 60],
+        )
+
+    def test_metrics(self):
+        for value in range(3):
+            record.delay(value)
+        queue.claim(3)
+        for task in Task.objects.all():
+            queue.execute(task.id)
+
+        [row] = queue.metrics()
+        self.assertEqual(row["name"], "tests.record")
+        self.assertEqual(row["count"], 3)
+        self.assertGreaterEqual(row["max_duration"], row["avg_duration"])
+
+
+class WorkerTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_skips_locked_tasks(self):
+        first = record.delay(1)
+        second = record.delay(2)
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with transaction.atomic():
+                Task.objects.select_for_update().get(id=first.id)
+                locked.set()
+                release.wait(5)
+            connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait(5)
+        try:
+            self.assertEqual(queue.claim(10), [second.id])
+        finally:
+            release.set()
+            thread.join()
+
+    def test_run_worker_in_burst_mode(self):
+        for value in range(5):
+            record.delay(value)
+        fail.delay()
+        out = StringIO()
+
+        with self.assertLogs("tasks.queue", "WARNING"):
+            call_command(
+                "run_worker", "--burst", "--concurrency", "2", stdout=out
+            )
+
+        self.assertEqual(sorted(calls), [0, 1, 2, 3, 4])
+        self.assertEqual(
+            Task.objects.filter(status=Task.Status.SUCCEEDED).count(), 5
+        )
+        self.assertIn("tests.record succeeded: 5 tasks", out.getvalue())
+
+    @override_settings(
+        TASKS_HEARTBEAT_INTERVAL=timedelta(milliseconds=50),
+        TASKS_LEASE_TIMEOUT=timedelta(milliseconds=200),
+    )
+    def test_running_task_renews_lease(self):
+        task = sleep.delay(0.5)
+        queue.claim(1)
+        claimed_again = []
+
+        def claim_while_running():
+            time.sleep(0.3)
+            claimed_again.extend(queue.claim(1))
+            connection.close()
+
+        thread = threading.Thread(target=claim_while_running)
+        thread.start()
+        task = queue.execute(task.id)
+        thread.join()
+
+        self.assertEqual(claimed_again, [])
+        self.assertEqual(task.status, Task.Status.SUCCEEDED)
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.SUCCEEDED)
+        self.assertEqual(task.attempts, 1)
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+TOKEN_CLAIMS = ("is_staff", "is_superuser", "is_active", "token_version")
+
+
+def user_state_cache_key(user_id):
+    return f"user:token-state:{user_id}"
+
+
+def get_user_state(user_id):
+    """
+    Return the (is_staff, is_superuser, is_active, token_version) tuple
+    of a user, cached for JWT_USER_STATE_CACHE_TIMEOUT seconds.
+    Returns None for users that do not exist.
+    """
+    key = user_state_cache_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = (
+            get_user_model().objects.filter(pk=user_id)
+            .values_list(*TOKEN_CLAIMS)
+            .first()
+        ) or ()
+        cache.set(key, state, settings.JWT_USER_STATE_CACHE_TIMEOUT)
+    return tuple(state) or None
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication which builds the user from the token claims
+    instead of loading the user row on every request.
+
+    The claims are compared with a short-lived cached snapshot of the user,
+    so deactivated users, changed permissions and revoked tokens
+    (see User.revoke_tokens) stop working once the cache entry expires
+    or is invalidated on user save.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+            claims = tuple(validated_token[claim] for claim in TOKEN_CLAIMS)
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        if claims != state:
+            raise AuthenticationFailed(
+                _("Token is no longer valid for this user."),
+                code="token_revoked",
+            )
+
+        is_staff, is_superuser, is_active, token_version = claims
+        if not is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+
+        # Build a model instance with every other field deferred,
+        # so it can be used in queries and relations without a lookup
+        # and loads the remaining fields lazily on access.
+        user_model = get_user_model()
+        values = dict(zip(TOKEN_CLAIMS, claims))
+        values[api_settings.USER_ID_FIELD] = user_id
+        field_names = [
+            field.attname for field in user_model._meta.concrete_fields
+            if field.attname in values
+        ]
+        return user_model.from_db(
+            router.db_for_read(user_model),
+            field_names,
+            [values[name] for name in field_names],
+        )
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.core.cache import cache
 from django.db import models
+from django.db.models import F
 from django.utils.translation import gettext as _
 
 
@@ -40,8 +42,30 @@ class UserManager(BaseUserManager):
 class User(AbstractUser):
     username = None
     email = models.EmailField(_("email address"), unique=True)
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def revoke_tokens(self):
+        """Invalidate every JWT issued to the user so far."""
+        User.objects.filter(pk=self.pk).update(
+            token_version=F("token_version") + 1
+        )
+        self.refresh_from_db(fields=["token_version"])
+        self.clear_token_state()
+
+    def clear_token_state(self):
+        from user.authentication import user_state_cache_key
+
+        cache.delete(user_state_cache_key(self.pk))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.clear_token_state()
+
+    def delete(self, *args, **kwargs):
+        self.clear_token_state()
+        return super().delete(*args, **kwargs)
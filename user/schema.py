@@ -0,0 +1,7 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """Documents StatelessJWTAuthentication as bearer JWT in the schema"""
+
+    target_class = "user.authentication.StatelessJWTAuthentication"
@@ -1,6 +1,11 @@
 from django.contrib.auth import get_user_model, authenticate
 from django.utils.translation import gettext as _
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer
+)
+
+from user.authentication import TOKEN_CLAIMS
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -23,6 +28,7 @@ class UserSerializer(serializers.ModelSerializer):
         if password:
             user.set_password(password)
             user.save()
+            user.revoke_tokens()
         return user
 
 
@@ -54,3 +60,14 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs["user"] = user
         return attrs
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    """Embed the claims used by StatelessJWTAuthentication in the tokens"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in TOKEN_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
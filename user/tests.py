@@ -1,3 +1,115 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from airport.models import Order
+from airport.tests.test_airplane_api import sample_airplane
+from airport.tests.test_flight_api import sample_flight
+from airport.tests.test_route_api import (
+    sample_route,
+    sample_source,
+    sample_destination,
+)
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+ME_URL = reverse("user:manage")
+ORDER_URL = reverse("airport:order-list")
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="Test1234!"
+        )
+
+    def authenticate(self):
+        res = self.client.post(
+            TOKEN_URL, {"email": "test@test.test", "password": "Test1234!"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {res.data['access']}"
+        )
+        return res.data["access"]
+
+    def test_token_contains_user_claims(self):
+        token = AccessToken(self.authenticate())
+
+        self.assertEqual(token["user_id"], self.user.id)
+        self.assertFalse(token["is_staff"])
+        self.assertTrue(token["is_active"])
+        self.assertEqual(token["token_version"], 0)
+
+    def test_user_is_not_loaded_when_state_is_cached(self):
+        self.authenticate()
+        self.client.get(ORDER_URL)
+
+        # only the pagination count of the (empty) order list
+        with self.assertNumQueries(1):
+            res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_me_with_stateless_user(self):
+        self.authenticate()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_create_order_with_stateless_user(self):
+        route = sample_route(
+            source=sample_source(name="test_source"),
+            destination=sample_destination(name="test_destination"),
+        )
+        flight = sample_flight(route=route, airplane=sample_airplane())
+        self.authenticate()
+
+        res = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 1, "seat": 1, "flight": flight.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.get().user, self.user)
+
+    def test_revoked_token_rejected(self):
+        self.authenticate()
+        self.user.revoke_tokens()
+
+        res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_rejected_after_permissions_change(self):
+        self.authenticate()
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_rejected_for_inactive_user(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_tokens(self):
+        self.authenticate()
+        self.client.patch(ME_URL, {"password": "NewPass1234!"})
+
+        res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)